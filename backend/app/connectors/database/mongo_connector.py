@@ -0,0 +1,163 @@
+import time
+from typing import Dict, Any, Iterable, Iterator, List
+
+# Try to import optional dependencies
+try:
+    from bson import ObjectId, Decimal128, json_util
+    from pymongo import InsertOne, ReplaceOne
+    from pymongo.errors import BulkWriteError
+    HAS_PYMONGO = True
+except ImportError:
+    HAS_PYMONGO = False
+
+DEFAULT_BATCH_SIZE = 1000
+
+def parse_document(value: Any, default: Any = None) -> Any:
+    """
+    Parse a filter, projection or pipeline given as a dict/list or as (Extended) JSON text,
+    so values like {"$oid": ...} and {"$date": ...} become ObjectId and datetime.
+    """
+    if value in (None, ''):
+        return default
+    if isinstance(value, (dict, list)):
+        return value
+    return json_util.loads(value)
+
+def parse_projection(value: Any) -> Any:
+    """Projection document, also accepting a comma-separated list of field names."""
+    if isinstance(value, str) and value.strip() and not value.strip().startswith('{'):
+        return {field.strip(): 1 for field in value.split(',') if field.strip()}
+    return parse_document(value)
+
+def to_record(value: Any) -> Any:
+    """Convert BSON-specific values (ObjectId, Decimal128) so records serialise downstream."""
+    if isinstance(value, dict):
+        return {k: to_record(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [to_record(v) for v in value]
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return value.to_decimal()
+    return value
+
+class MongoConnector:
+    """Connector for reading and writing MongoDB collections through a pooled MongoClient."""
+
+    def __init__(self, database):
+        """
+        Args:
+            database: pymongo Database from a pooled client
+        """
+        if not HAS_PYMONGO:
+            raise ImportError("PyMongo not installed. Install with: pip install pymongo")
+        self.database = database
+
+    def iter_batches(self, config: Dict[str, Any]) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Read a collection, yielding lists of up to batchSize records.
+
+        The cursor's batch size matches, so each yielded batch is one getMore round trip
+        and only one batch of documents is held in memory at a time.
+
+        Config:
+            collection: Collection name
+            filter: Query document (find only)
+            projection: Projection document or comma-separated field names (find only)
+            pipeline: Aggregation pipeline; when set, the collection is aggregated instead
+            batchSize: Documents per batch (default 1000)
+            maxTimeMS: Optional server-side time limit for the query
+        """
+        collection = self.database[config['collection']]
+        batch_size = int(config.get('batchSize') or DEFAULT_BATCH_SIZE)
+        pipeline = parse_document(config.get('pipeline'))
+        max_time_ms = config.get('maxTimeMS')
+
+        if pipeline:
+            options = {'maxTimeMS': int(max_time_ms)} if max_time_ms else {}
+            cursor = collection.aggregate(pipeline, batchSize=batch_size, allowDiskUse=True, **options)
+        else:
+            cursor = collection.find(
+                parse_document(config.get('filter'), {}),
+                parse_projection(config.get('projection')),
+                batch_size=batch_size,
+                max_time_ms=int(max_time_ms) if max_time_ms else None
+            )
+
+        try:
+            batch = []
+            for doc in cursor:
+                batch.append(to_record(doc))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            cursor.close()
+
+    def write_batches(self, batches: Iterable[List[Dict[str, Any]]], config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Write record batches with unordered bulk_write calls of batchSize operations.
+
+        Unordered bulk writes let the server apply operations in parallel and continue past
+        individual failures, which are reported together once the batch completes.
+
+        Config:
+            collection: Collection name
+            writeMode: 'insert' (default) or 'upsert' (replace documents matching keyColumns)
+            keyColumns: Fields identifying a document for upserts (list or comma-separated)
+            truncate: Delete all documents before loading
+            batchSize: Operations per bulk_write (default 1000)
+
+        Returns:
+            Dictionary with rows, batches, inserted, upserted, matched, modified and seconds
+        """
+        collection = self.database[config['collection']]
+        batch_size = int(config.get('batchSize') or DEFAULT_BATCH_SIZE)
+        write_mode = config.get('writeMode') or 'insert'
+
+        key_columns = config.get('keyColumns') or []
+        if isinstance(key_columns, str):
+            key_columns = [k.strip() for k in key_columns.split(',') if k.strip()]
+        if write_mode == 'upsert' and not key_columns:
+            raise Exception("Upsert mode requires key columns")
+
+        start = time.perf_counter()
+        stats = {'rows': 0, 'batches': 0, 'inserted': 0, 'upserted': 0, 'matched': 0, 'modified': 0}
+
+        if config.get('truncate'):
+            collection.delete_many({})
+
+        operations = []
+        for batch in batches:
+            for row in batch:
+                # Copied because pymongo adds _id to inserted documents in place
+                document = dict(row)
+                if write_mode == 'upsert':
+                    operations.append(ReplaceOne({k: document.get(k) for k in key_columns}, document, upsert=True))
+                else:
+                    operations.append(InsertOne(document))
+                if len(operations) >= batch_size:
+                    self._flush(collection, operations, stats)
+                    operations = []
+        if operations:
+            self._flush(collection, operations, stats)
+
+        stats['seconds'] = round(time.perf_counter() - start, 2)
+        return stats
+
+    def _flush(self, collection, operations, stats):
+        try:
+            result = collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get('writeErrors', [])
+            first = errors[0].get('errmsg') if errors else str(e)
+            raise Exception(f"{len(errors)} of {len(operations)} documents failed to write: {first}")
+
+        stats['rows'] += len(operations)
+        stats['batches'] += 1
+        stats['inserted'] += result.inserted_count
+        stats['upserted'] += result.upserted_count
+        stats['matched'] += result.matched_count
+        stats['modified'] += result.modified_count
@@ -0,0 +1,369 @@
+import datetime
+import decimal
+import io
+import json
+import time
+import uuid
+import numpy as np
+import pandas as pd
+from sqlalchemy import Index, MetaData, Table, inspect, text
+
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_COMMIT_INTERVAL = 100000
+
+def _rechunk(batches, size):
+    """Regroup an iterable of record batches into lists of at most `size` records."""
+    chunk = []
+    for batch in batches:
+        for row in batch or []:
+            chunk.append(row)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def _bind_value(value):
+    """Convert a value from a DataFrame record into a plain Python value DBAPI drivers accept."""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+    if value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, pd.Timedelta):
+        return value.to_pytimedelta()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        # pandas NaN means missing
+        return None
+    return value
+
+def _copy_value(value):
+    """Encode a value for PostgreSQL COPY text format."""
+    value = _bind_value(value)
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        value = value.isoformat()
+    elif isinstance(value, decimal.Decimal):
+        value = format(value, 'f')
+    else:
+        value = str(value)
+    return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+class SQLConnector:
+    """
+    Connector for bulk-loading records into SQL tables.
+
+    Uses the fastest path each dialect offers:
+    - PostgreSQL (psycopg2): COPY FROM STDIN, streamed one batch at a time
+    - MySQL, SQLite and others: DBAPI executemany in large batches (PyMySQL sends
+      multi-row INSERTs), committed every commitInterval rows
+
+    Upserts load each batch into a temporary staging table and merge it with
+    INSERT ... ON CONFLICT (PostgreSQL, SQLite) or ON DUPLICATE KEY UPDATE (MySQL).
+    """
+
+    def __init__(self, engine, db_type):
+        self.engine = engine
+        self.db_type = db_type
+
+    def _split_table_name(self, table_name):
+        if '.' in table_name:
+            schema, name = table_name.split('.', 1)
+            return schema, name
+        return None, table_name
+
+    def _get_table(self, table_name, sample, key_columns=None):
+        """
+        Reflect the target table, creating it from the sample records if it doesn't exist.
+
+        New tables get a unique index on key_columns so upserts have a conflict target.
+        """
+        schema, name = self._split_table_name(table_name)
+        if not inspect(self.engine).has_table(name, schema=schema):
+            # Let pandas infer column types from the first batch, as to_sql did before
+            pd.DataFrame(sample).head(0).to_sql(name, self.engine, schema=schema, index=False)
+            if key_columns:
+                table = Table(name, MetaData(), schema=schema, autoload_with=self.engine)
+                Index(f'ux_{name}_key', *[table.c[k] for k in key_columns], unique=True).create(self.engine)
+        return Table(name, MetaData(), schema=schema, autoload_with=self.engine)
+
+    def _truncate(self, table):
+        qualified = self.engine.dialect.identifier_preparer.format_table(table)
+        statement = f'DELETE FROM {qualified}' if self.db_type == 'sqlite' else f'TRUNCATE TABLE {qualified}'
+        with self.engine.begin() as conn:
+            conn.execute(text(statement))
+
+    def _uses_copy(self):
+        return self.db_type == 'postgresql' and self.engine.dialect.driver == 'psycopg2'
+
+    def _parse_key_columns(self, config):
+        keys = config.get('keyColumns') or []
+        if isinstance(keys, str):
+            keys = [k.strip() for k in keys.split(',')]
+        return [k for k in keys if k]
+
+    def write_batches(self, batches, config):
+        """
+        Bulk-load an iterable of record batches into a table.
+
+        Config:
+            table: Target table ('schema.table' allowed); created from the first batch if missing
+            writeMode: 'append' (default) or 'upsert'
+            keyColumns: Key columns for upsert (list or comma-separated)
+            batchSize: Rows per COPY/executemany round trip (default 10000)
+            commitInterval: Rows between commits (default 100000)
+            truncate: Empty the table before loading
+
+        Returns:
+            Dictionary with rows, batches, seconds and method; upserts also report
+            inserted, updated and unchanged counts
+        """
+        table_name = config.get('table')
+        if not table_name:
+            raise Exception('Target table is required')
+
+        upsert = config.get('writeMode', 'append') == 'upsert'
+        key_columns = self._parse_key_columns(config)
+        if upsert and not key_columns:
+            raise Exception('Key columns are required for upsert')
+
+        batch_size = int(config.get('batchSize') or DEFAULT_BATCH_SIZE)
+        commit_interval = int(config.get('commitInterval') or DEFAULT_COMMIT_INTERVAL)
+        chunks = _rechunk(batches, batch_size)
+
+        start = time.perf_counter()
+        first = next(chunks, None)
+        if first is None:
+            return {'rows': 0, 'batches': 0, 'seconds': 0.0, 'method': None}
+
+        table = self._get_table(table_name, first, key_columns if upsert else None)
+        if config.get('truncate'):
+            self._truncate(table)
+
+        missing = [k for k in key_columns if k not in table.columns] if upsert else []
+        if missing:
+            raise Exception(f"Key columns not found in table {table_name}: {', '.join(missing)}")
+
+        def all_chunks():
+            yield first
+            yield from chunks
+
+        if upsert:
+            stats = self._upsert_chunks(table, key_columns, all_chunks(), commit_interval)
+        else:
+            stats = self._append_chunks(table, all_chunks(), commit_interval)
+
+        stats['method'] = 'copy' if self._uses_copy() else 'executemany'
+        stats['seconds'] = round(time.perf_counter() - start, 3)
+        return stats
+
+    def _quote_columns(self, columns, prefix=''):
+        preparer = self.engine.dialect.identifier_preparer
+        return ', '.join(prefix + preparer.quote(c) for c in columns)
+
+    def _placeholders(self, count):
+        paramstyle = self.engine.dialect.paramstyle
+        if paramstyle == 'qmark':
+            return ', '.join(['?'] * count)
+        if paramstyle == 'numeric':
+            return ', '.join(f':{i + 1}' for i in range(count))
+        if paramstyle == 'named':
+            return ', '.join(f':p{i}' for i in range(count))
+        return ', '.join(['%s'] * count)
+
+    def _chunk_columns(self, table, chunk):
+        """
+        The table columns a chunk has values for, in table order.
+
+        Worked out per chunk, as records may omit keys (e.g. sparse JSON) and a column can
+        first appear in a later batch. Keys the table has no column for are refused, not dropped.
+        """
+        present = set().union(*(record.keys() for record in chunk))
+        columns = [c.name for c in table.columns if c.name in present]
+        unknown = present.difference(columns)
+        if unknown:
+            raise Exception(f"Columns not found in table {table.name}: {', '.join(sorted(map(str, unknown)))}")
+        return columns
+
+    def _load_chunk(self, cursor, qualified, columns, chunk):
+        """
+        Load one chunk of records into a table on an open DBAPI cursor.
+
+        PostgreSQL streams the chunk with COPY FROM STDIN (text format). Other dialects use
+        executemany; PyMySQL rewrites it into multi-row INSERTs and SQLite reuses one
+        prepared statement, so committing per interval rather than per row is what keeps it fast.
+        """
+        if self._uses_copy():
+            buffer = io.StringIO()
+            for record in chunk:
+                buffer.write('\t'.join(_copy_value(record.get(c)) for c in columns))
+                buffer.write('\n')
+            buffer.seek(0)
+            cursor.copy_expert(f'COPY {qualified} ({self._quote_columns(columns)}) FROM STDIN', buffer)
+            return
+
+        statement = f'INSERT INTO {qualified} ({self._quote_columns(columns)}) VALUES ({self._placeholders(len(columns))})'
+        named = self.engine.dialect.paramstyle == 'named'
+
+        def params(record):
+            values = [_bind_value(record.get(c)) for c in columns]
+            if named:
+                return {f'p{i}': v for i, v in enumerate(values)}
+            return tuple(values)
+
+        cursor.executemany(statement, [params(record) for record in chunk])
+
+    def _append_chunks(self, table, chunks, commit_interval):
+        """Append chunks to the table, committing every commit_interval rows."""
+        qualified = self.engine.dialect.identifier_preparer.format_table(table)
+        rows = count = uncommitted = 0
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            for chunk in chunks:
+                self._load_chunk(cursor, qualified, self._chunk_columns(table, chunk), chunk)
+                rows += len(chunk)
+                count += 1
+                uncommitted += len(chunk)
+                if uncommitted >= commit_interval:
+                    raw.commit()
+                    uncommitted = 0
+            raw.commit()
+            cursor.close()
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            raw.close()
+        return {'rows': rows, 'batches': count}
+
+    def _distinct_condition(self, columns, left, right):
+        """SQL condition that is true when any column differs between two aliases (NULL-safe)."""
+        preparer = self.engine.dialect.identifier_preparer
+        if not columns:
+            return '1=0'
+        if self.db_type == 'mysql':
+            return ' OR '.join(f'NOT ({left}.{preparer.quote(c)} <=> {right}.{preparer.quote(c)})' for c in columns)
+        if self.db_type == 'sqlite':
+            return ' OR '.join(f'{left}.{preparer.quote(c)} IS NOT {right}.{preparer.quote(c)}' for c in columns)
+        return f'({self._quote_columns(columns, left + ".")}) IS DISTINCT FROM ({self._quote_columns(columns, right + ".")})'
+
+    def _merge_statement(self, qualified, staging, columns, key_columns):
+        """Build the dialect-specific INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE statement."""
+        preparer = self.engine.dialect.identifier_preparer
+        column_list = self._quote_columns(columns)
+        update_columns = [c for c in columns if c not in key_columns]
+
+        if self.db_type == 'mysql':
+            # MySQL skips the write when the new values equal the current row
+            assignments = ', '.join(f'{preparer.quote(c)} = new.{preparer.quote(c)}' for c in update_columns or key_columns)
+            return (
+                f'INSERT INTO {qualified} ({column_list}) '
+                f'SELECT * FROM (SELECT {column_list} FROM {staging}) AS new '
+                f'ON DUPLICATE KEY UPDATE {assignments}'
+            )
+
+        conflict = f'ON CONFLICT ({self._quote_columns(key_columns)})'
+        if not update_columns:
+            action = 'DO NOTHING'
+        else:
+            assignments = ', '.join(f'{preparer.quote(c)} = excluded.{preparer.quote(c)}' for c in update_columns)
+            # Only rewrite rows whose values actually changed
+            action = f'DO UPDATE SET {assignments} WHERE {self._distinct_condition(update_columns, qualified, "excluded")}'
+        # 'WHERE true' avoids SQLite's parsing ambiguity between a join and ON CONFLICT
+        return f'INSERT INTO {qualified} ({column_list}) SELECT {column_list} FROM {staging} WHERE true {conflict} {action}'
+
+    def _upsert_chunks(self, table, key_columns, chunks, commit_interval):
+        """
+        Upsert chunks through a temporary staging table.
+
+        Each chunk is bulk-loaded into the staging table, counted against the target
+        (new / changed / unchanged), then merged with a single statement. Only the
+        columns a chunk has values for are merged; the others keep their current values.
+        """
+        preparer = self.engine.dialect.identifier_preparer
+        qualified = preparer.format_table(table)
+        staging = preparer.quote(f'osmosis_stg_{uuid.uuid4().hex[:12]}')
+        join = ' AND '.join(f't.{preparer.quote(k)} = s.{preparer.quote(k)}' for k in key_columns)
+
+        stats = {'rows': 0, 'batches': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0}
+        uncommitted = 0
+        raw = self.engine.raw_connection()
+        cursor = raw.cursor()
+        try:
+            # Temporary tables are private to this connection, but it goes back to the pool
+            all_columns = [c.name for c in table.columns]
+            cursor.execute(f'CREATE TEMPORARY TABLE {staging} AS SELECT {self._quote_columns(all_columns)} FROM {qualified} WHERE 1=0')
+            merges = {}
+
+            for chunk in chunks:
+                columns = self._chunk_columns(table, chunk)
+                missing = [k for k in key_columns if k not in columns]
+                if missing:
+                    raise Exception(f"Key columns missing from batch {stats['batches'] + 1}: {', '.join(missing)}")
+                update_columns = [c for c in columns if c not in key_columns]
+                key = tuple(columns)
+                if key not in merges:
+                    merges[key] = self._merge_statement(qualified, staging, columns, key_columns)
+
+                # A key may only appear once per merge; the last occurrence wins
+                deduped = {tuple(record.get(k) for k in key_columns): record for record in chunk}
+                chunk = list(deduped.values())
+
+                self._load_chunk(cursor, staging, columns, chunk)
+
+                cursor.execute(f'SELECT COUNT(*) FROM {staging} s JOIN {qualified} t ON {join}')
+                matched = cursor.fetchone()[0]
+                cursor.execute(
+                    f'SELECT COUNT(*) FROM {staging} s JOIN {qualified} t ON {join} '
+                    f'WHERE {self._distinct_condition(update_columns, "t", "s")}'
+                )
+                changed = cursor.fetchone()[0]
+
+                cursor.execute(merges[key])
+                cursor.execute(f'DELETE FROM {staging}')
+
+                stats['rows'] += len(chunk)
+                stats['batches'] += 1
+                stats['inserted'] += len(chunk) - matched
+                stats['updated'] += changed
+                stats['unchanged'] += matched - changed
+                uncommitted += len(chunk)
+                if uncommitted >= commit_interval:
+                    raw.commit()
+                    uncommitted = 0
+
+            raw.commit()
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            self._drop_staging(raw, cursor, staging)
+        return stats
+
+    def _drop_staging(self, raw, cursor, staging):
+        """
+        Drop an upsert's staging table, also after a failed load, and release the connection.
+
+        The pooled connection outlives the load, so a staging table left on it would
+        linger; if it cannot be dropped the connection is discarded instead of reused.
+        """
+        # MySQL only avoids an implicit commit when TEMPORARY is spelled out
+        drop = 'DROP TEMPORARY TABLE' if self.db_type == 'mysql' else 'DROP TABLE'
+        try:
+            cursor.execute(f'{drop} IF EXISTS {staging}')
+            raw.commit()
+            cursor.close()
+        except Exception as e:
+            print(f"Failed to drop staging table {staging}, discarding the connection: {e}")
+            raw.invalidate()
+        finally:
+            raw.close()
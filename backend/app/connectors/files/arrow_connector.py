@@ -0,0 +1,241 @@
+import os
+
+DEFAULT_SCHEMA_INFERENCE_ROWS = 100000
+
+# Try to import optional dependencies
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+def _unify_schemas(schemas):
+    """Merge schemas field by field, promoting null and numeric types (e.g. int64 and double)."""
+    try:
+        return pa.unify_schemas(schemas, promote_options='permissive')
+    except TypeError:
+        # pyarrow < 14 has no promote_options and only merges null with other types
+        return pa.unify_schemas(schemas)
+
+def _infer_schema(records):
+    """Schema of a list of records, with every key of any record (from_pylist only uses the first's)."""
+    names = list(dict.fromkeys(key for record in records for key in record))
+    return pa.RecordBatch.from_pydict({name: [record.get(name) for record in records] for name in names}).schema
+
+def _to_record_batch(records, schema):
+    """
+    Record batch of records in the writer's schema, raising instead of losing data.
+
+    Each column is converted with its own inferred type. All-null columns and numbers are
+    cast to the schema's type with safe=True, so lossy conversions (3.5 into int64) fail;
+    any other type change, and keys that are not in the schema, are refused.
+    """
+    unknown = [key for key in dict.fromkeys(key for record in records for key in record) if schema.get_field_index(key) == -1]
+    if unknown:
+        raise pa.ArrowInvalid(f"columns not in the file schema: {', '.join(map(str, unknown))}")
+    arrays = []
+    for field in schema:
+        array = pa.array([record.get(field.name) for record in records])
+        if not array.type.equals(field.type):
+            numeric = all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in (array.type, field.type))
+            if not (numeric or pa.types.is_null(array.type)):
+                raise pa.ArrowInvalid(f"column {field.name} has type {array.type}, the file has {field.type}")
+            array = array.cast(field.type, safe=True)
+        arrays.append(array)
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+class ArrowConnector:
+    """
+    Connector for Arrow IPC (Feather v2) files.
+
+    The IPC format stores data in Arrow's in-memory layout, so it can be read back
+    without parsing. Local files are memory-mapped and record batches reference the
+    mapped pages directly (zero-copy) until records are converted for downstream nodes.
+    """
+
+    def _check_pyarrow(self):
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow not installed. Install with: pip install pyarrow")
+
+    def _open_reader(self, source):
+        """Open an IPC file reader, falling back to the IPC stream format."""
+        try:
+            return pa.ipc.open_file(source)
+        except pa.ArrowInvalid:
+            source.seek(0)
+            return pa.ipc.open_stream(source)
+
+    def _iter_record_batches(self, reader):
+        if isinstance(reader, pa.ipc.RecordBatchFileReader):
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i)
+        else:
+            yield from reader
+
+    def iter_batches(self, config, fs=None):
+        """Read an Arrow IPC file, yielding lists of records one record batch at a time."""
+        self._check_pyarrow()
+        file_path = config.get('filePath')
+        columns = config.get('columns')
+        batch_size = config.get('batchSize')
+
+        if not file_path:
+            raise Exception('Arrow file path is required')
+
+        if fs:
+            if not fs.exists(file_path):
+                 raise Exception(f'Arrow file not found: {file_path}')
+            source = fs.open(file_path, 'rb')
+        else:
+            if not os.path.exists(file_path):
+                raise Exception(f'Arrow file not found: {file_path}')
+            source = pa.memory_map(file_path, 'r')
+
+        try:
+            reader = self._open_reader(source)
+            for record_batch in self._iter_record_batches(reader):
+                if columns:
+                    record_batch = record_batch.select(columns)
+                if batch_size:
+                    # Slicing is zero-copy, only to_pylist() materialises values
+                    step = int(batch_size)
+                    for offset in range(0, record_batch.num_rows, step):
+                        yield record_batch.slice(offset, step).to_pylist()
+                else:
+                    yield record_batch.to_pylist()
+        finally:
+            source.close()
+
+    def read(self, config, fs=None):
+        """Read data from Arrow IPC file."""
+        data = []
+        for batch in self.iter_batches(config, fs=fs):
+            data.extend(batch)
+        return data
+
+    def read_head(self, config, limit, fs=None):
+        """Read only the first `limit` records."""
+        batches = self.iter_batches({**config, 'batchSize': limit}, fs=fs)
+        try:
+            return next(batches, [])
+        finally:
+            batches.close()
+
+    def read_metadata(self, config, fs=None):
+        """
+        Read schema and row count without converting any data.
+
+        Returns:
+            Dictionary with 'schema' (pyarrow.Schema) and 'numRows' (read from the record
+            batch headers of files in IPC file format; None for the stream format, which
+            has no footer to find them by, and with pyarrow versions without count_rows)
+        """
+        self._check_pyarrow()
+        file_path = config.get('filePath')
+        source = fs.open(file_path, 'rb') if fs else pa.memory_map(file_path, 'r')
+        try:
+            reader = self._open_reader(source)
+            num_rows = None
+            if isinstance(reader, pa.ipc.RecordBatchFileReader) and hasattr(reader, 'count_rows'):
+                num_rows = reader.count_rows()
+            return {'schema': reader.schema, 'numRows': num_rows}
+        finally:
+            source.close()
+
+    def write(self, data, config, fs=None):
+        """Write data to Arrow IPC file."""
+        if not data:
+            return False
+        return self.write_batches([data], config, fs=fs)
+
+    def write_batches(self, batches, config, fs=None):
+        """
+        Write an iterable of record batches to an Arrow IPC file, one record batch per input batch.
+
+        An IPC file has a single schema, fixed when the writer opens. Batches are held back
+        until every column has had a non-null value (or schemaInferenceRows rows have been
+        seen), and the schema is unified over them, so sparse columns that are null in the
+        first batch still get their real type. Later batches must fit that schema: new
+        columns, type changes and lossy numeric conversions fail the write rather than
+        being dropped or truncated.
+
+        Config:
+            compression: 'none' (default), 'lz4' or 'zstd'
+            arrowFormat: 'file' (default, random access / Feather v2) or 'stream'
+            schemaInferenceRows: Most rows held back to infer the schema (default 100000)
+        """
+        self._check_pyarrow()
+        file_path = config.get('filePath')
+        compression = config.get('compression') or None
+        if compression == 'none':
+            compression = None
+        arrow_format = config.get('arrowFormat', 'file')
+        inference_rows = int(config.get('schemaInferenceRows') or DEFAULT_SCHEMA_INFERENCE_ROWS)
+
+        if not file_path:
+            raise Exception('Arrow file path is required')
+
+        # Create directory
+        if fs:
+            try:
+                fs.makedirs(os.path.dirname(file_path), exist_ok=True)
+            except:
+                pass
+            sink = fs.open(file_path, 'wb')
+        else:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            sink = pa.OSFile(file_path, 'wb')
+
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        writer = None
+        schema = None
+        pending = []
+        pending_rows = 0
+
+        def open_writer():
+            if arrow_format == 'stream':
+                return pa.ipc.new_stream(sink, schema, options=options)
+            return pa.ipc.new_file(sink, schema, options=options)
+
+        def write(batch):
+            try:
+                record_batch = _to_record_batch(batch, schema)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+                raise Exception(
+                    f"batch does not match the schema inferred from the first {pending_rows} rows ({e}); "
+                    f"increase schemaInferenceRows"
+                )
+            writer.write_batch(record_batch)
+
+        try:
+            for batch in batches:
+                if not batch:
+                    continue
+                if writer is not None:
+                    write(batch)
+                    continue
+
+                batch_schema = _infer_schema(batch)
+                schema = _unify_schemas([schema, batch_schema]) if schema else batch_schema
+                pending.append(batch)
+                pending_rows += len(batch)
+                if pending_rows >= inference_rows or not any(pa.types.is_null(f.type) for f in schema):
+                    writer = open_writer()
+                    for held in pending:
+                        write(held)
+                    pending = []
+
+            if pending:
+                # Input ended while columns were still all-null; they stay null-typed
+                writer = open_writer()
+                for held in pending:
+                    write(held)
+        except Exception as e:
+            raise Exception(f"Failed to write Arrow file: {str(e)}")
+        finally:
+            if writer is not None:
+                writer.close()
+            sink.close()
+
+        return writer is not None
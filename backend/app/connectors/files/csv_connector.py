@@ -1,11 +1,13 @@
 import csv
 import os
 
+DEFAULT_BATCH_SIZE = 10000
+
 class CSVConnector:
     """Connector for reading and writing CSV files using standard library."""
     
-    def read(self, config, fs=None):
-        """Read data from CSV file."""
+    def iter_batches(self, config, fs=None):
+        """Read a CSV file lazily, yielding lists of records."""
         file_path = config.get('filePath')
         delimiter = config.get('delimiter', ',')
         has_header = config.get('hasHeader', True)
@@ -24,21 +26,65 @@ class CSVConnector:
                 raise Exception(f'CSV file not found: {file_path}')
             open_func = open
         
-        data = []
+        batch_size = int(config.get('batchSize') or DEFAULT_BATCH_SIZE)
+        
         # Open file using appropriate function
         with open_func(file_path, mode='rt', encoding=encoding, newline='') as f:
             reader = csv.DictReader(f, delimiter=delimiter) if has_header else csv.reader(f, delimiter=delimiter)
             
-            if has_header:
-                data = list(reader)
-            else:
-                # Convert list of lists to dict with generic keys if no header
-                raw_data = list(reader)
-                if raw_data:
-                    cols = [f'col_{i}' for i in range(len(raw_data[0]))]
-                    data = [dict(zip(cols, row)) for row in raw_data]
+            cols = None
+            batch = []
+            for row in reader:
+                if not has_header:
+                    # Convert list of lists to dict with generic keys if no header
+                    if cols is None:
+                        cols = [f'col_{i}' for i in range(len(row))]
+                    row = dict(zip(cols, row))
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
         
+    def read(self, config, fs=None):
+        """Read data from CSV file."""
+        data = []
+        for batch in self.iter_batches(config, fs=fs):
+            data.extend(batch)
         return data
+
+    def read_head(self, config, limit, fs=None):
+        """Read only the first `limit` records."""
+        batches = self.iter_batches({**config, 'batchSize': limit}, fs=fs)
+        try:
+            return next(batches, [])
+        finally:
+            batches.close()
+
+    def count_rows(self, config):
+        """
+        Count data rows in a local file by counting newlines in large binary chunks.
+
+        Quoted values containing newlines are counted as extra rows, so this is exact for
+        typical files but not guaranteed for every CSV.
+        """
+        file_path = config.get('filePath')
+        lines = 0
+        last = b'\n'
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(1024 * 1024)
+                if not chunk:
+                    break
+                lines += chunk.count(b'\n')
+                last = chunk[-1:]
+        if last != b'\n':
+            # Final line without a trailing newline
+            lines += 1
+        if config.get('hasHeader', True) and lines:
+            lines -= 1
+        return lines
     
     def write(self, data, config, fs=None):
         """Write data to CSV file."""
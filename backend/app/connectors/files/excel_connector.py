@@ -1,98 +1,222 @@
 import openpyxl
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+# python-calamine (Rust) parses workbooks much faster than openpyxl when installed
+try:
+    from python_calamine import CalamineWorkbook
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+DEFAULT_BATCH_SIZE = 10000
+
+def _calamine_value(value):
+    """Normalise calamine cell values to match openpyxl (None for empty cells, int for whole numbers)."""
+    if value == '':
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
 
 class ExcelConnector:
-    """Connector for reading and writing Excel files using openpyxl."""
+    """Connector for reading and writing Excel files using openpyxl (or calamine for reads)."""
     
-    def read(self, config, fs=None):
-        """Read data from Excel file."""
+    def _open(self, file_path, fs=None):
+        """Open the workbook file as a binary file object."""
+        if fs:
+            if not fs.exists(file_path):
+                 raise Exception(f'Excel file not found: {file_path}')
+            # Open as binary
+            return fs.open(file_path, 'rb')
+        if not os.path.exists(file_path):
+            raise Exception(f'Excel file not found: {file_path}')
+        return open(file_path, 'rb')
+
+    def _get_engine(self, config):
+        engine = config.get('engine', 'auto')
+        if engine == 'auto':
+            return 'calamine' if HAS_CALAMINE else 'openpyxl'
+        if engine == 'calamine' and not HAS_CALAMINE:
+            raise ImportError("python-calamine not installed. Install with: pip install python-calamine")
+        return engine
+
+    def _iter_sheet_rows(self, file_obj, sheet_name, engine):
+        """Return a lazy row-value iterator for a sheet and the workbook to close afterwards."""
+        if engine == 'calamine':
+            wb = CalamineWorkbook.from_filelike(file_obj)
+            if sheet_name not in wb.sheet_names:
+                sheet_name = wb.sheet_names[0]
+            sheet = wb.get_sheet_by_name(sheet_name)
+            rows = sheet.iter_rows() if hasattr(sheet, 'iter_rows') else iter(sheet.to_python())
+            return (tuple(_calamine_value(v) for v in row) for row in rows), None
+
+        wb = openpyxl.load_workbook(file_obj, read_only=True, data_only=True)
+        if sheet_name not in wb.sheetnames:
+            sheet_name = wb.sheetnames[0]
+        return wb[sheet_name].iter_rows(values_only=True), wb
+
+    def iter_batches(self, config, fs=None, sheet_name=None):
+        """
+        Read an Excel sheet lazily, yielding lists of records.
+
+        Rows are pulled with iter_rows(values_only=True) so cell objects are never materialised,
+        and only one batch of records is held in memory at a time.
+        """
         file_path = config.get('filePath')
-        sheet_name = config.get('sheetName', 'Sheet1')
+        sheet_name = sheet_name or config.get('sheetName', 'Sheet1')
         has_header = config.get('hasHeader', True)
+        batch_size = int(config.get('batchSize') or DEFAULT_BATCH_SIZE)
         
         if not file_path:
              raise Exception('Excel file path is required')
 
-        if fs:
-            if not fs.exists(file_path):
-                 raise Exception(f'Excel file not found: {file_path}')
-            # Open as binary
-            file_obj = fs.open(file_path, 'rb')
-        else:
-            if not os.path.exists(file_path):
-                raise Exception(f'Excel file not found: {file_path}')
-            file_obj = open(file_path, 'rb')
-            
+        file_obj = self._open(file_path, fs)
+        wb = None
         try:
-            wb = openpyxl.load_workbook(file_obj, read_only=True, data_only=True)
-            
-            if sheet_name not in wb.sheetnames:
-                sheet_name = wb.sheetnames[0]
-                
-            ws = wb[sheet_name]
-            data = []
-            rows = list(ws.rows)
+            rows, wb = self._iter_sheet_rows(file_obj, sheet_name, self._get_engine(config))
             
-            if not rows:
-                return []
-                
+            headers = None
             if has_header:
-                headers = [cell.value for cell in rows[0]]
-                for row in rows[1:]:
-                    record = {}
-                    for i, cell in enumerate(row):
-                        if i < len(headers):
-                            record[str(headers[i])] = cell.value
-                    data.append(record)
-            else:
-                for row in rows:
-                    record = {}
-                    for i, cell in enumerate(row):
-                        record[f'col_{i}'] = cell.value
-                    data.append(record)
-            
+                first = next(rows, None)
+                if first is None:
+                    return
+                headers = [str(h) for h in first]
+
+            batch = []
+            for row in rows:
+                if headers is not None:
+                    batch.append(dict(zip(headers, row)))
+                else:
+                    batch.append({f'col_{i}': value for i, value in enumerate(row)})
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            if wb is not None:
+                wb.close()
+            file_obj.close()
+
+    def read(self, config, fs=None):
+        """Read data from Excel file."""
+        data = []
+        for batch in self.iter_batches(config, fs=fs):
+            data.extend(batch)
+        return data
+
+    def read_sheets(self, config, sheet_names, fs=None):
+        """
+        Read several sheets concurrently.
+
+        Each sheet is parsed from its own file handle in a worker thread.
+
+        Returns:
+            Dictionary of sheet name -> list of records
+        """
+        def read_sheet(name):
+            data = []
+            for batch in self.iter_batches(config, fs=fs, sheet_name=name):
+                data.extend(batch)
             return data
+
+        max_workers = int(config.get('maxWorkers') or min(len(sheet_names), os.cpu_count() or 4))
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as pool:
+            results = pool.map(read_sheet, sheet_names)
+            return dict(zip(sheet_names, results))
+
+    def read_head(self, config, limit, fs=None):
+        """Read only the first `limit` records of the sheet."""
+        batches = self.iter_batches({**config, 'batchSize': limit}, fs=fs)
+        try:
+            return next(batches, [])
         finally:
-            if file_obj and not file_obj.closed and fs:
-                 file_obj.close()
-            # Local open() context manager is not used here due to wb loading, so we rely on GC or explicit close if we kept handle
-            # But openpyxl might require seekable, which fs.open provides.
-            # Ideally we wrap in try/finally to close file_obj if we opened it.
-            if hasattr(file_obj, 'close'):
-               file_obj.close()
+            batches.close()
 
+    def estimate_rows(self, config, fs=None):
+        """
+        Estimate data rows from the sheet's stored dimension without reading any rows.
+
+        Returns None if the workbook does not record its dimension.
+        """
+        file_obj = self._open(config.get('filePath'), fs)
+        try:
+            wb = openpyxl.load_workbook(file_obj, read_only=True)
+            try:
+                sheet_name = config.get('sheetName', 'Sheet1')
+                ws = wb[sheet_name] if sheet_name in wb.sheetnames else wb[wb.sheetnames[0]]
+                max_row = ws.max_row
+            finally:
+                wb.close()
+        finally:
+            file_obj.close()
+        if max_row is None:
+            return None
+        return max(max_row - 1, 0) if config.get('hasHeader', True) else max_row
+
+    def list_sheets(self, config, fs=None):
+        """List sheet names in the workbook."""
+        file_obj = self._open(config.get('filePath'), fs)
+        try:
+            if self._get_engine(config) == 'calamine':
+                return list(CalamineWorkbook.from_filelike(file_obj).sheet_names)
+            wb = openpyxl.load_workbook(file_obj, read_only=True)
+            try:
+                return list(wb.sheetnames)
+            finally:
+                wb.close()
+        finally:
+            file_obj.close()
     
     def write(self, data, config, fs=None):
         """Write data to Excel file."""
+        if not data:
+            return False
+        return self.write_batches([data], config, fs=fs)
+
+    def write_batches(self, batches, config, fs=None):
+        """
+        Write an iterable of record batches to an Excel file.
+
+        Uses openpyxl write-only mode, which streams rows out instead of keeping
+        the whole sheet in memory.
+        """
         file_path = config.get('filePath')
         sheet_name = config.get('sheetName', 'Sheet1')
         
         if not file_path:
             raise Exception('Excel file path is required')
             
-        if not data:
+        wb = None
+        ws = None
+        headers = None
+        for batch in batches:
+            if not batch:
+                continue
+            if wb is None:
+                # Create directory
+                if fs:
+                    try:
+                        fs.makedirs(os.path.dirname(file_path), exist_ok=True)
+                    except:
+                        pass
+                else:
+                    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+                wb = openpyxl.Workbook(write_only=True)
+                ws = wb.create_sheet(sheet_name)
+
+                # Write headers
+                headers = list(batch[0].keys())
+                ws.append(headers)
+
+            # Write data
+            for row in batch:
+                ws.append([row.get(h) for h in headers])
+
+        if wb is None:
             return False
-        
-        # Create directory
-        if fs:
-            try:
-                fs.makedirs(os.path.dirname(file_path), exist_ok=True)
-            except:
-                pass
-        else:
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = sheet_name
-        
-        # Write headers
-        headers = list(data[0].keys())
-        ws.append(headers)
-        
-        # Write data
-        for row in data:
-            ws.append([row.get(h) for h in headers])
             
         # Save to file object
         if fs:
@@ -1,8 +1,110 @@
+import datetime
+import decimal
+import gzip
+import io
 import json
 import os
+import textwrap
+
+# orjson is considerably faster and serialises dates natively; fall back to stdlib json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024  # 1 MiB
+
+
+def _json_default(obj):
+    """Serialise values from typed columns that json/orjson don't handle natively."""
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        # pandas NaT is a datetime subclass whose isoformat() is 'NaT'
+        if obj != obj:
+            return None
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        if not obj.is_finite():
+            return None
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode('utf-8', errors='replace')
+    if hasattr(obj, 'item'):
+        # numpy scalars
+        return obj.item()
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def _resolve_compression(file_path, compression):
+    """Resolve the compression codec from config, inferring it from the extension if needed."""
+    compression = (compression or 'infer').lower()
+    if compression == 'infer':
+        if file_path.endswith('.gz'):
+            return 'gzip'
+        if file_path.endswith('.zst'):
+            return 'zstd'
+        return None
+    if compression in ('none', ''):
+        return None
+    if compression not in ('gzip', 'zstd'):
+        raise Exception(f'Unsupported JSON compression: {compression}')
+    return compression
+
+
+class _CompressedStream:
+    """Wraps a raw binary file object with an on-the-fly compressor."""
+
+    def __init__(self, raw, compression):
+        self.raw = raw
+        if compression == 'gzip':
+            self.stream = gzip.GzipFile(fileobj=raw, mode='wb')
+        elif compression == 'zstd':
+            if not HAS_ZSTD:
+                raise ImportError("zstandard not installed. Install with: pip install zstandard")
+            self.stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+        else:
+            self.stream = raw
+
+    def write(self, data):
+        return self.stream.write(data)
+
+    def close(self):
+        if self.stream is not self.raw:
+            self.stream.close()
+        self.raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 
 class JSONConnector:
     """Connector for reading and writing JSON files."""
+
+    def _open_read(self, open_func, file_path, encoding, compression):
+        """Open a JSON file for text reading, decompressing on the fly if needed."""
+        if compression is None:
+            return open_func(file_path, mode='rt', encoding=encoding)
+
+        raw = open_func(file_path, mode='rb')
+        if compression == 'gzip':
+            stream = gzip.GzipFile(fileobj=raw, mode='rb')
+        else:
+            if not HAS_ZSTD:
+                raise ImportError("zstandard not installed. Install with: pip install zstandard")
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        # Decompressed streams are not seekable, which auto-detection relies on
+        return io.StringIO(io.TextIOWrapper(stream, encoding=encoding).read())
     
     def read(self, config, fs=None):
         """Read data from JSON file."""
@@ -22,8 +124,10 @@ class JSONConnector:
                 raise Exception(f'JSON file not found: {file_path}')
             open_func = open
         
+        compression = _resolve_compression(file_path, config.get('compression'))
+
         data = []
-        with open_func(file_path, mode='rt', encoding=encoding) as f:
+        with self._open_read(open_func, file_path, encoding, compression) as f:
             if json_mode == 'lines':
                 for line in f:
                     if line.strip():
@@ -60,8 +164,46 @@ class JSONConnector:
             
         return data
 
+    def _get_serializer(self, encoding, indent):
+        """
+        Build a row serializer returning encoded bytes.
+
+        orjson is used when available and the target encoding is UTF-8 (orjson only emits UTF-8).
+        The stdlib fallback keeps ensure_ascii so its output is valid in any ASCII-compatible encoding.
+        """
+        if HAS_ORJSON and encoding.lower().replace('-', '') == 'utf8':
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            if indent:
+                # orjson only supports 2-space indentation
+                option |= orjson.OPT_INDENT_2
+
+            def serialize(row):
+                return orjson.dumps(row, default=_json_default, option=option)
+            return serialize, 2 if indent else None
+
+        separators = None if indent else (',', ':')
+
+        def serialize(row):
+            return json.dumps(row, default=_json_default, indent=indent, separators=separators).encode(encoding)
+        return serialize, indent
+
     def write(self, data, config, fs=None):
         """Write data to JSON file."""
+        return self.write_batches([data], config, fs=fs)
+
+    def write_batches(self, batches, config, fs=None):
+        """
+        Write an iterable of record batches to a JSON file incrementally.
+
+        Rows are serialised as they arrive and flushed in large blocks, so the full payload
+        is never held in memory as a single string.
+
+        Config:
+            jsonMode: 'array' (default) or 'lines'
+            indent: Pretty-print indentation (opt-in, off by default)
+            compression: 'infer' (default, by extension), 'none', 'gzip' or 'zstd'
+            bufferSize: Bytes to accumulate before each write (default 1 MiB)
+        """
         file_path = config.get('filePath')
         encoding = config.get('encoding', 'utf-8')
         json_mode = config.get('jsonMode', 'array') # array, lines
@@ -69,6 +211,13 @@ class JSONConnector:
         if not file_path:
              raise Exception('JSON file path is required')
 
+        indent = config.get('indent')
+        if indent is True:
+            indent = 2
+        indent = int(indent) if indent else None
+        buffer_size = int(config.get('bufferSize') or DEFAULT_BUFFER_SIZE)
+        compression = _resolve_compression(file_path, config.get('compression'))
+
         if fs:
             try:
                 fs.makedirs(os.path.dirname(file_path), exist_ok=True)
@@ -79,11 +228,46 @@ class JSONConnector:
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
             open_func = open
 
-        with open_func(file_path, mode='wt', encoding=encoding) as f:
-            if json_mode == 'lines':
-                for row in data:
-                    f.write(json.dumps(row) + '\n')
-            else:
-                json.dump(data, f, indent=2)
+        lines_mode = json_mode == 'lines'
+        if lines_mode:
+            # NDJSON rows are always compact, one document per line
+            indent = None
+        serialize, indent = self._get_serializer(encoding, indent)
+        newline = '\n'.encode(encoding)
+
+        if lines_mode:
+            prefix, separator, suffix = b'', b'', newline
+        elif indent:
+            prefix, separator, suffix = '[\n'.encode(encoding), ',\n'.encode(encoding), '\n]'.encode(encoding)
+            pad = ' ' * indent
+            plain_serialize = serialize
+
+            def serialize(row):
+                return textwrap.indent(plain_serialize(row).decode(encoding), pad).encode(encoding)
+        else:
+            prefix, separator, suffix = b'[', b',', b']'
+
+        with _CompressedStream(open_func(file_path, mode='wb'), compression) as f:
+            chunks = []
+            pending = 0
+            first = True
+            for batch in batches:
+                for row in batch or []:
+                    encoded = serialize(row)
+                    chunks.append(prefix if first else separator)
+                    chunks.append(encoded)
+                    if lines_mode:
+                        chunks.append(newline)
+                    pending += len(encoded) + 2
+                    first = False
+                    if pending >= buffer_size:
+                        f.write(b''.join(chunks))
+                        chunks = []
+                        pending = 0
+
+            if not lines_mode:
+                chunks.append(b'[]' if first else suffix)
+            if chunks:
+                f.write(b''.join(chunks))
                 
         return True
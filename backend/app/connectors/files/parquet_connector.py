@@ -1,6 +1,12 @@
 import pandas as pd
 import os
 
+try:
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 class ParquetConnector:
     """Connector for reading and writing Parquet files using pandas."""
     
@@ -29,6 +35,29 @@ class ParquetConnector:
         except Exception as e:
             raise Exception(f"Failed to read Parquet file: {str(e)}")
     
+    def read_head(self, config, limit, fs=None):
+        """
+        Read the first `limit` records using only the footer and the first row group.
+
+        Returns:
+            Tuple of (records, metadata dict with 'numRows' and 'schema' (pyarrow.Schema))
+        """
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow not installed. Install with: pip install pyarrow")
+        file_path = config.get('filePath')
+        open_func = fs.open if fs else open
+        
+        try:
+            with open_func(file_path, 'rb') as f:
+                parquet_file = pq.ParquetFile(f)
+                metadata = {'numRows': parquet_file.metadata.num_rows, 'schema': parquet_file.schema_arrow}
+                if parquet_file.num_row_groups == 0:
+                    return [], metadata
+                table = parquet_file.read_row_group(0, columns=config.get('columns'))
+            return table.slice(0, limit).to_pylist(), metadata
+        except Exception as e:
+            raise Exception(f"Failed to read Parquet file: {str(e)}")
+    
     def write(self, data, config, fs=None):
         """Write data to Parquet file."""
         file_path = config.get('filePath')
@@ -3,30 +3,55 @@ import time
 import requests
 import struct
 import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.utils.cache import TTLCache, make_cache_key
+from config.settings import config as app_config
 
 try:
     from kafka import KafkaConsumer, KafkaProducer
+    from kafka.structs import OffsetAndMetadata, TopicPartition
     import fastavro
     KAFKA_AVAILABLE = True
 except ImportError:
     KAFKA_AVAILABLE = False
     KafkaConsumer = None
     KafkaProducer = None
+    OffsetAndMetadata = None
+    TopicPartition = None
     fastavro = None
 
+# Negative cache marker for subjects / schema IDs the registry does not have
+_MISSING = object()
+
 class SimpleSchemaRegistryClient:
-    """Minimal Schema Registry Client to fetch/register schemas."""
+    """
+    Minimal Schema Registry Client to fetch/register schemas.
+
+    Schemas by ID are immutable and cached for the life of the client. Latest-version
+    lookups per subject expire after SCHEMA_REGISTRY_CACHE_TTL, and 404s are remembered for
+    SCHEMA_REGISTRY_NEGATIVE_TTL so a missing subject is not re-queried for every batch.
+    """
     def __init__(self, url, auth=None):
         self.url = url.rstrip('/')
         self.auth = auth # (user, pass) or None
+        self.session = requests.Session()
+        self.session.auth = auth
+        self.timeout = 10
         self.schema_cache = {} # id -> schema
-        self.subject_cache = {} # subject -> (id, schema)
+        self.subject_cache = TTLCache(1024, app_config.SCHEMA_REGISTRY_CACHE_TTL) # subject -> (id, schema)
+        self.missing_ids = TTLCache(1024, app_config.SCHEMA_REGISTRY_NEGATIVE_TTL)
 
     def get_schema(self, schema_id):
-        if schema_id in self.schema_cache:
-            return self.schema_cache[schema_id]
+        schema = self.schema_cache.get(schema_id)
+        if schema is not None:
+            return schema
+        if self.missing_ids.get(schema_id) is not None:
+            raise Exception(f"Schema ID {schema_id} not found in registry")
         
-        resp = requests.get(f"{self.url}/schemas/ids/{schema_id}", auth=self.auth)
+        resp = self.session.get(f"{self.url}/schemas/ids/{schema_id}", timeout=self.timeout)
+        if resp.status_code == 404:
+            self.missing_ids.set(schema_id, True)
         resp.raise_for_status()
         schema_str = resp.json()['schema']
         schema = fastavro.parse_schema(json.loads(schema_str))
@@ -34,10 +59,15 @@ class SimpleSchemaRegistryClient:
         return schema
 
     def get_latest_schema(self, subject):
-        if subject in self.subject_cache:
-             return self.subject_cache[subject]
+        cached = self.subject_cache.get(subject)
+        if cached is _MISSING:
+            raise Exception(f"Subject {subject} not found in registry")
+        if cached is not None:
+            return cached
              
-        resp = requests.get(f"{self.url}/subjects/{subject}/versions/latest", auth=self.auth)
+        resp = self.session.get(f"{self.url}/subjects/{subject}/versions/latest", timeout=self.timeout)
+        if resp.status_code == 404:
+            self.subject_cache.set(subject, _MISSING, ttl=app_config.SCHEMA_REGISTRY_NEGATIVE_TTL)
         resp.raise_for_status()
         data = resp.json()
         schema_id = data['id']
@@ -45,22 +75,164 @@ class SimpleSchemaRegistryClient:
         schema = fastavro.parse_schema(json.loads(schema_str))
         
         self.schema_cache[schema_id] = schema
-        self.subject_cache[subject] = (schema_id, schema)
+        self.subject_cache.set(subject, (schema_id, schema))
         return schema_id, schema
 
     def register_schema(self, subject, schema_dict):
         # Check cache first if we want strict caching, but for register we usually ping
-        resp = requests.post(
+        resp = self.session.post(
             f"{self.url}/subjects/{subject}/versions", 
-            auth=self.auth,
             headers={'Content-Type': 'application/vnd.schemaregistry.v1+json'},
-            json={'schema': json.dumps(schema_dict)}
+            json={'schema': json.dumps(schema_dict)},
+            timeout=self.timeout
         )
         resp.raise_for_status()
         schema_id = resp.json()['id']
         self.schema_cache[schema_id] = fastavro.parse_schema(schema_dict)
+        # The latest version may have changed
+        self.subject_cache.invalidate(subject)
         return schema_id
 
+_registry_clients = {}
+_registry_lock = threading.Lock()
+
+def get_registry_client(url, auth=None):
+    """Shared Schema Registry client per registry URL and credentials, so its caches outlive a run."""
+    key = make_cache_key(url.rstrip('/'), auth)
+    with _registry_lock:
+        client = _registry_clients.get(key)
+        if client is None:
+            client = SimpleSchemaRegistryClient(url, auth=auth)
+            _registry_clients[key] = client
+        return client
+
+class AvroCodec:
+    """
+    Confluent wire format (magic byte 0 + 4-byte schema ID + Avro body) for batches of messages.
+
+    Schemas are resolved once per batch with prefetch(), so decode() and encode_batch() only
+    do dictionary lookups and never call the registry per message.
+    """
+    HEADER = struct.Struct('>bI')
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.schemas = {}
+
+    def prefetch(self, payloads):
+        """Resolve the schemas of every wire-format payload in a batch."""
+        header = self.HEADER
+        for schema_id in {header.unpack_from(p)[1] for p in payloads if p and len(p) >= 5 and p[0] == 0}:
+            if schema_id not in self.schemas:
+                try:
+                    self.schemas[schema_id] = self.registry.get_schema(schema_id)
+                except Exception as e:
+                    # Left to fail per message in decode(), from the negative cache
+                    print(f"Error fetching schema {schema_id}: {e}")
+
+    def decode(self, payload):
+        """Decode one payload, or return None if it is not in Confluent wire format."""
+        if len(payload) < 5:
+            return None # Not a valid schema registry payload
+        magic, schema_id = self.HEADER.unpack_from(payload)
+        if magic != 0:
+            return None # Not confluent format
+        schema = self.schemas.get(schema_id)
+        if schema is None:
+            schema = self.schemas[schema_id] = self.registry.get_schema(schema_id)
+        # BytesIO shares the payload's memory; reading starts after the header without a copy
+        buffer = io.BytesIO(payload)
+        buffer.seek(5)
+        return fastavro.schemaless_reader(buffer, schema)
+
+    def encode_batch(self, rows, schema_id, schema):
+        """Encode records with one schema, reusing a single output buffer for the batch."""
+        header = self.HEADER.pack(0, schema_id)
+        buffer = io.BytesIO()
+        writer = fastavro.schemaless_writer
+        encoded = []
+        for row in rows:
+            buffer.seek(0)
+            buffer.truncate()
+            buffer.write(header)
+            writer(buffer, schema, row)
+            encoded.append(buffer.getvalue())
+        return encoded
+
+class KafkaProducerPool:
+    """
+    Process-wide KafkaProducers keyed by their configuration.
+
+    KafkaProducer is thread-safe and keeps its own broker connections and send buffers,
+    so executions with the same bootstrap, security and producer settings share one
+    instead of paying the bootstrap on every run.
+    """
+
+    def __init__(self):
+        self.producers = {}
+        self._lock = threading.Lock()
+
+    def get_producer(self, params):
+        key = make_cache_key(params)
+        with self._lock:
+            entry = self.producers.get(key)
+            if entry is None:
+                entry = {
+                    'producer': KafkaProducer(**params),
+                    'servers': ','.join(params.get('bootstrap_servers', [])),
+                    'created': time.time(),
+                    'messages': 0
+                }
+                self.producers[key] = entry
+            return entry
+
+    def stats(self):
+        with self._lock:
+            entries = list(self.producers.values())
+        return [{'servers': e['servers'], 'messages': e['messages'], 'created': e['created']} for e in entries]
+
+    def close_all(self):
+        with self._lock:
+            entries = list(self.producers.values())
+            self.producers.clear()
+        for entry in entries:
+            try:
+                entry['producer'].close(timeout=10)
+            except Exception as e:
+                print(f"Error closing Kafka producer: {e}")
+
+producer_pool = KafkaProducerPool()
+
+class DeliveryReport:
+    """Aggregates asynchronous delivery callbacks for one write."""
+
+    MAX_ERRORS = 5
+
+    def __init__(self):
+        self.delivered = 0
+        self.failed = 0
+        self.errors = []
+        self._lock = threading.Lock()
+
+    def on_delivery(self, metadata):
+        with self._lock:
+            self.delivered += 1
+
+    def on_error(self, exc):
+        with self._lock:
+            self.failed += 1
+            if len(self.errors) < self.MAX_ERRORS:
+                self.errors.append(str(exc))
+
+def _message_key(row, key_columns):
+    """Message key from the configured columns; multiple columns are joined with '|'."""
+    if not key_columns:
+        return None
+    values = [row.get(col) for col in key_columns]
+    if len(values) == 1:
+        return None if values[0] is None else str(values[0]).encode('utf-8')
+    return '|'.join('' if v is None else str(v) for v in values).encode('utf-8')
+
 class KafkaConnector:
     """Connector for reading from and writing to Kafka with advanced config and Schema Registry support."""
     
@@ -72,7 +244,7 @@ class KafkaConnector:
         }
         
         # SASL Configs
-        if params['security_protocol'].startwith('SASL'):
+        if params['security_protocol'].startswith('SASL'):
             params['sasl_mechanism'] = config.get('saslMechanism', 'PLAIN')
             username = config.get('saslUsername')
             password = config.get('saslPassword')
@@ -90,155 +262,332 @@ class KafkaConnector:
                     
         return params
 
-    def _decode_avro(self, payload, registry):
-        """Decodes Confluent Wire Format (Magic Byte 0 + 4-byte ID + Avro Data)."""
-        if len(payload) < 5:
-            return None # Not a valid schema registry payload
-        
-        magic, schema_id = struct.unpack('>bI', payload[:5])
-        if magic != 0:
-            return None # Not confluent format
-            
-        schema = registry.get_schema(schema_id)
-        return fastavro.schemaless_reader(io.BytesIO(payload[5:]), schema)
+    def _get_codec(self, config):
+        """Avro codec over the shared Schema Registry client when enabled in the config, else None."""
+        if not config.get('useSchemaRegistry', False):
+            return None
+        sr_url = config.get('schemaRegistryUrl')
+        sr_auth = None
+        if config.get('schemaRegistryUser'):
+            sr_auth = (config.get('schemaRegistryUser'), config.get('schemaRegistryPass'))
+        return AvroCodec(get_registry_client(sr_url, auth=sr_auth))
 
-    def read(self, config):
-        """Read data from Kafka topic."""
+    def _get_consumer_config(self, config):
+        """Consumer configs shared by one-off reads and streaming."""
         params = self._get_common_config(config)
-        topic = config.get('topic')
-        if not topic: raise Exception('Kafka topic is required')
-        
-        # Consumer Params
         params.update({
             'group_id': config.get('groupId'),
             'auto_offset_reset': config.get('autoOffsetReset', 'earliest'),
-            'enable_auto_commit': True,
-            'consumer_timeout_ms': int(config.get('timeoutMs', 1000)),
             'max_poll_records': int(config.get('maxMessages', 1000)), # used loosely as batch limit here
         })
         
         # Advanced overrides
         if config.get('sessionTimeoutMs'): params['session_timeout_ms'] = int(config.get('sessionTimeoutMs'))
         if config.get('heartbeatIntervalMs'): params['heartbeat_interval_ms'] = int(config.get('heartbeatIntervalMs'))
+        if config.get('maxPollIntervalMs'): params['max_poll_interval_ms'] = int(config.get('maxPollIntervalMs'))
+        return params
+
+    def _decode_messages(self, messages, codec):
+        """Decode message values into record dicts (Avro via Schema Registry, JSON or plain text)."""
+        if codec:
+            # Schema lookups for the whole batch up front, none per message
+            codec.prefetch([m.value for m in messages])
+        
+        data = []
+        for message in messages:
+            if message.value is None:
+                continue # Tombstone
+            try:
+                if codec:
+                    # Try decoding Avro (Confluent format)
+                    val = codec.decode(message.value)
+                    # Fallback if not avro format?
+                    if val is None:
+                        val = message.value.decode('utf-8')
+                else:
+                    # Default JSON/String decoding
+                    decoded = message.value.decode('utf-8')
+                    try: val = json.loads(decoded)
+                    except: val = {'value': decoded}
+                
+                # Flatten or dict check
+                if not isinstance(val, dict): val = {'value': val}
+                data.append(val)
+            except Exception as e:
+                # Log error per row?
+                print(f"Error decoding message: {e}")
+        return data
+
+    def read(self, config):
+        """Read data from Kafka topic."""
+        return self.consume(config)[0]
+
+    def consume(self, config, ranges=None):
+        """
+        Consume up to maxMessages messages with poll(), across all partitions of the topic.
+
+        Offsets are never auto-committed; commit the returned ranges with commit_offsets()
+        once the records have been processed. Each poll returns messages grouped by
+        partition, and with decodeWorkers > 1 the partitions are decoded in parallel.
+
+        Args:
+            config: Component configuration
+            ranges: Replay exactly these ranges ({topic, partition, startOffset, endOffset})
+                    instead of continuing from the consumer group's committed offsets
+
+        Returns:
+            Tuple of (records, ranges consumed)
+        """
+        params = self._get_consumer_config(config)
+        topic = config.get('topic')
+        if not topic: raise Exception('Kafka topic is required')
+        
+        limit = int(config.get('maxMessages', 1000))
+        timeout_ms = int(config.get('timeoutMs', 1000))
+        decode_workers = int(config.get('decodeWorkers') or 1)
+        params['enable_auto_commit'] = False
         
         # Schema Registry Init
-        registry = None
-        use_sr = config.get('useSchemaRegistry', False)
-        if use_sr:
-            sr_url = config.get('schemaRegistryUrl')
-            sr_auth = None
-            if config.get('schemaRegistryUser'):
-                sr_auth = (config.get('schemaRegistryUser'), config.get('schemaRegistryPass'))
-            registry = SimpleSchemaRegistryClient(sr_url, auth=sr_auth)
+        codec = self._get_codec(config)
 
         # Initialize Consumer
-        # Note: We configure value_deserializer based on mode
-        consumer = KafkaConsumer(topic, **params)
+        if ranges:
+            # Replay: assigned partitions outside the group, so its offsets are untouched
+            params['group_id'] = None
+            consumer = KafkaConsumer(**params)
+            ends = {TopicPartition(r['topic'], r['partition']): r['endOffset'] for r in ranges}
+            consumer.assign(list(ends))
+            for r in ranges:
+                consumer.seek(TopicPartition(r['topic'], r['partition']), r['startOffset'])
+            limit = sum(r['endOffset'] - r['startOffset'] + 1 for r in ranges)
+        else:
+            consumer = KafkaConsumer(topic, **params)
+            ends = None
         
-        data = []
+        pool = ThreadPoolExecutor(max_workers=decode_workers) if decode_workers > 1 else None
+        chunks = []
+        consumed = {}
         count = 0
-        limit = int(config.get('maxMessages', 1000))
         
         try:
-            for message in consumer:
-                val = None
-                try:
-                    if use_sr and message.value:
-                        # Try decoding Avro (Confluent format)
-                        val = self._decode_avro(message.value, registry)
-                        # Fallback if not avro format?
-                        if val is None:
-                            val = message.value.decode('utf-8')
+            while count < limit:
+                polled = consumer.poll(timeout_ms=timeout_ms, max_records=limit - count)
+                if not polled:
+                    break
+                for tp, messages in polled.items():
+                    if ends is not None:
+                        messages = [m for m in messages if m.offset <= ends[tp]]
+                        if not messages:
+                            continue
+                    first, last = consumed.get(tp, (messages[0].offset, None))
+                    consumed[tp] = (first, messages[-1].offset)
+                    count += len(messages)
+                    # Decoded per partition, in parallel when workers are configured
+                    if pool:
+                        chunks.append(pool.submit(self._decode_messages, messages, codec))
                     else:
-                        # Default JSON/String decoding
-                        decoded = message.value.decode('utf-8')
-                        try: val = json.loads(decoded)
-                        except: val = {'value': decoded}
-                    
-                    if val is not None:
-                        # Flatten or dict check
-                        if not isinstance(val, dict): val = {'value': val}
-                        data.append(val)
-                        
-                except Exception as e:
-                    # Log error per row?
-                    print(f"Error decoding message: {e}")
-                    pass
-                
-                count += 1
-                if count >= limit:
+                        chunks.append(self._decode_messages(messages, codec))
+                if ends is not None and all(consumer.position(tp) > end for tp, end in ends.items()):
                     break
+            
+            data = []
+            for chunk in chunks:
+                data.extend(chunk.result() if pool else chunk)
         finally:
-            consumer.close()
+            if pool:
+                pool.shutdown(wait=False)
+            consumer.close(autocommit=False)
             
-        return data
+        consumed_ranges = [
+            {'topic': tp.topic, 'partition': tp.partition, 'startOffset': first, 'endOffset': last}
+            for tp, (first, last) in sorted(consumed.items(), key=lambda item: (item[0].topic, item[0].partition))
+        ]
+        return data, consumed_ranges
+
+    def commit_offsets(self, config, ranges):
+        """
+        Commit consumed ranges to the consumer group (next offset = endOffset + 1).
 
-    def write(self, data, config):
-        """Write data to Kafka topic."""
+        Uses a short-lived consumer with manually assigned partitions, so it works after the
+        consuming consumer has left the group.
+        """
+        if not ranges or not config.get('groupId'):
+            return
+        params = self._get_consumer_config(config)
+        params['enable_auto_commit'] = False
+        consumer = KafkaConsumer(**params)
+        try:
+            offsets = {TopicPartition(r['topic'], r['partition']): _offset_and_metadata(r['endOffset'] + 1) for r in ranges}
+            consumer.assign(list(offsets))
+            consumer.commit(offsets)
+        finally:
+            consumer.close(autocommit=False)
+
+    def open_stream(self, config):
+        """Open a long-lived consumer that reads the topic in micro-batches (see KafkaMicroBatchReader)."""
+        return KafkaMicroBatchReader(self, config)
+
+    def _get_producer_config(self, config):
+        """Producer configs: common settings plus acks, retries, batching and compression."""
         params = self._get_common_config(config)
-        topic = config.get('topic')
-        if not topic: raise Exception('Kafka topic is required')
-        
-        # Producer Params
         params.update({
             'acks': config.get('acks', 'all'),
             'retries': int(config.get('retries', 0) if config.get('retries') else 2147483647),
-            'batch_size': int(config.get('batchSize', 16384)),
-            'linger_ms': int(config.get('lingerMs', 0)),
-            'compression_type': config.get('compressionType') if config.get('compressionType') != 'none' else None
+            'batch_size': int(config.get('batchSize') or 16384),
+            'linger_ms': int(config.get('lingerMs') or 0),
+            'compression_type': config.get('compressionType') if config.get('compressionType') not in (None, '', 'none') else None
         })
         
         # Convert numeric acks if possible (0, 1) or keep 'all'
         if params['acks'] in ['0', '1']: params['acks'] = int(params['acks'])
+        return params
+
+    def write(self, batches, config):
+        """
+        Write record batches to a Kafka topic through a pooled producer.
+
+        Sends are asynchronous: records are handed to the producer, which groups them per
+        partition up to batchSize bytes / lingerMs, and delivery callbacks are aggregated.
+        The producer is flushed (not closed) at the end and any failed deliveries raise.
+
+        Config:
+            keyColumns: Columns forming the message key (list or comma-separated), so records
+                        of the same entity go to the same partition in order
+
+        Returns:
+            Dictionary with messages, bytes, seconds, messagesPerSec and mbPerSec
+        """
+        topic = config.get('topic')
+        if not topic: raise Exception('Kafka topic is required')
+        
+        key_columns = config.get('keyColumns') or []
+        if isinstance(key_columns, str):
+            key_columns = [k.strip() for k in key_columns.split(',') if k.strip()]
 
         # Schema Registry Init
-        registry = None
-        use_sr = config.get('useSchemaRegistry', False)
+        codec = self._get_codec(config)
         schema_id = None
-        if use_sr:
-            sr_url = config.get('schemaRegistryUrl')
-            sr_auth = None
-            if config.get('schemaRegistryUser'):
-                sr_auth = (config.get('schemaRegistryUser'), config.get('schemaRegistryPass'))
-            registry = SimpleSchemaRegistryClient(sr_url, auth=sr_auth)
-            
-            # Fetch or Register Schema
-            # For simplicity, we assume we need to register schema based on first row or use latest
-            # Strategy: if 'valueSubject' is set, try getting latest. If not, try inferring from data[0]?
-            # Usually users want to use latest registered schema or register a new one.
-            subject = config.get('valueSubject', f"{topic}-value")
-            
-            # For writing, we need a schema. 
-            # 1. Try get latest
+        if codec:
+            # Use the latest schema registered for the subject (cached per subject)
+            subject = config.get('valueSubject') or f"{topic}-value"
             try:
-                schema_id, schema = registry.get_latest_schema(subject)
-            except:
-                # 2. If 404, try inferring from data (complex) or require user to have registered it.
-                # For this implementation, we will assume schema exists or fail if we can't infer.
-                # Let's try to infer from first record using fastavro? (No, fastavro doesn't infer easily).
-                # We will log warning and fail if no schema found.
-                print(f"Schema not found for subject {subject}, and inference not implemented.")
-                return False
-
-        producer = KafkaProducer(**params)
+                schema_id, schema = codec.registry.get_latest_schema(subject)
+            except Exception as e:
+                # Inference from the records is not implemented, the schema must be registered
+                raise Exception(f"Schema not found for subject {subject}: {e}")
+
+        entry = producer_pool.get_producer(self._get_producer_config(config))
+        producer = entry['producer']
+        report = DeliveryReport()
+        stats = {'messages': 0, 'bytes': 0}
+        start = time.perf_counter()
         
-        if not data: return False
-            
-        for row in data:
-            key = None # We don't support keys in this simple writer yet
-            
-            if use_sr and schema_id:
+        for batch in batches:
+            if schema_id:
                 # Encode Avro (Magic Byte + ID + Data)
-                out = io.BytesIO()
-                out.write(struct.pack('>bI', 0, schema_id))
-                fastavro.schemaless_writer(out, schema, row)
-                val_bytes = out.getvalue()
-                producer.send(topic, value=val_bytes, key=key)
+                values = codec.encode_batch(batch, schema_id, schema)
             else:
                 # JSON
-                producer.send(topic, value=json.dumps(row).encode('utf-8'), key=key)
+                values = [json.dumps(row, default=str).encode('utf-8') for row in batch]
+            
+            for row, val_bytes in zip(batch, values):
+                future = producer.send(topic, value=val_bytes, key=_message_key(row, key_columns))
+                future.add_callback(report.on_delivery)
+                future.add_errback(report.on_error)
+                stats['bytes'] += len(val_bytes)
+            stats['messages'] += len(values)
             
+        # Wait for outstanding sends; the producer stays open in the pool
         producer.flush()
-        producer.close()
+        entry['messages'] += stats['messages']
                 
-        return True
+        if report.failed:
+            raise Exception(
+                f"{report.failed} of {stats['messages']} messages failed to deliver to {topic}: {'; '.join(report.errors)}"
+            )
+        
+        seconds = time.perf_counter() - start
+        stats['seconds'] = round(seconds, 2)
+        stats['messagesPerSec'] = round(stats['messages'] / seconds) if seconds > 0 else stats['messages']
+        stats['mbPerSec'] = round(stats['bytes'] / 1048576 / seconds, 2) if seconds > 0 else 0
+        return stats
+
+class KafkaMicroBatchReader:
+    """
+    Long-lived consumer that cuts a topic into micro-batches by message count or time.
+
+    Auto-commit is disabled: offsets are committed with commit() once a batch has been
+    processed, so a batch that fails downstream is delivered again after a restart.
+    """
+
+    def __init__(self, connector, config):
+        if not KAFKA_AVAILABLE:
+            raise ImportError("kafka-python not installed. Install with: pip install kafka-python fastavro")
+        topic = config.get('topic')
+        if not topic: raise Exception('Kafka topic is required')
+        if not config.get('groupId'): raise Exception('Streaming mode requires a consumer group ID')
+
+        self.connector = connector
+        self.codec = connector._get_codec(config)
+        self.batch_max_messages = int(config.get('batchMaxMessages') or config.get('maxMessages') or 1000)
+        self.batch_interval = int(config.get('batchIntervalMs') or 5000) / 1000
+
+        params = connector._get_consumer_config(config)
+        params['enable_auto_commit'] = False
+        self.consumer = KafkaConsumer(topic, **params)
+
+    def next_batch(self, stop_event=None):
+        """
+        Poll until batchMaxMessages messages arrive or batchIntervalMs has passed.
+
+        Returns:
+            dict with records, messages (including undecodable ones), offsets
+            ({TopicPartition: next offset to commit}) and oldestTimestamp (ms, or None)
+        """
+        records = []
+        offsets = {}
+        messages = 0
+        oldest_timestamp = None
+        deadline = time.monotonic() + self.batch_interval
+
+        while messages < self.batch_max_messages and not (stop_event and stop_event.is_set()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # Short polls so a stop request is noticed quickly
+            polled = self.consumer.poll(
+                timeout_ms=int(min(remaining, 1) * 1000),
+                max_records=self.batch_max_messages - messages
+            )
+            for tp, partition_messages in polled.items():
+                records.extend(self.connector._decode_messages(partition_messages, self.codec))
+                for message in partition_messages:
+                    if message.timestamp is not None and message.timestamp >= 0:
+                        oldest_timestamp = message.timestamp if oldest_timestamp is None else min(oldest_timestamp, message.timestamp)
+                messages += len(partition_messages)
+                offsets[tp] = partition_messages[-1].offset + 1
+
+        return {'records': records, 'messages': messages, 'offsets': offsets, 'oldestTimestamp': oldest_timestamp}
+
+    def commit(self, offsets):
+        """Commit the offsets of a processed batch to the consumer group."""
+        if offsets:
+            self.consumer.commit({tp: _offset_and_metadata(offset) for tp, offset in offsets.items()})
+
+    def lag(self):
+        """Messages between the consumer position and the end of each assigned partition."""
+        partitions = list(self.consumer.assignment())
+        if not partitions:
+            return 0
+        end_offsets = self.consumer.end_offsets(partitions)
+        return sum(max(end_offsets[tp] - self.consumer.position(tp), 0) for tp in partitions)
+
+    def close(self):
+        self.consumer.close(autocommit=False)
+
+def _offset_and_metadata(offset):
+    # kafka-python 2.1 added leader_epoch to OffsetAndMetadata
+    try:
+        return OffsetAndMetadata(offset, '', -1)
+    except TypeError:
+        return OffsetAndMetadata(offset, '')
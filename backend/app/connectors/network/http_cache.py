@@ -0,0 +1,249 @@
+import base64
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+import requests
+from requests.structures import CaseInsensitiveDict
+from app.utils.cache import TTLCache, make_cache_key
+from config.settings import config as app_config
+
+CACHEABLE_METHODS = ('GET', 'HEAD')
+CACHEABLE_STATUS = {200, 203, 204, 300, 301, 404, 410}
+
+# Responses larger than this are passed through without being cached
+MAX_ENTRY_BYTES = 4 * 1024 * 1024
+
+# How often the disk store's size is checked
+SWEEP_INTERVAL = 60
+
+def parse_cache_control(value):
+    """Cache-Control directives as {name: value or True}"""
+    directives = {}
+    for part in (value or '').split(','):
+        name, _, arg = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else True
+    return directives
+
+def freshness_lifetime(headers, default_ttl):
+    """
+    Seconds a response may be served without revalidation, or None if it must not be stored.
+
+    max-age wins over Expires; responses with neither are fresh for default_ttl.
+    """
+    directives = parse_cache_control(headers.get('Cache-Control'))
+    if 'no-store' in directives or headers.get('Vary', '').strip() == '*':
+        return None
+    if 'no-cache' in directives:
+        return 0
+
+    age = 0
+    try:
+        age = int(headers.get('Age') or 0)
+    except ValueError:
+        pass
+
+    if 'max-age' in directives:
+        try:
+            return max(int(directives['max-age']) - age, 0)
+        except (TypeError, ValueError):
+            return 0
+    if headers.get('Expires'):
+        try:
+            expires = parsedate_to_datetime(headers['Expires'])
+            date = parsedate_to_datetime(headers['Date']) if headers.get('Date') else None
+            now = date.timestamp() if date else time.time()
+            return max(int(expires.timestamp() - now) - age, 0)
+        except (TypeError, ValueError):
+            return 0 # Invalid Expires means already expired
+    return default_ttl
+
+def to_response(entry):
+    """Rebuild a requests.Response from a cache entry"""
+    response = requests.Response()
+    response.status_code = entry['status']
+    response.headers = CaseInsensitiveDict(entry['headers'])
+    response._content = entry['body']
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.url = entry['url']
+    response.reason = 'OK' if entry['status'] == 200 else ''
+    return response
+
+class ResponseCache:
+    """
+    Process-wide cache of HTTP responses for REST components.
+
+    Entries live in a bounded LRU in memory and, when REST_CACHE_DIR is set, also as one
+    file each on disk, so they survive restarts and are shared by every worker process.
+    Stale entries are kept while they have a validator (ETag / Last-Modified) so they can
+    be revalidated with a conditional request instead of downloaded again.
+    """
+
+    def __init__(self, max_entries=None, cache_dir=None, max_bytes=None):
+        self.memory = TTLCache(max_entries or app_config.REST_CACHE_SIZE, ttl=None)
+        self.cache_dir = cache_dir if cache_dir is not None else app_config.REST_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else app_config.REST_CACHE_MAX_BYTES
+        self.disk_hits = 0
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self._last_sweep = 0
+
+    def make_key(self, method, url, headers):
+        """Key of a request: method, final URL and the request headers (sent values only)"""
+        return make_cache_key(method.upper(), url, sorted((k.lower(), str(v)) for k, v in (headers or {}).items()))
+
+    @contextmanager
+    def key_lock(self, key):
+        """
+        Serialise lookups of one key, so concurrent rows asking for the same resource wait
+        for the first request instead of all missing together.
+        """
+        with self._lock:
+            lock, users = self._key_locks.get(key, (threading.Lock(), 0))
+            self._key_locks[key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                lock, users = self._key_locks[key]
+                if users == 1:
+                    del self._key_locks[key]
+                else:
+                    self._key_locks[key] = (lock, users - 1)
+
+    def get(self, key):
+        """Entry for a key from memory or disk (fresh or stale), or None"""
+        entry = self.memory.get(key)
+        if entry is None and self.cache_dir:
+            entry = self._read(key)
+            if entry is not None:
+                self.disk_hits += 1
+                self.memory.set(key, entry)
+        return entry
+
+    def set(self, key, entry):
+        self.memory.set(key, entry)
+        if self.cache_dir:
+            self._write(key, entry)
+
+    def store(self, key, response, default_ttl):
+        """
+        Cache a response if its status and headers allow it
+
+        Returns:
+            The stored entry, or None if the response is not cacheable
+        """
+        if response.status_code not in CACHEABLE_STATUS or len(response.content) > MAX_ENTRY_BYTES:
+            return None
+        ttl = freshness_lifetime(response.headers, default_ttl)
+        validators = response.headers.get('ETag') or response.headers.get('Last-Modified')
+        if ttl is None or (ttl <= 0 and not validators):
+            return None
+
+        entry = {
+            'url': response.url,
+            'status': response.status_code,
+            'headers': dict(response.headers),
+            'body': response.content,
+            'expiresAt': time.time() + ttl
+        }
+        self.set(key, entry)
+        return entry
+
+    def refresh(self, key, entry, not_modified, default_ttl):
+        """
+        Apply a 304 Not Modified response to a stale entry and return the updated entry
+
+        Headers sent with the 304 (new Cache-Control, ETag, ...) replace the stored ones.
+        """
+        headers = CaseInsensitiveDict(entry['headers'])
+        for name in ('Cache-Control', 'Expires', 'Date', 'ETag', 'Last-Modified', 'Age', 'Vary'):
+            if name in not_modified.headers:
+                headers[name] = not_modified.headers[name]
+        ttl = freshness_lifetime(headers, default_ttl)
+
+        entry = dict(entry, headers=dict(headers), expiresAt=time.time() + (ttl or 0))
+        if ttl is None:
+            self.invalidate(key)
+        else:
+            self.set(key, entry)
+        return entry
+
+    def invalidate(self, key):
+        self.memory.invalidate(key)
+        if self.cache_dir:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f'{key}.json')
+
+    def _read(self, key):
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        entry['body'] = base64.b64decode(entry['body'])
+        return entry
+
+    def _write(self, key, entry):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Written to a temporary file first so readers in other processes never see half a file
+            tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(dict(entry, body=base64.b64encode(entry['body']).decode('ascii')), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Failed to write HTTP cache entry: {e}")
+            return
+        self._sweep()
+
+    def _sweep(self):
+        """Delete least recently written entries until the disk store fits in REST_CACHE_MAX_BYTES."""
+        now = time.time()
+        if now - self._last_sweep < SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+
+        files = []
+        total = 0
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        self.memory.clear()
+
+    def stats(self):
+        """Return cache statistics for monitoring."""
+        stats = self.memory.stats()
+        stats['diskHits'] = self.disk_hits
+        stats['diskDir'] = self.cache_dir or None
+        return stats
+
+# Global instance
+response_cache = ResponseCache()
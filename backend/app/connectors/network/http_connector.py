@@ -0,0 +1,346 @@
+import random
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.exceptions import NewConnectionError
+from app.connectors.network.http_cache import CACHEABLE_METHODS, response_cache, to_response
+from config.settings import config as app_config
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+# Methods that can be sent twice without a second effect; others could create duplicates
+# if a request the server already processed is sent again
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'}
+
+_session = None
+_session_lock = threading.Lock()
+
+def _is_connect_error(error):
+    """True if the request failed before it reached the server, so nothing was processed"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if isinstance(error, requests.Timeout):
+        return False
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+def get_session():
+    """
+    Process-wide requests Session, so connections to an API are kept alive and reused
+    across rows, components and executions.
+
+    Cookies are not stored, since the session is shared by unrelated jobs.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=app_config.REST_POOL_SIZE, pool_maxsize=app_config.REST_POOL_SIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            _session = session
+        return _session
+
+class HostRateLimiter:
+    """Spaces requests to each host so at most `rate` start per second (0 disables the limit)."""
+
+    def __init__(self, rate=0):
+        self.interval = 1.0 / float(rate) if rate and float(rate) > 0 else 0
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url):
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+class HttpRequestError(Exception):
+    """Request that failed after all retries; carries the last response status, if any."""
+
+    def __init__(self, message, status_code=None, attempts=1):
+        super().__init__(message)
+        self.status_code = status_code
+        self.attempts = attempts
+
+class HttpConnector:
+    """HTTP requests over the shared session with timeouts, per-host rate limiting, retries and optional caching."""
+
+    def __init__(self, config):
+        """
+        Config:
+            timeoutMs: Connect and read timeout per attempt (default 30000)
+            maxRetries: Retries for connection errors, timeouts, 429 and 5xx (default 3). POST
+                and PATCH are only retried on failed connects and 429, unless retryNonIdempotent
+            retryNonIdempotent: Retry POST and PATCH like idempotent methods (may send a request
+                the server already processed again)
+            backoffMs: Initial backoff, doubled per retry with jitter (default 500)
+            rateLimit: Maximum requests per second per host (default unlimited)
+            cache: Serve GET/HEAD responses from the shared response cache
+            cacheTtl: Seconds a response without Cache-Control/Expires stays fresh
+                (default REST_CACHE_TTL; 0 revalidates every time)
+        """
+        self.session = get_session()
+        self.timeout = int(config.get('timeoutMs') or 30000) / 1000
+        self.max_retries = int(config.get('maxRetries') if config.get('maxRetries') not in (None, '') else 3)
+        self.backoff = int(config.get('backoffMs') or 500) / 1000
+        self.retry_non_idempotent = bool(config.get('retryNonIdempotent'))
+        self.rate_limiter = HostRateLimiter(config.get('rateLimit') or 0)
+        self.cache = response_cache if config.get('cache') else None
+        self.cache_ttl = int(config['cacheTtl']) if config.get('cacheTtl') not in (None, '') else app_config.REST_CACHE_TTL
+        self.stats = {'requests': 0, 'retries': 0, 'cacheHits': 0, 'cacheRevalidated': 0, 'cacheMisses': 0}
+        self._stats_lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request, or answer it from the response cache when caching is enabled.
+
+        Only GET and HEAD requests without a body are cached. A fresh entry is returned
+        without contacting the server; a stale one with an ETag / Last-Modified is
+        revalidated with a conditional request and reused on 304 Not Modified.
+        """
+        if self.cache is None or method.upper() not in CACHEABLE_METHODS or kwargs.get('json') is not None or kwargs.get('data'):
+            return self._send(method, url, **kwargs)
+        return self._cached_request(method, url, **kwargs)
+
+    def _cached_request(self, method, url, headers=None, params=None, **kwargs):
+        final_url = requests.Request(method, url, params=params).prepare().url
+        key = self.cache.make_key(method, final_url, headers)
+
+        with self.cache.key_lock(key):
+            entry = self.cache.get(key)
+            if entry and entry['expiresAt'] > time.time():
+                self._count('cacheHits')
+                return to_response(entry)
+
+            request_headers = dict(headers or {})
+            if entry:
+                stored = CaseInsensitiveDict(entry['headers'])
+                if stored.get('ETag'):
+                    request_headers['If-None-Match'] = stored['ETag']
+                if stored.get('Last-Modified'):
+                    request_headers['If-Modified-Since'] = stored['Last-Modified']
+
+            response = self._send(method, final_url, headers=request_headers, **kwargs)
+            if entry and response.status_code == 304:
+                self._count('cacheRevalidated')
+                return to_response(self.cache.refresh(key, entry, response, self.cache_ttl))
+
+            self._count('cacheMisses')
+            self.cache.store(key, response, self.cache_ttl)
+            return response
+
+    def cache_summary(self):
+        """One-line cache hit rate for logs, or None if caching is off"""
+        if self.cache is None:
+            return None
+        hits, revalidated, misses = self.stats['cacheHits'], self.stats['cacheRevalidated'], self.stats['cacheMisses']
+        lookups = hits + revalidated + misses
+        rate = round(100 * hits / lookups, 1) if lookups else 0.0
+        return f"Cache: {hits} hits, {revalidated} revalidated, {misses} misses ({rate}% hit rate)"
+
+    def _send(self, method, url, **kwargs):
+        """
+        Send a request, retrying retryable failures with exponential backoff.
+
+        A Retry-After header on 429/503 responses overrides the computed backoff. Requests
+        with non-idempotent methods are only retried when the server cannot have processed
+        them (failed connects and 429), unless retryNonIdempotent is set.
+
+        Returns:
+            requests.Response (any status that is not retryable, or the last retryable one
+            is raised as HttpRequestError)
+        """
+        idempotent = method.upper() in IDEMPOTENT_METHODS or self.retry_non_idempotent
+        attempt = 0
+        while True:
+            attempt += 1
+            self.rate_limiter.acquire(url)
+            self._count('requests')
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt > self.max_retries or not (idempotent or _is_connect_error(e)):
+                    raise HttpRequestError(f"{type(e).__name__}: {e}", attempts=attempt)
+                self._wait(attempt, None)
+                continue
+
+            if response.status_code not in RETRYABLE_STATUS:
+                return response
+            if not idempotent and response.status_code != 429:
+                raise HttpRequestError(
+                    f"HTTP {response.status_code} (not retried for {method.upper()}): {response.text[:200]}",
+                    status_code=response.status_code, attempts=attempt
+                )
+            if attempt > self.max_retries:
+                raise HttpRequestError(
+                    f"HTTP {response.status_code} after {attempt} attempts: {response.text[:200]}",
+                    status_code=response.status_code, attempts=attempt
+                )
+            self._wait(attempt, response.headers.get('Retry-After'))
+
+    def _wait(self, attempt, retry_after):
+        self._count('retries')
+        delay = None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                delay = None # HTTP-date form is not parsed
+        if delay is None:
+            delay = self.backoff * (2 ** (attempt - 1))
+            delay += random.uniform(0, delay / 2)
+        time.sleep(delay)
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+def extract_path(data, path):
+    """
+    Value at a dotted JSON path such as 'data.items' or 'results.0.rows'.
+
+    An empty path (or '$') is the document itself; missing keys give None.
+    """
+    if not path or path == '$':
+        return data
+    for part in path.lstrip('$.').split('.'):
+        if isinstance(data, list) and part.lstrip('-').isdigit():
+            index = int(part)
+            data = data[index] if -len(data) <= index < len(data) else None
+        elif isinstance(data, dict):
+            data = data.get(part)
+        else:
+            return None
+        if data is None:
+            return None
+    return data
+
+def extract_records(body, path):
+    """Records at path in a JSON response: a list as is, a single object as one record."""
+    value = extract_path(body, path)
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        value = [value]
+    return [item if isinstance(item, dict) else {'value': item} for item in value]
+
+class Paginator:
+    """
+    Reads a paginated API as a sequence of record pages.
+
+    Strategies (paginationType):
+        page: pageParam (default 'page') from startPage (default 1), with pageSizeParam/pageSize
+        offset: offsetParam (default 'offset') advanced by the records received, limitParam/pageSize
+        cursor: next cursor from the body (cursorPath) or a response header (cursorHeader),
+                sent as the cursorParam query parameter (default 'cursor')
+        link: follows the rel="next" URL of the Link header
+
+    Reading stops at an empty page, a page shorter than pageSize (page/offset), a missing
+    next cursor or link, hasMorePath being false, totalPath records reached, or maxPages.
+    The next page is requested in the background while the current one is processed.
+    """
+
+    def __init__(self, connector, config):
+        self.connector = connector
+        self.type = (config.get('paginationType') or 'none').lower()
+        self.records_path = config.get('recordsPath') or ''
+        self.page_size = int(config['pageSize']) if config.get('pageSize') else None
+        self.max_pages = int(config.get('maxPages') or 1000)
+        self.total_path = config.get('totalPath')
+        self.has_more_path = config.get('hasMorePath')
+        self.config = config
+        self.pages = 0
+        self.records = 0
+        self.truncated = False
+
+    def _first_params(self):
+        config = self.config
+        params = {}
+        if self.type == 'page':
+            params[config.get('pageParam') or 'page'] = int(config.get('startPage') or 1)
+            if self.page_size and config.get('pageSizeParam'):
+                params[config['pageSizeParam']] = self.page_size
+        elif self.type == 'offset':
+            params[config.get('offsetParam') or 'offset'] = 0
+            if self.page_size:
+                params[config.get('limitParam') or 'limit'] = self.page_size
+        return params
+
+    def _next_request(self, url, params, response, body, records):
+        """(url, params) of the following page, or None when the last page was reached."""
+        config = self.config
+        if not records and config.get('stopOnEmptyPage', True):
+            return None
+        if self.has_more_path and not extract_path(body, self.has_more_path):
+            return None
+        if self.total_path:
+            total = extract_path(body, self.total_path)
+            if total is not None and self.records >= int(total):
+                return None
+
+        if self.type in ('page', 'offset'):
+            if self.page_size and len(records) < self.page_size:
+                return None
+            params = dict(params)
+            if self.type == 'page':
+                params[config.get('pageParam') or 'page'] += 1
+            else:
+                params[config.get('offsetParam') or 'offset'] += len(records)
+            return url, params
+        if self.type == 'cursor':
+            if config.get('cursorHeader'):
+                cursor = response.headers.get(config['cursorHeader'])
+            else:
+                cursor = extract_path(body, config.get('cursorPath') or 'next_cursor')
+            if not cursor:
+                return None
+            return url, {**params, (config.get('cursorParam') or 'cursor'): cursor}
+        if self.type == 'link':
+            next_link = response.links.get('next', {}).get('url')
+            # The next URL carries its own query string
+            return (next_link, {}) if next_link else None
+        return None
+
+    def iter_pages(self, method, url, headers=None):
+        """Yield the records of each page, fetching the next page while the caller works."""
+        def fetch(request):
+            page_url, params = request
+            response = self.connector.request(method, page_url, headers=headers, params=params or None)
+            if response.status_code >= 400:
+                raise Exception(f"HTTP {response.status_code} from {response.url}: {response.text[:200]}")
+            return response, page_url, params
+
+        pool = ThreadPoolExecutor(max_workers=1)
+        future = pool.submit(fetch, (url, self._first_params()))
+        try:
+            while future is not None:
+                response, page_url, params = future.result()
+                body = response.json() if response.content else None
+                records = extract_records(body, self.records_path)
+                self.pages += 1
+                self.records += len(records)
+
+                future = None
+                next_request = self._next_request(page_url, params, response, body, records)
+                if next_request:
+                    if self.pages >= self.max_pages:
+                        self.truncated = True
+                    else:
+                        future = pool.submit(fetch, next_request)
+                if records:
+                    yield records
+        finally:
+            if future is not None:
+                future.cancel()
+            pool.shutdown(wait=False)
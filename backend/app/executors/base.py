@@ -1,7 +1,96 @@
 from abc import ABC, abstractmethod
 
+class BatchStream:
+    """
+    Lazily evaluated sequence of record batches passed between components.
+
+    Source executors return a BatchStream instead of a list so large inputs are never fully
+    materialised. ExecutionService pipes the stream through executors marked `streaming`,
+    hands it to executors marked `accepts_stream`, and calls to_list() for everything else.
+    A stream can only be iterated once.
+    """
+
+    def __init__(self, batches):
+        self._batches = iter(batches)
+        self._consumed = False
+        self.row_count = 0
+        self.batch_count = 0
+
+    def __iter__(self):
+        if self._consumed:
+            raise RuntimeError('Batch stream has already been consumed')
+        self._consumed = True
+        try:
+            for batch in self._batches:
+                if not batch:
+                    continue
+                self.row_count += len(batch)
+                self.batch_count += 1
+                yield batch
+        finally:
+            # Release the source (cursor, file, worker threads) even if iteration stops early
+            close = getattr(self._batches, 'close', None)
+            if close:
+                close()
+
+    def map(self, func):
+        """Return a new stream applying func to each batch."""
+        return BatchStream(func(batch) for batch in self)
+
+    def close(self):
+        """Release the underlying source without consuming it."""
+        self._consumed = True
+        close = getattr(self._batches, 'close', None)
+        if close:
+            close()
+
+    def to_list(self):
+        """Materialise the stream into a single list of records."""
+        rows = []
+        for batch in self:
+            rows.extend(batch)
+        return rows
+
+    def drain(self):
+        """Consume the stream without keeping records, returning the row count."""
+        for _ in self:
+            pass
+        return self.row_count
+
+
+def stream_batches(batches):
+    """
+    Wrap a batch generator in a BatchStream.
+
+    The first batch is pulled eagerly so errors opening the source (missing file,
+    bad credentials) are raised by the source component rather than downstream.
+    """
+    batches = iter(batches)
+    first = next(batches, None)
+    if first is None:
+        return BatchStream([])
+
+    def chained():
+        yield first
+        # yield from forwards close() to the source generator
+        yield from batches
+    return BatchStream(chained())
+
+
+def materialize(data):
+    """Return data as a plain list of records, consuming it if it is a BatchStream."""
+    if isinstance(data, BatchStream):
+        return data.to_list()
+    return data
+
+
 class BaseExecutor(ABC):
     """Abstract base class for all component executors."""
+
+    # Row-wise executors can be applied to each batch of a BatchStream independently
+    streaming = False
+    # Executors whose execute() can consume a BatchStream directly (e.g. writers)
+    accepts_stream = False
     
     @abstractmethod
     def execute(self, config, input_data=None, context=None):
@@ -11,9 +100,10 @@ class BaseExecutor(ABC):
         Args:
             config (dict): The configuration for the component.
             input_data (list, optional): The input data from upstream (list of dicts).
+                A BatchStream is passed instead when the executor sets `accepts_stream`.
             context (object, optional): The execution context (e.g. ExecutionService instance) providing access to services.
             
         Returns:
-            list: The output data (list of dicts).
+            list: The output data (list of dicts), or a BatchStream for source components.
         """
         pass
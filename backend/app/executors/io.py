@@ -1,8 +1,10 @@
-from .base import BaseExecutor
+import functools
+from .base import BaseExecutor, BatchStream, stream_batches, materialize
 from app.connectors.files.csv_connector import CSVConnector
 from app.connectors.files.json_connector import JSONConnector
 from app.connectors.files.excel_connector import ExcelConnector
 from app.connectors.files.parquet_connector import ParquetConnector
+from app.connectors.files.arrow_connector import ArrowConnector
 
 # Determine connector based on config
 def get_file_connector(file_type):
@@ -14,114 +16,487 @@ def get_file_connector(file_type):
         return ExcelConnector()
     elif file_type == 'parquet':
         return ParquetConnector()
+    elif file_type == 'arrow' or file_type == 'feather':
+        return ArrowConnector()
     return CSVConnector() # Default
 
+def resolve_filesystem(config, context):
+    """Return the pooled filesystem for the node's saved connection, or None for local files."""
+    connection_id = config.get('connectionId')
+    if not context or not connection_id or connection_id == 'local':
+        return None
+    fs, conn_config = context.file_system_service.get_connection_filesystem(context.current_workspace_id, connection_id)
+    print(f"Using remote connection: {conn_config.get('name')}")
+    return fs
+
 class FileReaderExecutor(BaseExecutor):
     def execute(self, config, input_data=None, context=None):
         file_type = config.get('fileType', 'csv')
         connector = get_file_connector(file_type)
         
-        fs = None
-        # Use context to resolve connection if available
-        if context:
-             connection_id = config.get('connectionId')
-             if connection_id and connection_id != 'local':
-                 try:
-                     conn_service = context.connection_service
-                     fs_service = context.file_system_service
-                     
-                     conn_config = conn_service.get_connection(connection_id)
-                     if conn_config:
-                         from app.utils.password_resolver import PasswordResolver
-                         resolver = PasswordResolver(context.db_path)
-                         conn_config = resolver.resolve_connection_config(conn_config, context.current_workspace_id)
-                         fs = fs_service.get_filesystem(conn_config)
-                         print(f"Using remote connection: {conn_config.get('name')}")
-                 except Exception as e:
-                     print(f"Failed to resolve remote connection: {e}")
+        fs = resolve_filesystem(config, context)
+
+        if context and config.get('filePath'):
+            files = context.file_system_service.list_files(config['filePath'], fs, config.get('filePattern') or '*')
+            if files is not None:
+                return self._read_directory(connector, files, config, fs, context)
 
+        if file_type == 'excel':
+            # Multiple sheets are read concurrently into separate outputs, one per sheet
+            # (routed by the edge's sourceHandle, which is the sheet name)
+            sheet_names = [name.strip() for name in config.get('sheetNames') or [] if name and name.strip()]
+            if config.get('sheetName') == '*':
+                sheet_names = connector.list_sheets(config, fs=fs)
+                if len(sheet_names) > 1:
+                    raise Exception(
+                        f"Sheet Name '*' matches {len(sheet_names)} sheets ({', '.join(sheet_names)}); "
+                        f"list them in Sheet Names to get one output per sheet"
+                    )
+            if len(sheet_names) > 1:
+                return connector.read_sheets(config, sheet_names, fs=fs)
+            if sheet_names:
+                config = {**config, 'sheetName': sheet_names[0]}
+
+        if hasattr(connector, 'iter_batches'):
+            return stream_batches(connector.iter_batches(config, fs=fs))
         return connector.read(config, fs=fs)
 
+    def _read_directory(self, connector, files, config, fs, context):
+        """
+        Read every file matched by a directory or glob source as one stream.
+
+        With skipProcessedFiles, files whose fingerprint is already in the job's ledger are
+        skipped, and the files read are added to the ledger once the job succeeds.
+        """
+        fingerprints = {path: ':'.join(str(v) for v in context.file_system_service.fingerprint(path, fs)) for path in files}
+        incremental = config.get('skipProcessedFiles') and getattr(context, 'job_id', None)
+        if incremental:
+            ledger = context.watermark_service.get_processed_files(context.job_id, context.component_id)
+            files = [path for path in files if ledger.get(path) != fingerprints[path]]
+            skipped = len(fingerprints) - len(files)
+            if skipped:
+                context.log_message(f"Skipping {skipped} already processed files")
+        context.log_message(f"Reading {len(files)} files")
+        
+        state = {'complete': False}
+        
+        def read_files():
+            for path in files:
+                file_config = {**config, 'filePath': path}
+                if hasattr(connector, 'iter_batches'):
+                    yield from connector.iter_batches(file_config, fs=fs)
+                else:
+                    yield connector.read(file_config, fs=fs)
+            state['complete'] = True
+        
+        def save_ledger():
+            if state['complete'] and files:
+                context.watermark_service.mark_files_processed(
+                    context.job_id, context.component_id, {path: fingerprints[path] for path in files}
+                )
+                context.log_message(f"Recorded {len(files)} processed files")
+        
+        if incremental:
+            context.on_success(save_ledger)
+        return stream_batches(read_files())
+
 class FileWriterExecutor(BaseExecutor):
+    accepts_stream = True
+
     def execute(self, config, input_data=None, context=None):
         if not input_data:
             return []
         file_type = config.get('fileType', 'csv')
         connector = get_file_connector(file_type)
         
-        fs = None
-        if context:
-             connection_id = config.get('connectionId')
-             if connection_id and connection_id != 'local':
-                 try:
-                     conn_service = context.connection_service
-                     fs_service = context.file_system_service
-                     
-                     conn_config = conn_service.get_connection(connection_id)
-                     if conn_config:
-                         from app.utils.password_resolver import PasswordResolver
-                         resolver = PasswordResolver(context.db_path)
-                         conn_config = resolver.resolve_connection_config(conn_config, context.current_workspace_id)
-                         fs = fs_service.get_filesystem(conn_config)
-                 except Exception as e:
-                     print(f"Failed to resolve remote connection: {e}")
+        fs = resolve_filesystem(config, context)
+
+        if isinstance(input_data, BatchStream):
+            if hasattr(connector, 'write_batches'):
+                connector.write_batches(input_data, config, fs=fs)
+                if context and hasattr(context, 'log_message'):
+                    context.log_message(f"Wrote {input_data.row_count} rows in {input_data.batch_count} batches")
+                return []
+            input_data = input_data.to_list()
 
         connector.write(input_data, config, fs=fs)
         return input_data
 
+DEFAULT_FETCH_SIZE = 10000
+
+def resolve_database_url(config, context=None):
+    """Resolve the node's connection settings (dbType, secrets) into a SQLAlchemy URL."""
+    from app.services.db_connection_service import db_connection_service
+    workspace_id = context.current_workspace_id if context else None
+    return db_connection_service.resolve_connection_url(config, workspace_id)
+
+def iter_query_batches(engine, query, fetch_size, params=None):
+    """
+    Run a query on a server-side cursor, yielding lists of records of up to fetch_size rows.
+
+    Only one fetch is buffered client-side at a time, and records are built by zipping the
+    column names with each row tuple rather than going through Row._mapping.
+    """
+    from sqlalchemy import text
+    
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=fetch_size).execute(text(query), params or {})
+        columns = list(result.keys())
+        for rows in result.partitions(fetch_size):
+            yield [dict(zip(columns, row)) for row in rows]
+
+def _wrap_query(query, db_type, alias='osmosis_src'):
+    """Wrap a user query as a derived table so predicates can be applied to its columns."""
+    query = query.strip().rstrip(';')
+    # Oracle does not accept AS before a table alias
+    return f"({query}) {alias}" if db_type == 'oracle' else f"({query}) AS {alias}"
+
+def partition_predicates(engine, db_type, query, config, params=None):
+    """
+    Build one WHERE predicate (and bound parameters) per partition.
+
+    Range partitioning splits [lowerBound, upperBound) into equal strides, with values below/above
+    the bounds and NULLs going to the first/last partition. Bounds default to MIN/MAX of the column.
+    Modulo partitioning assigns rows by ABS(column % numPartitions).
+    """
+    from sqlalchemy import text
+    
+    column = engine.dialect.identifier_preparer.quote(config.get('partitionColumn'))
+    num_partitions = max(int(config.get('numPartitions') or 4), 1)
+    strategy = config.get('partitionStrategy', 'range')
+    
+    if strategy == 'modulo':
+        mod = f"MOD({column}, {num_partitions})" if db_type == 'oracle' else f"{column} % {num_partitions}"
+        predicates = []
+        for i in range(num_partitions):
+            predicate = f"ABS({mod}) = {i}"
+            if i == 0:
+                predicate = f"({predicate} OR {column} IS NULL)"
+            predicates.append((predicate, {}))
+        return predicates
+    
+    lower = config.get('lowerBound')
+    upper = config.get('upperBound')
+    if lower in (None, '') or upper in (None, ''):
+        with engine.connect() as conn:
+            row = conn.execute(
+                text(f"SELECT MIN({column}), MAX({column}) FROM {_wrap_query(query, db_type)}"), params or {}
+            ).fetchone()
+        lower = row[0] if lower in (None, '') else lower
+        upper = row[1] if upper in (None, '') else upper
+    if lower is None or upper is None:
+        # Empty source, a single partition reads whatever is there
+        return [("1=1", {})]
+    try:
+        lower, upper = float(lower), float(upper)
+    except (TypeError, ValueError):
+        raise Exception("Range partitioning needs a numeric column or bounds; use partitionStrategy 'modulo' otherwise")
+    
+    stride = (upper - lower) / num_partitions
+    if stride <= 0:
+        return [("1=1", {})]
+    bounds = [lower + stride * i for i in range(1, num_partitions)]
+    predicates = []
+    for i in range(num_partitions):
+        clauses = []
+        bound_params = {}
+        if i > 0:
+            clauses.append(f"{column} >= :osmosis_lo")
+            bound_params['osmosis_lo'] = bounds[i - 1]
+        if i < num_partitions - 1:
+            clauses.append(f"{column} < :osmosis_hi")
+            bound_params['osmosis_hi'] = bounds[i]
+        predicate = ' AND '.join(clauses) or '1=1'
+        if i == 0:
+            predicate = f"({predicate} OR {column} IS NULL)"
+        predicates.append((predicate, bound_params))
+    return predicates
+
+def iter_partitioned_batches(engine, db_type, query, config, fetch_size, params=None, log=None):
+    """
+    Run the query once per partition concurrently, merging batches into one stream as they arrive.
+
+    Each partition uses its own pooled connection and server-side cursor. A bounded queue
+    applies backpressure so fast partitions can't outrun the consumer.
+    """
+    import queue
+    import threading
+    import time
+    
+    predicates = partition_predicates(engine, db_type, query, config, params)
+    max_workers = min(int(config.get('maxWorkers') or len(predicates)), len(predicates))
+    output = queue.Queue(maxsize=max_workers * 2)
+    pending = queue.Queue()
+    stop = threading.Event()
+    done = object()
+    for index, (predicate, bound_params) in enumerate(predicates):
+        pending.put((index, predicate, bound_params))
+    
+    def put(item):
+        while not stop.is_set():
+            try:
+                output.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def run_partition(index, predicate, bound_params):
+        start = time.perf_counter()
+        rows = 0
+        try:
+            partition_query = f"SELECT * FROM {_wrap_query(query, db_type)} WHERE {predicate}"
+            for batch in iter_query_batches(engine, partition_query, fetch_size, {**(params or {}), **bound_params}):
+                rows += len(batch)
+                if not put(batch):
+                    return
+            if log:
+                log(f"Partition {index + 1}/{len(predicates)} read {rows} rows in {time.perf_counter() - start:.2f}s")
+        except Exception as e:
+            put(e)
+        finally:
+            put(done)
+    
+    def worker():
+        while not stop.is_set():
+            try:
+                task = pending.get_nowait()
+            except queue.Empty:
+                return
+            run_partition(*task)
+    
+    # Daemon threads, so an abandoned stream can never block interpreter shutdown
+    for _ in range(max_workers):
+        threading.Thread(target=worker, daemon=True).start()
+    
+    try:
+        remaining = len(predicates)
+        while remaining:
+            item = output.get()
+            if item is done:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        # Runs on completion, error, or when the consumer abandons the stream
+        stop.set()
+
+def _parse_initial_watermark(value):
+    """Bind numeric initial watermarks entered as text as numbers."""
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                return value
+    return value
+
+def track_watermark(batches, column, state):
+    """
+    Pass batches through, recording the maximum non-null value of column in state['value'].
+
+    state['complete'] is only set once the source is exhausted, so a partially read stream
+    never advances the watermark.
+    """
+    try:
+        for batch in batches:
+            if batch and column not in batch[0]:
+                raise Exception(f"Incremental column '{column}' not found in query results")
+            values = [row[column] for row in batch if row.get(column) is not None]
+            if values:
+                batch_max = max(values)
+                if state['value'] is None or batch_max > state['value']:
+                    state['value'] = batch_max
+            yield batch
+        state['complete'] = True
+    finally:
+        close = getattr(batches, 'close', None)
+        if close:
+            close()
+
+class JDBCReaderExecutor(BaseExecutor):
+    """Reads a query over a pooled JayDeBeApi connection, fetchSize rows per batch."""
+    
+    def execute(self, config, input_data=None, context=None):
+        from app.services.db_connection_service import db_connection_service
+        from app.services.jdbc_manager import jdbc_manager
+        
+        query = config.get('query')
+        
+        if not query:
+             raise Exception("Resulting query is empty")
+        
+        workspace_id = context.current_workspace_id if context else None
+        resolved_config = db_connection_service.resolve_config(config, workspace_id)
+        fetch_size = int(config.get('fetchSize') or DEFAULT_FETCH_SIZE)
+        
+        return stream_batches(jdbc_manager.iter_query_batches(resolved_config, query, fetch_size))
+
+def _mongo_collection(config):
+    """Collection name, falling back to the query field used as 'Collection Name' in the UI."""
+    collection = config.get('collection') or (config.get('query') or '').strip()
+    if not collection:
+        raise Exception("MongoDB collection is required")
+    return collection
+
+class MongoDBReaderExecutor(BaseExecutor):
+    """Streams a MongoDB find() or aggregate() cursor, batchSize documents per batch."""
+    
+    def execute(self, config, input_data=None, context=None):
+        from app.services.db_connection_service import db_connection_service
+        from app.connectors.database.mongo_connector import MongoConnector
+        
+        workspace_id = context.current_workspace_id if context else None
+        db = db_connection_service.get_mongo_database(config, workspace_id)
+        read_config = {**config, 'collection': _mongo_collection(config)}
+        
+        return stream_batches(MongoConnector(db).iter_batches(read_config))
+
+class MongoDBWriterExecutor(BaseExecutor):
+    accepts_stream = True
+    
+    def execute(self, config, input_data=None, context=None):
+        from app.services.db_connection_service import db_connection_service
+        from app.connectors.database.mongo_connector import MongoConnector
+        
+        if not input_data: return []
+        
+        collection = config.get('collection') or config.get('table')
+        if not collection:
+            raise Exception("MongoDB collection is required")
+        
+        workspace_id = context.current_workspace_id if context else None
+        db = db_connection_service.get_mongo_database(config, workspace_id)
+        
+        batches = input_data if isinstance(input_data, BatchStream) else [input_data]
+        stats = MongoConnector(db).write_batches(batches, {**config, 'collection': collection})
+        
+        if context and hasattr(context, 'log_message'):
+            context.log_message(
+                f"Wrote {stats['rows']} documents to {collection} in {stats['batches']} bulk writes ({stats['seconds']}s): "
+                f"{stats['inserted']} inserted, {stats['upserted']} upserted, {stats['modified']} modified"
+            )
+        
+        if isinstance(input_data, BatchStream):
+            return []
+        return input_data
+
 class DatabaseReaderExecutor(BaseExecutor):
     def execute(self, config, input_data=None, context=None):
-        from sqlalchemy import create_engine, text
-        
-        db_type = config.get('type', 'mysql')
-        host = config.get('host')
-        port = config.get('port')
-        username = config.get('username')
-        password = config.get('password')
-        database = config.get('database')
+        from app.services.engine_registry import engine_registry
+        from app.services.db_connection_service import db_connection_service
+        
+        connection_method = db_connection_service.detect_connection_method(config)
+        if connection_method == 'mongo':
+            return MongoDBReaderExecutor().execute(config, input_data, context)
+        
         query = config.get('query')
         
         if not query:
              raise Exception("Resulting query is empty")
 
-        url = ""
-        if db_type == 'mysql':
-             url = f"mysql+pymysql://{username}:{password}@{host}:{port}/{database}"
-        elif db_type == 'postgresql':
-             url = f"postgresql://{username}:{password}@{host}:{port}/{database}"
+        if connection_method == 'jdbc':
+            return JDBCReaderExecutor().execute(config, input_data, context)
+
+        db_type, url = resolve_database_url(config, context)
+        fetch_size = int(config.get('fetchSize') or DEFAULT_FETCH_SIZE)
+        
+        engine = engine_registry.get_engine(url, config)
         
-        if url:
-            engine = create_engine(url)
-            with engine.connect() as conn:
-                result = conn.execute(text(query))
-                return [dict(row._mapping) for row in result]
+        params = {}
+        incremental_column = config.get('incrementalColumn')
+        if incremental_column:
+            query, params = self._apply_watermark(engine, db_type, query, config, context)
         
-        return []
+        if config.get('partitionColumn'):
+            log = context.log_message if context and hasattr(context, 'log_message') else None
+            batches = iter_partitioned_batches(engine, db_type, query, config, fetch_size, params=params, log=log)
+        else:
+            batches = iter_query_batches(engine, query, fetch_size, params=params)
+        
+        if incremental_column and context and getattr(context, 'job_id', None):
+            state = {'value': None, 'complete': False}
+            batches = track_watermark(batches, incremental_column, state)
+            context.on_success(functools.partial(self._save_watermark, context, incremental_column, params.get('watermark'), state))
+        return stream_batches(batches)
+
+    def _apply_watermark(self, engine, db_type, query, config, context):
+        """
+        Restrict the query to rows beyond the stored high-watermark.
+
+        Queries may reference the watermark themselves as the bound parameter :watermark
+        (e.g. WHERE updated_at > :watermark); otherwise the query is wrapped with a
+        `> :watermark` predicate on the incremental column once a watermark exists.
+        """
+        column = config.get('incrementalColumn')
+        stored = None
+        if context and getattr(context, 'job_id', None):
+            stored = context.watermark_service.get_watermark(context.job_id, context.component_id)
+        
+        if stored is not None and stored['value'] is not None:
+            watermark = stored['value']
+            context.log_message(f"Reading rows with {column} > {watermark}")
+        elif config.get('initialWatermark') not in (None, ''):
+            watermark = _parse_initial_watermark(config.get('initialWatermark'))
+        else:
+            watermark = None
+        
+        if ':watermark' in query:
+            if watermark is None:
+                raise Exception("No watermark stored yet; set an initial watermark for the first run")
+            return query, {'watermark': watermark}
+        if watermark is None:
+            # First run, extract everything
+            return query, {}
+        quoted = engine.dialect.identifier_preparer.quote(column)
+        return f"SELECT * FROM {_wrap_query(query, db_type)} WHERE {quoted} > :watermark", {'watermark': watermark}
+
+    def _save_watermark(self, context, column, previous, state):
+        if not state['complete']:
+            context.log_message("Source was not fully read; watermark not advanced", level='warning')
+        elif state['value'] is None:
+            context.log_message(f"No new rows since watermark {previous}")
+        else:
+            context.watermark_service.set_watermark(context.job_id, context.component_id, column, state['value'])
+            context.log_message(f"Watermark for {column} advanced to {state['value']}")
 
 class DatabaseWriterExecutor(BaseExecutor):
+    accepts_stream = True
+
     def execute(self, config, input_data=None, context=None):
-        from sqlalchemy import create_engine
-        import pandas as pd
+        from app.services.engine_registry import engine_registry
+        from app.services.db_connection_service import db_connection_service
+        from app.connectors.database.sql_connector import SQLConnector
         
         if not input_data: return []
 
-        db_type = config.get('type', 'mysql')
-        host = config.get('host')
-        port = config.get('port')
-        username = config.get('username')
-        password = config.get('password')
-        database = config.get('database')
+        if db_connection_service.detect_connection_method(config) == 'mongo':
+            return MongoDBWriterExecutor().execute(config, input_data, context)
+
         table_name = config.get('table')
+        if not table_name:
+            return materialize(input_data)
         
-        url = ""
-        if db_type == 'mysql':
-             url = f"mysql+pymysql://{username}:{password}@{host}:{port}/{database}"
-        elif db_type == 'postgresql':
-             url = f"postgresql://{username}:{password}@{host}:{port}/{database}"
-             
-        if url and table_name:
-            engine = create_engine(url)
-            df = pd.DataFrame(input_data)
-            df.to_sql(table_name, engine, if_exists='append', index=False)
+        db_type, url = resolve_database_url(config, context)
+        engine = engine_registry.get_engine(url, config)
+        connector = SQLConnector(engine, db_type)
             
+        batches = input_data if isinstance(input_data, BatchStream) else [input_data]
+        stats = connector.write_batches(batches, config)
+        
+        if context and hasattr(context, 'log_message'):
+            message = (
+                f"Loaded {stats['rows']} rows into {table_name} in {stats['batches']} batches "
+                f"({stats['method']}, {stats['seconds']}s)"
+            )
+            if 'inserted' in stats:
+                message += f": {stats['inserted']} inserted, {stats['updated']} updated, {stats['unchanged']} unchanged"
+            context.log_message(message)
+        
+        if isinstance(input_data, BatchStream):
+            return []
         return input_data
@@ -1,15 +1,59 @@
-from .base import BaseExecutor
+import functools
+from .base import BaseExecutor, BatchStream
 from app.connectors.messaging.kafka_connector import KafkaConnector
 
 class KafkaInputExecutor(BaseExecutor):
     def execute(self, config, input_data=None, context=None):
         connector = KafkaConnector()
-        return connector.read(config)
+        offset_service = getattr(context, 'kafka_offset_service', None)
+        node_id = getattr(context, 'component_id', None)
+        
+        replay_of = getattr(context, 'replay_execution_id', None)
+        if replay_of and offset_service:
+            # Re-read exactly what the original execution consumed; the group is not touched
+            ranges = offset_service.get_ranges(replay_of, node_id)
+            if not ranges:
+                raise Exception(f"No consumed offsets recorded for this component in execution {replay_of}")
+            records, _ = connector.consume(config, ranges)
+            context.log_message(f"Replayed {len(records)} records from {self._describe(ranges)}")
+            return records
+        
+        records, ranges = connector.consume(config)
+        
+        if context and offset_service and getattr(context, 'execution_id', None):
+            offset_service.record_ranges(context.execution_id, context.job_id, node_id, ranges)
+            # Offsets move only once every downstream component has succeeded
+            context.on_success(functools.partial(self._commit, connector, config, ranges, context))
+            context.log_message(f"Consumed {len(records)} records from {self._describe(ranges)}")
+        else:
+            connector.commit_offsets(config, ranges)
+        return records
+    
+    def _commit(self, connector, config, ranges, context):
+        connector.commit_offsets(config, ranges)
+        context.kafka_offset_service.mark_committed(context.execution_id, context.component_id)
+    
+    def _describe(self, ranges):
+        if not ranges:
+            return 'no partitions'
+        return ', '.join(f"{r['topic']}[{r['partition']}] {r['startOffset']}-{r['endOffset']}" for r in ranges)
 
 class KafkaOutputExecutor(BaseExecutor):
+    accepts_stream = True
+
     def execute(self, config, input_data=None, context=None):
         if not input_data:
             return []
         connector = KafkaConnector()
-        connector.write(input_data, config)
+        batches = input_data if isinstance(input_data, BatchStream) else [input_data]
+        stats = connector.write(batches, config)
+        
+        if context and hasattr(context, 'log_message'):
+            context.log_message(
+                f"Produced {stats['messages']} messages to {config.get('topic')} in {stats['seconds']}s "
+                f"({stats['messagesPerSec']} msg/s, {stats['mbPerSec']} MB/s)"
+            )
+        
+        if isinstance(input_data, BatchStream):
+            return []
         return input_data # Pass through
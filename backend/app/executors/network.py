@@ -1,8 +1,24 @@
-from .base import BaseExecutor
-import requests
+from .base import BaseExecutor, stream_batches
+from app.connectors.network.http_connector import HttpConnector, Paginator
+from concurrent.futures import ThreadPoolExecutor
+import time
 import json
 
 class RestClientExecutor(BaseExecutor):
+    """
+    Calls an HTTP API once per input row (or once without input).
+
+    Without input and with a paginationType, the component is a source: every page is
+    requested in turn and its records (at recordsPath) are streamed downstream.
+
+    Rows are sent concurrently on `concurrency` threads and the output keeps the input
+    order. Rows whose request failed after all retries go to the 'reject' output with the
+    error, the main output ('out1') holds the responses.
+
+    With `cache` enabled, GET responses are served from the shared response cache
+    (honouring Cache-Control / ETag) and the node's hit rate is logged.
+    """
+
     def execute(self, config, input_data=None, context=None):
         url = config.get('url')
         method = config.get('method', 'GET')
@@ -21,7 +37,13 @@ class RestClientExecutor(BaseExecutor):
             for h in headers_config:
                 headers[h.get('key')] = h.get('value')
             
-        output_data = []
+        connector = HttpConnector(config)
+        
+        if not input_data and (config.get('paginationType') or 'none') != 'none':
+            return self._read_pages(connector, config, url, method, headers, context)
+        
+        concurrency = max(int(config.get('concurrency') or 1), 1)
+        rejects = []
         
         def make_request(row=None):
             final_url = url
@@ -35,34 +57,77 @@ class RestClientExecutor(BaseExecutor):
                      json_body = row
             
             try:
-                response = requests.request(method, final_url, headers=headers, json=json_body)
+                response = connector.request(method, final_url, headers=headers, json=json_body)
+            except Exception as e:
+                reject = dict(row) if row else {}
+                reject.update({
+                    'url': final_url,
+                    'status_code': getattr(e, 'status_code', None),
+                    'attempts': getattr(e, 'attempts', 1),
+                    'error': str(e)
+                })
+                return None, reject
                 
-                result = {
-                    'status_code': response.status_code,
-                    'response_body': response.text
-                }
+            result = {
+                'status_code': response.status_code,
+                'response_body': response.text
+            }
                 
-                if row:
-                    result.update(row)
+            if row:
+                result.update(row)
                 
-                try:
-                    json_resp = response.json()
-                    if isinstance(json_resp, dict):
-                        result.update(json_resp)
-                except:
-                    pass
+            try:
+                json_resp = response.json()
+                if isinstance(json_resp, dict):
+                    result.update(json_resp)
+            except:
+                pass
                     
-                return result
-            except Exception as e:
-                print(f"REST request failed: {e}")
-                return None
+            return result, None
 
-        if input_data:
-            for row in input_data:
-                res = make_request(row)
-                if res: output_data.append(res)
+        start = time.perf_counter()
+        rows = input_data if input_data else [None]
+        if concurrency > 1 and len(rows) > 1:
+            # map() yields results in input order however requests complete
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                results = list(pool.map(make_request, rows))
         else:
-            res = make_request()
-            if res: output_data.append(res)
+            results = [make_request(row) for row in rows]
+            
+        output_data = []
+        for result, reject in results:
+            if result is not None:
+                output_data.append(result)
+            else:
+                rejects.append(reject)
+        
+        if context and hasattr(context, 'log_message'):
+            context.log_message(
+                f"{len(rows)} rows: {connector.stats['requests']} requests, {connector.stats['retries']} retries, "
+                f"{len(rejects)} rejected in {round(time.perf_counter() - start, 2)}s"
+            )
+            if connector.cache_summary():
+                context.log_message(connector.cache_summary())
+            if rejects:
+                context.log_message(f"First rejected request: {rejects[0]['error']}", level='warning')
             
-        return output_data
+        return {'out1': output_data, 'reject': rejects}
+
+    def _read_pages(self, connector, config, url, method, headers, context):
+        paginator = Paginator(connector, config)
+        
+        def pages():
+            try:
+                yield from paginator.iter_pages(method, url, headers)
+            finally:
+                if context and hasattr(context, 'log_message'):
+                    context.log_message(
+                        f"Fetched {paginator.pages} pages ({paginator.records} records, "
+                        f"{connector.stats['retries']} retries)"
+                    )
+                    if connector.cache_summary():
+                        context.log_message(connector.cache_summary())
+                    if paginator.truncated:
+                        context.log_message(f"Stopped at maxPages ({paginator.max_pages}); more pages are available", level='warning')
+        
+        return stream_batches(pages())
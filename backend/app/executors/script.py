@@ -3,6 +3,8 @@ import requests
 
 class JavaRowExecutor(BaseExecutor):
     """Executes Python script per row (misnamed as JavaRow in Talend tradition)."""
+    streaming = True
+
     def execute(self, config, input_data=None, context=None):
         code = config.get('code')
         if not code: return input_data or []
@@ -27,7 +29,13 @@ class JavaRowExecutor(BaseExecutor):
         return output_data
 
 class RunJobExecutor(BaseExecutor):
-    """Triggers another job."""
+    """
+    Triggers another job.
+
+    By default waits for the sub-job and fails if it fails, so downstream components only
+    run after it succeeded. With waitForCompletion off the sub-job is only started.
+    Recursive calls (a job running itself through its sub-jobs) are refused.
+    """
     def execute(self, config, input_data=None, context=None):
         job_id = config.get('jobId') or config.get('jobPath')
         if not job_id: return input_data
@@ -36,10 +44,14 @@ class RunJobExecutor(BaseExecutor):
         
         # Use context to execute job recursively if provided
         if context and hasattr(context, 'execute_job'):
-             try:
-                 # CAUTION: Infinite recursion protection needed?
-                 context.execute_job(job_id, trigger_type='SUBJOB')
-             except Exception as e:
-                 print(f"Sub-job execution failed: {e}")
+             if config.get('waitForCompletion') is False:
+                 context.start_job(job_id, trigger_type='SUBJOB')
+                 context.log_message(f"Started sub-job {job_id}")
+                 return input_data
+             
+             result = context.execute_job(job_id, trigger_type='SUBJOB')
+             if result.get('status') != 'success':
+                 raise Exception(f"Sub-job {job_id} failed: {result.get('message')}")
+             context.log_message(f"Sub-job {job_id} completed (execution {result.get('id')})")
         
         return input_data # Pass through trigger data
@@ -206,6 +206,8 @@ class DenormalizeExecutor(BaseExecutor):
         return pivoted.to_dict('records')
 
 class SplitRowExecutor(BaseExecutor):
+    streaming = True
+
     def execute(self, config, input_data=None, context=None):
         if not input_data: return []
         df = pd.DataFrame(input_data)
@@ -221,6 +223,8 @@ class SplitRowExecutor(BaseExecutor):
         return df.to_dict('records')
 
 class ConvertTypeExecutor(BaseExecutor):
+    streaming = True
+
     def execute(self, config, input_data=None, context=None):
         if not input_data: return []
         df = pd.DataFrame(input_data)
@@ -274,6 +278,8 @@ class RowGeneratorExecutor(BaseExecutor):
         return data
 
 class FilterRowExecutor(BaseExecutor):
+    streaming = True
+
     def execute(self, config, input_data=None, context=None):
         """Filter rows based on conditions."""
         if not input_data: return []
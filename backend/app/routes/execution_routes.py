@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from app.services.execution_service import ExecutionService
+from app.services.streaming_service import streaming_service
 import os
 
 execution_bp = Blueprint('execution', __name__)
@@ -8,10 +9,51 @@ execution_service = ExecutionService(config.DATABASE_PATH)
 
 @execution_bp.route('/jobs/<job_id>/execute', methods=['POST'])
 def execute_job(job_id):
-    """Execute a job pipeline."""
+    """Execute a job pipeline (or queue it for a worker with EXECUTION_MODE=queue)."""
     try:
         # Default to MANUAL for API triggers
-        result = execution_service.execute_job(job_id, trigger_type='MANUAL')
+        result = execution_service.submit_job(job_id, trigger_type='MANUAL')
+        return jsonify(result), 202 if result['status'] == 'queued' else 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@execution_bp.route('/jobs/<job_id>/execute-dag', methods=['POST'])
+def execute_job_dag(job_id):
+    """Execute a job after the jobs it depends on, running independent jobs in parallel."""
+    try:
+        data = request.get_json(silent=True) or {}
+        result = execution_service.submit_dag(job_id, max_parallel=data.get('maxParallel'))
+        return jsonify(result), 202 if result['status'] == 'queued' else 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@execution_bp.route('/jobs/<job_id>/stream/start', methods=['POST'])
+def start_stream(job_id):
+    """Start a long-running streaming execution (micro-batches from the job's streaming Kafka Input)."""
+    try:
+        result = streaming_service.start(execution_service, job_id)
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@execution_bp.route('/jobs/<job_id>/stream/stop', methods=['POST'])
+def stop_stream(job_id):
+    """Stop a job's streaming execution once its current batch has been committed."""
+    try:
+        result = streaming_service.stop(job_id)
+        if not result:
+            return jsonify({'error': 'Job is not streaming'}), 404
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@execution_bp.route('/jobs/<job_id>/stream', methods=['GET'])
+def get_stream(job_id):
+    """Streaming execution state with per-batch metrics (batches, records, latency, lag)."""
+    try:
+        result = streaming_service.get_status(job_id)
+        if not result:
+            return jsonify({'error': 'Job is not streaming'}), 404
         return jsonify(result), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -45,3 +87,43 @@ def get_execution(execution_id):
         return jsonify(execution), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+@execution_bp.route('/executions/<execution_id>/children', methods=['GET'])
+def get_execution_children(execution_id):
+    """Executions started by the execution (sub-jobs and the jobs of an orchestration run)."""
+    try:
+        return jsonify(execution_service.job_service.get_child_executions(execution_id)), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@execution_bp.route('/executions/<execution_id>/offsets', methods=['GET'])
+def get_execution_offsets(execution_id):
+    """Kafka partition/offset ranges consumed by the execution, per component."""
+    try:
+        return jsonify(execution_service.kafka_offset_service.get_ranges(execution_id)), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@execution_bp.route('/executions/<execution_id>/replay', methods=['POST'])
+def replay_execution(execution_id):
+    """Run the execution's job again over exactly the Kafka offset ranges it consumed."""
+    try:
+        execution = execution_service.get_by_id(execution_id)
+        if not execution:
+            return jsonify({'error': 'Execution not found'}), 404
+        result = execution_service.submit_job(execution['jobId'], trigger_type='REPLAY', replay_of=execution_id)
+        return jsonify(result), 202 if result['status'] == 'queued' else 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@execution_bp.route('/queue', methods=['GET'])
+def get_queue():
+    """Execution queue depth, active workers and pending entries."""
+    try:
+        queue = execution_service.execution_queue_service
+        stats = queue.stats()
+        stats['mode'] = config.EXECUTION_MODE
+        stats['pending'] = queue.get_pending(limit=request.args.get('limit', 100, type=int))
+        return jsonify(stats), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,4 +1,5 @@
 from flask import Blueprint, request, jsonify
+from app.utils.api_helpers import parse_bool
 from app.services.file_preview_service import FilePreviewService
 
 file_routes = Blueprint('file_routes', __name__)
@@ -17,7 +18,8 @@ def preview_file():
         if not file_path:
             return jsonify({'error': 'File path is required'}), 400
         
-        result = preview_service.preview_file(file_path, file_type, config)
+        refresh = parse_bool(data.get('refresh')) or parse_bool(request.args.get('refresh'))
+        result = preview_service.preview_file(file_path, file_type, config, refresh=refresh)
         
         return jsonify(result), 200
     
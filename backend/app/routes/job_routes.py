@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from app.services.job_service import JobService
+from app.services.watermark_service import WatermarkService
 from app.utils.api_helpers import api_response
 import os
 import json
@@ -7,6 +8,7 @@ import json
 job_bp = Blueprint('job', __name__)
 from config.settings import config
 job_service = JobService(config.DATABASE_PATH)
+watermark_service = WatermarkService(config.DATABASE_PATH)
 
 @job_bp.route('/jobs', methods=['GET'])
 @api_response
@@ -47,12 +49,12 @@ from app.services.execution_service import ExecutionService
 
 execution_service = ExecutionService(config.DATABASE_PATH)
 
-def execute_job_task(job_id):
+def execute_job_task(job_id, max_concurrent_runs=None):
     """Wrapper function for scheduled job execution."""
     print(f"Scheduled Execution triggering for Job {job_id}")
     with scheduler_service.app.app_context():
         try:
-             execution_service.execute_job(job_id, trigger_type='SCHEDULED')
+             execution_service.submit_job(job_id, trigger_type='SCHEDULED', max_concurrent_runs=max_concurrent_runs)
         except Exception as e:
             print(f"Failed to execute scheduled job {job_id}: {e}")
 
@@ -62,19 +64,21 @@ def update_job(job_id):
     """Update job."""
     data = request.get_json()
     
-    valid_keys = ['name', 'description', 'canvasState', 'schedule', 'dependencies']
+    valid_keys = ['name', 'description', 'canvasState', 'schedule', 'dependencies', 'maxConcurrentRuns']
     update_data = {k: v for k, v in data.items() if k in valid_keys}
     
     # Convert camelCase to snake_case for backend
     if 'canvasState' in update_data:
         update_data['canvas_state'] = update_data.pop('canvasState')
+    if 'maxConcurrentRuns' in update_data:
+        update_data['max_concurrent_runs'] = update_data.pop('maxConcurrentRuns')
     
     job = job_service.update(job_id, **update_data)
     
     if job:
         # Update Scheduler
-        if data.get('schedule'):
-             scheduler_service.add_job(job_id, data['schedule'], execute_job_task, args=[job_id])
+        if job.get('schedule'):
+             scheduler_service.add_job(job_id, job['schedule'], execute_job_task)
         elif 'schedule' in data and not data['schedule']:
              # If schedule key is present but empty/null, remove it
              scheduler_service.remove_job(job_id)
@@ -168,6 +172,20 @@ def bulk_delete_jobs():
     count = job_service.bulk_delete(job_ids)
     return {'message': f'Deleted {count} jobs', 'deletedCount': count}
 
+@job_bp.route('/jobs/<job_id>/watermarks', methods=['GET'])
+@api_response
+def get_watermarks(job_id):
+    """Get incremental extraction state (watermarks and processed file ledger) for a job."""
+    return watermark_service.get_summary(job_id)
+
+@job_bp.route('/jobs/<job_id>/watermarks', methods=['DELETE'])
+@api_response
+def reset_watermarks(job_id):
+    """Reset incremental extraction state for a job, or a single component with ?nodeId=."""
+    node_id = request.args.get('nodeId')
+    removed = watermark_service.reset(job_id, node_id)
+    return {'message': 'Incremental state reset', 'removed': removed}
+
 @job_bp.route('/schedule/preview', methods=['POST'])
 def preview_schedule():
     """Preview future run times for a cron expression."""
@@ -179,6 +197,12 @@ def preview_schedule():
     runs = scheduler_service.get_future_runs(cron)
     return jsonify(runs), 200
 
+@job_bp.route('/scheduler/status', methods=['GET'])
+@api_response
+def get_scheduler_status():
+    """Scheduler leader state and, on the leader, the scheduled jobs with their next run times."""
+    return scheduler_service.status()
+
 @job_bp.route('/workspaces/<workspace_id>/schedules/upcoming', methods=['GET'])
 def get_upcoming_schedules(workspace_id):
     """Get all upcoming job runs for a workspace in a given date range."""
@@ -2,15 +2,18 @@
 Database Connection Service
 Unified service for all database connections (JDBC, SQLAlchemy, PyMongo)
 """
+import threading
 from typing import Dict, Any, Optional
+from urllib.parse import quote_plus
 from app.services.query_dialect import QueryDialect
 from app.utils.password_resolver import PasswordResolver
 from app.utils.context_variables import load_context_variables
+from app.utils.cache import TTLCache, make_cache_key
+from config.settings import config as app_config
 
 # Try to import optional dependencies
 try:
-    from sqlalchemy import create_engine, text
-    from sqlalchemy.pool import QueuePool
+    from sqlalchemy import text
     HAS_SQLALCHEMY = True
 except ImportError:
     HAS_SQLALCHEMY = False
@@ -22,23 +25,66 @@ except ImportError:
     HAS_PYMONGO = False
 
 from app.services.jdbc_manager import jdbc_manager, HAS_JAYDEBEAPI
+from app.services.engine_registry import engine_registry
+
+class _RunningPreview:
+    """Handle for an in-flight preview, holding the function that cancels its statement"""
+    
+    def __init__(self):
+        self.cancelled = False
+        self._cancel = None
+        self._lock = threading.Lock()
+    
+    def set_cancel(self, cancel_fn):
+        """Register the driver-specific cancel function; called at once if already cancelled"""
+        with self._lock:
+            self._cancel = cancel_fn
+            cancelled = self.cancelled
+        if cancelled and cancel_fn:
+            self._call(cancel_fn)
+    
+    def cancel(self):
+        """Mark the preview cancelled and interrupt its running statement"""
+        with self._lock:
+            self.cancelled = True
+            cancel_fn = self._cancel
+        if cancel_fn:
+            self._call(cancel_fn)
+    
+    def _call(self, cancel_fn):
+        try:
+            cancel_fn()
+        except Exception as e:
+            print(f"Error cancelling preview: {e}")
 
 class DatabaseConnectionService:
     """Unified database connection service"""
     
     def __init__(self):
-        self.sql_pools = {}
+        # Pooled MongoClients (each holds its own connection pool), keyed by connection string
         self.mongo_clients = {}
+        self._mongo_lock = threading.Lock()
+        self.preview_cache = TTLCache(app_config.PREVIEW_CACHE_SIZE, app_config.PREVIEW_CACHE_TTL)
+        # In-flight previews by preview ID, for cancel_preview
+        self._previews = {}
     
-    def preview_database(self, config: Dict[str, Any], query: str, limit: int = 5, workspace_id: Optional[str] = None) -> Dict[str, Any]:
+    def preview_database(self, config: Dict[str, Any], query: str, limit: int = 5, workspace_id: Optional[str] = None,
+                         refresh: bool = False, preview_id: Optional[str] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Preview database query with auto-detection of connection method
         
+        The query runs in a worker thread with a hard timeout; on expiry (or cancel_preview)
+        the statement is cancelled on the server. Where supported, a server-side statement
+        timeout is set as well so the database stops the query on its own.
+        
         Args:
             config: Database configuration
             query: SQL query
             limit: Number of rows to preview
             workspace_id: Optional workspace ID for loading context variables
+            refresh: Bypass the preview cache and run the query again
+            preview_id: Optional client-chosen ID, used to cancel the preview while it runs
+            timeout: Seconds before the preview is cancelled (default PREVIEW_TIMEOUT)
             
         Returns:
             Dictionary with data, schema, and totalRows
@@ -46,25 +92,126 @@ class DatabaseConnectionService:
         # Resolve passwords using context variables, unix commands, and env vars
         resolved_config = self._resolve_config_passwords(config, workspace_id)
         
-        db_type = resolved_config.get('dbType', '').lower()
-        connection_method = resolved_config.get('connectionMethod', 'auto').lower()
+        # Keyed on the resolved config so a changed variable or password is a cache miss
+        cache_key = make_cache_key(resolved_config, query, limit)
+        if not refresh:
+            cached = self.preview_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        timeout = float(timeout or app_config.PREVIEW_TIMEOUT)
+        handle = _RunningPreview()
+        if preview_id:
+            self._previews[preview_id] = handle
+        
+        outcome = {}
+        done = threading.Event()
+        
+        def worker():
+            try:
+                outcome['result'] = self._run_preview(resolved_config, query, limit, handle, timeout)
+            except Exception as e:
+                outcome['error'] = e
+            finally:
+                done.set()
+        
+        try:
+            threading.Thread(target=worker, name='preview', daemon=True).start()
+            if not done.wait(timeout):
+                handle.cancel()
+                raise Exception(f"Preview timed out after {timeout:g}s and was cancelled")
+        finally:
+            if preview_id:
+                self._previews.pop(preview_id, None)
+        
+        if handle.cancelled:
+            raise Exception("Preview was cancelled")
+        if 'error' in outcome:
+            raise outcome['error']
+        
+        result = outcome['result']
+        self.preview_cache.set(cache_key, result)
+        return result
+    
+    def cancel_preview(self, preview_id: str) -> bool:
+        """
+        Cancel a running preview, killing its statement on the database
+        
+        Args:
+            preview_id: ID passed to preview_database
+            
+        Returns:
+            True if the preview was running
+        """
+        handle = self._previews.get(preview_id)
+        if handle is None:
+            return False
+        handle.cancel()
+        return True
+    
+    def _run_preview(self, resolved_config: Dict[str, Any], query: str, limit: int,
+                     handle: _RunningPreview, timeout: float) -> Dict[str, Any]:
+        """Route a preview to the handler for the connection method"""
+        connection_method = self.detect_connection_method(resolved_config)
+        
+        # Route to appropriate handler
+        if connection_method == 'jdbc':
+            return self._preview_jdbc(resolved_config, query, limit, handle)
+        elif connection_method == 'mongo':
+            return self._preview_mongo(resolved_config, query, limit, timeout)
+        else:
+            return self._preview_native(resolved_config, query, limit, handle, timeout)
+    
+    def detect_connection_method(self, config: Dict[str, Any]) -> str:
+        """
+        Connection method for a configuration: 'jdbc', 'mongo' or 'native'
+        
+        Args:
+            config: Database configuration
+            
+        Returns:
+            The configured connectionMethod, auto-detected if not specified
+        """
+        db_type = (config.get('dbType') or '').lower()
+        connection_method = (config.get('connectionMethod') or 'auto').lower()
         
         # Auto-detect connection method if not specified
         if connection_method == 'auto':
             if db_type == 'mongodb':
                 connection_method = 'mongo'
-            elif resolved_config.get('jdbcDriver') or resolved_config.get('jdbcUrl'):
+            elif config.get('jdbcDriver') or config.get('jdbcUrl'):
                 connection_method = 'jdbc'
             else:
                 connection_method = 'native'
+        return connection_method
+    
+    def resolve_config(self, config: Dict[str, Any], workspace_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Resolve passwords (context variables, commands, env vars) in a connection configuration
         
-        # Route to appropriate handler
-        if connection_method == 'jdbc':
-            return self._preview_jdbc(resolved_config, query, limit)
-        elif connection_method == 'mongo':
-            return self._preview_mongo(resolved_config, query, limit)
-        else:
-            return self._preview_native(resolved_config, query, limit)
+        Args:
+            config: Database configuration (component or saved connection)
+            workspace_id: Optional workspace ID for context variables
+            
+        Returns:
+            Config with resolved passwords
+        """
+        return self._resolve_config_passwords(config, workspace_id)
+    
+    def resolve_connection_url(self, config: Dict[str, Any], workspace_id: Optional[str] = None) -> tuple:
+        """
+        Resolve passwords and build the SQLAlchemy URL for a native connection
+        
+        Args:
+            config: Database configuration (component or saved connection)
+            workspace_id: Optional workspace ID for context variables
+            
+        Returns:
+            Tuple of (db_type, connection string)
+        """
+        resolved_config = self._resolve_config_passwords(config, workspace_id)
+        db_type = (resolved_config.get('dbType') or resolved_config.get('type') or 'mysql').lower()
+        return db_type, self._build_connection_string(db_type, resolved_config)
     
     def _resolve_config_passwords(self, config: Dict[str, Any], workspace_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -88,14 +235,17 @@ class DatabaseConnectionService:
         # Resolve the config
         return resolver.resolve_connection_config(config)
     
-    def _preview_jdbc(self, config: Dict[str, Any], query: str, limit: int) -> Dict[str, Any]:
+    def _preview_jdbc(self, config: Dict[str, Any], query: str, limit: int, handle: _RunningPreview) -> Dict[str, Any]:
         """Preview using JDBC connection"""
         if not HAS_JAYDEBEAPI:
             raise ImportError("JayDeBeApi not installed. Install with: pip install JayDeBeApi JPype1")
         
-        return jdbc_manager.preview_query(config, query, limit)
+        return jdbc_manager.preview_query(
+            config, query, limit, register_cancel=handle.set_cancel, is_cancelled=lambda: handle.cancelled
+        )
     
-    def _preview_native(self, config: Dict[str, Any], query: str, limit: int) -> Dict[str, Any]:
+    def _preview_native(self, config: Dict[str, Any], query: str, limit: int,
+                        handle: _RunningPreview, timeout: float) -> Dict[str, Any]:
         """Preview using SQLAlchemy (native Python drivers)"""
         if not HAS_SQLALCHEMY:
             raise ImportError("SQLAlchemy not installed. Install with: pip install sqlalchemy pymysql")
@@ -105,121 +255,180 @@ class DatabaseConnectionService:
         # Build connection string
         connection_string = self._build_connection_string(db_type, config)
         
-        # Create engine
-        engine = create_engine(
-            connection_string,
-            poolclass=QueuePool,
-            pool_size=5,
-            max_overflow=10,
-            pool_timeout=30,
-            pool_recycle=3600,
-            pool_pre_ping=True
-        )
+        # Shared engine, so repeated previews reuse pooled connections
+        engine = engine_registry.get_engine(connection_string, config)
         
-        # Apply limit to query
-        limited_query = QueryDialect.apply_limit(query, db_type, limit)
+        # Row-limited query, then the query as written if the database refuses the wrapper
+        candidates = QueryDialect.preview_queries(query, db_type, limit)
+        timeout_ms = int(timeout * 1000)
         
-        try:
-            with engine.connect() as conn:
-                result = conn.execute(text(limited_query))
+        with engine.connect() as conn:
+            dbapi_conn = conn.connection.dbapi_connection
+                
+            # Server-side statement timeout, so the database gives up even if the cancel is lost
+            if db_type == 'postgresql':
+                conn.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
+                handle.set_cancel(dbapi_conn.cancel)
+            elif db_type == 'mysql':
+                conn.execute(text(f"SET SESSION MAX_EXECUTION_TIME = {timeout_ms}"))
+                thread_id = conn.execute(text("SELECT CONNECTION_ID()")).scalar()
+                handle.set_cancel(lambda: self._kill_mysql_query(engine, thread_id))
+            elif db_type == 'oracle':
+                dbapi_conn.call_timeout = timeout_ms
+                handle.set_cancel(dbapi_conn.cancel)
+            elif db_type == 'sqlite':
+                handle.set_cancel(dbapi_conn.interrupt)
+            
+            try:
+                for attempt, candidate in enumerate(candidates):
+                    try:
+                        result = conn.execute(text(candidate))
+                        break
+                    except Exception:
+                        if handle.cancelled or attempt == len(candidates) - 1:
+                            raise
+                        # A failed statement aborts the transaction (and its SET LOCAL) on PostgreSQL
+                        conn.rollback()
+                        if db_type == 'postgresql':
+                            conn.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
                 
-                # Fetch data
-                rows = result.fetchall()
-                columns = result.keys()
+                # Fetch data; fetchmany so a query the limit could not be applied to stops early
+                rows = result.fetchmany(limit)
+                columns = list(result.keys())
+                result.close()
+            finally:
+                # Pooled connections are reused, so session settings are put back
+                handle.set_cancel(None)
+                if db_type == 'mysql':
+                    conn.execute(text("SET SESSION MAX_EXECUTION_TIME = DEFAULT"))
+                elif db_type == 'oracle':
+                    dbapi_conn.call_timeout = 0
+                conn.rollback()
                 
-                # Convert to list of dicts
-                data = [dict(zip(columns, row)) for row in rows]
+            # Convert to list of dicts
+            data = [dict(zip(columns, row)) for row in rows]
                 
-                # Auto-detect schema
-                schema = []
-                if data:
-                    for col in columns:
-                        col_type = 'string'
-                        for row in data:
-                            val = row.get(col)
-                            if val is not None:
-                                if isinstance(val, (int, float)):
-                                    col_type = 'number'
-                                elif isinstance(val, bool):
-                                    col_type = 'boolean'
-                                break
+            # Auto-detect schema
+            schema = []
+            if data:
+                for col in columns:
+                    col_type = 'string'
+                    for row in data:
+                        val = row.get(col)
+                        if val is not None:
+                            if isinstance(val, (int, float)):
+                                col_type = 'number'
+                            elif isinstance(val, bool):
+                                col_type = 'boolean'
+                            break
                         
-                        schema.append({
-                            'name': col,
-                            'type': col_type
-                        })
+                    schema.append({
+                        'name': col,
+                        'type': col_type
+                    })
                 
-                return {
-                    'data': data,
-                    'schema': schema,
-                    'totalRows': len(data)
-                }
-        finally:
-            engine.dispose()
+            return {
+                'data': data,
+                'schema': schema,
+                'totalRows': len(data)
+            }
     
-    def _preview_mongo(self, config: Dict[str, Any], query: str, limit: int) -> Dict[str, Any]:
-        """Preview MongoDB collection"""
-        if not HAS_PYMONGO:
-            raise ImportError("PyMongo not installed. Install with: pip install pymongo")
-        
+    def _build_mongo_connection_string(self, config: Dict[str, Any]) -> str:
+        """Build MongoDB connection string"""
         host = config.get('host', 'localhost')
-        port = config.get('port', 27017)
+        port = config.get('port') or 27017
         database = config.get('database', 'test')
         username = config.get('username')
         password = config.get('password')
         
-        # Build connection string
         if username and password:
-            connection_string = f"mongodb://{username}:{password}@{host}:{port}/{database}"
-        else:
-            connection_string = f"mongodb://{host}:{port}/{database}"
+            return f"mongodb://{quote_plus(username)}:{quote_plus(password)}@{host}:{port}/{database}"
+        return f"mongodb://{host}:{port}/{database}"
         
-        # Create client
-        client = MongoClient(
-            connection_string,
-            maxPoolSize=10,
-            serverSelectionTimeoutMS=5000
-        )
+    def get_mongo_client(self, config: Dict[str, Any]):
+        """
+        Get the shared MongoClient for a connection, creating it on first use
         
-        try:
-            db = client[database]
-            
-            # Parse query (expecting collection name)
-            collection_name = query.strip()
-            collection = db[collection_name]
+        MongoClient is thread-safe and pools its own connections, so one client per
+        connection string is reused by previews, readers and writers.
+        
+        Args:
+            config: Resolved connection configuration (optional poolSize override)
             
-            # Fetch documents
-            cursor = collection.find().limit(limit)
-            data = list(cursor)
+        Returns:
+            pymongo.MongoClient
+        """
+        if not HAS_PYMONGO:
+            raise ImportError("PyMongo not installed. Install with: pip install pymongo")
+        
+        connection_string = self._build_mongo_connection_string(config)
+        pool_size = int(config.get('poolSize') or 10)
+        key = make_cache_key(connection_string, pool_size)
+        
+        with self._mongo_lock:
+            client = self.mongo_clients.get(key)
+            if client is None:
+                client = MongoClient(
+                    connection_string,
+                    maxPoolSize=pool_size,
+                    serverSelectionTimeoutMS=5000
+                )
+                self.mongo_clients[key] = client
+            return client
+    
+    def get_mongo_database(self, config: Dict[str, Any], workspace_id: Optional[str] = None):
+        """
+        Resolve passwords and return the pymongo Database for a connection
+        
+        Args:
+            config: Database configuration (component or saved connection)
+            workspace_id: Optional workspace ID for context variables
+        """
+        resolved_config = self._resolve_config_passwords(config, workspace_id)
+        return self.get_mongo_client(resolved_config)[resolved_config.get('database') or 'test']
+    
+    def _kill_mysql_query(self, engine, thread_id):
+        """Kill the statement running on a MySQL connection, from a separate connection"""
+        with engine.connect() as conn:
+            conn.execute(text(f"KILL QUERY {int(thread_id)}"))
+    
+    def _preview_mongo(self, config: Dict[str, Any], query: str, limit: int, timeout: float) -> Dict[str, Any]:
+        """Preview MongoDB collection"""
+        from app.connectors.database.mongo_connector import MongoConnector
+        
+        db = self.get_mongo_client(config)[config.get('database', 'test')]
+        
+        # Parse query (expecting collection name); filter/projection/pipeline come from the config
+        collection_name = query.strip()
+        batches = MongoConnector(db).iter_batches({
+            **config, 'collection': collection_name, 'batchSize': limit, 'maxTimeMS': int(timeout * 1000)
+        })
+        try:
+            data = next(batches, [])[:limit]
+        finally:
+            batches.close()
             
-            # Convert ObjectId to string
-            for doc in data:
-                if '_id' in doc:
-                    doc['_id'] = str(doc['_id'])
+        # Auto-detect schema from first document
+        schema = []
+        if data:
+            first_doc = data[0]
+            for key, value in first_doc.items():
+                col_type = 'string'
+                if isinstance(value, (int, float)):
+                    col_type = 'number'
+                elif isinstance(value, bool):
+                    col_type = 'boolean'
             
-            # Auto-detect schema from first document
-            schema = []
-            if data:
-                first_doc = data[0]
-                for key, value in first_doc.items():
-                    col_type = 'string'
-                    if isinstance(value, (int, float)):
-                        col_type = 'number'
-                    elif isinstance(value, bool):
-                        col_type = 'boolean'
-                    
-                    schema.append({
-                        'name': key,
-                        'type': col_type
-                    })
+                schema.append({
+                    'name': key,
+                    'type': col_type
+                })
             
-            return {
-                'data': data,
-                'schema': schema,
-                'totalRows': len(data)
-            }
-        finally:
-            client.close()
+        return {
+            'data': data,
+            'schema': schema,
+            'totalRows': len(data)
+        }
     
     def _build_connection_string(self, db_type: str, config: Dict[str, Any]) -> str:
         """Build SQLAlchemy connection string"""
@@ -0,0 +1,194 @@
+"""
+SQLAlchemy Engine Registry
+Process-wide pool of SQLAlchemy engines shared by readers, writers and previews
+"""
+import threading
+import time
+from typing import Dict, Any, Optional
+from app.utils.cache import make_cache_key
+from config.settings import config as app_config
+
+# Try to import optional dependencies
+try:
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.pool import QueuePool
+    HAS_SQLALCHEMY = True
+except ImportError:
+    HAS_SQLALCHEMY = False
+
+# How often idle engines are checked for eviction
+SWEEP_INTERVAL = 60
+
+class _PoolWaitStats:
+    """Accumulates time spent waiting for a connection from a pool"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float):
+        with self.lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+def _timed_pool_class(stats: _PoolWaitStats):
+    """
+    Build a QueuePool subclass that records checkout wait time.
+
+    Stats live on the class so they survive pool.recreate() after dispose().
+    """
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return QueuePool._do_get(self)
+        finally:
+            stats.record(time.perf_counter() - start)
+
+    return type('TimedQueuePool', (QueuePool,), {'_do_get': _do_get})
+
+class EngineRegistry:
+    """
+    Shares one SQLAlchemy engine (and so one connection pool) per resolved URL and pool options.
+
+    Engines unused for longer than DB_POOL_IDLE_TIMEOUT are disposed, closing their pooled
+    connections; they are recreated transparently on next use.
+    """
+
+    def __init__(self, idle_timeout: Optional[int] = None):
+        self.idle_timeout = idle_timeout if idle_timeout is not None else app_config.DB_POOL_IDLE_TIMEOUT
+        self._engines = {}
+        self._lock = threading.Lock()
+        self._last_sweep = 0
+
+    def pool_options(self, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Pool options for a connection, from component/connection config with settings defaults
+
+        Args:
+            config: Optional config with poolSize, maxOverflow, poolTimeout, poolRecycle
+
+        Returns:
+            Dictionary of create_engine pool keyword arguments
+        """
+        config = config or {}
+        return {
+            'pool_size': int(config.get('poolSize') or app_config.DB_POOL_SIZE),
+            'max_overflow': int(config.get('maxOverflow') if config.get('maxOverflow') is not None else app_config.DB_POOL_MAX_OVERFLOW),
+            'pool_timeout': int(config.get('poolTimeout') or app_config.DB_POOL_TIMEOUT),
+            'pool_recycle': int(config.get('poolRecycle') or app_config.DB_POOL_RECYCLE),
+            'pool_pre_ping': True
+        }
+
+    def get_engine(self, url: str, config: Optional[Dict[str, Any]] = None):
+        """
+        Get the shared engine for a URL, creating it on first use
+
+        Args:
+            url: SQLAlchemy connection string (with resolved credentials)
+            config: Optional component/connection config with pool overrides
+
+        Returns:
+            sqlalchemy.engine.Engine
+        """
+        if not HAS_SQLALCHEMY:
+            raise ImportError("SQLAlchemy not installed. Install with: pip install sqlalchemy pymysql")
+
+        options = self.pool_options(config)
+        key = make_cache_key(url, options)
+        self._sweep()
+
+        with self._lock:
+            entry = self._engines.get(key)
+            if entry is None:
+                entry = self._create_entry(url, options)
+                self._engines[key] = entry
+            entry['last_used'] = time.time()
+            return entry['engine']
+
+    def _create_entry(self, url: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        stats = _PoolWaitStats()
+        if url.startswith('sqlite'):
+            # SQLite uses its own pool classes; only pre-ping applies
+            engine = create_engine(url, pool_pre_ping=True)
+        else:
+            engine = create_engine(url, poolclass=_timed_pool_class(stats), **options)
+
+        entry = {
+            'engine': engine,
+            'url': engine.url.render_as_string(hide_password=True),
+            'options': options,
+            'wait_stats': stats,
+            'created': time.time(),
+            'last_used': time.time()
+        }
+
+        @event.listens_for(engine, 'checkout')
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            entry['last_used'] = time.time()
+
+        return entry
+
+    def _sweep(self):
+        """Dispose engines that have been idle too long, at most once per SWEEP_INTERVAL"""
+        now = time.time()
+        if now - self._last_sweep < SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+
+        with self._lock:
+            for key, entry in list(self._engines.items()):
+                pool = entry['engine'].pool
+                checked_out = pool.checkedout() if hasattr(pool, 'checkedout') else 0
+                if checked_out == 0 and now - entry['last_used'] > self.idle_timeout:
+                    entry['engine'].dispose()
+                    del self._engines[key]
+
+    def stats(self) -> list:
+        """
+        Pool statistics for monitoring
+
+        Returns:
+            List of per-engine dictionaries (URL without password, pool size, checked out,
+            overflow, and checkout wait times)
+        """
+        now = time.time()
+        result = []
+        with self._lock:
+            entries = list(self._engines.values())
+
+        for entry in entries:
+            pool = entry['engine'].pool
+            wait = entry['wait_stats']
+            item = {
+                'url': entry['url'],
+                'pool': type(pool).__name__,
+                'ageSeconds': round(now - entry['created'], 1),
+                'idleSeconds': round(now - entry['last_used'], 1)
+            }
+            if isinstance(pool, QueuePool):
+                item.update({
+                    'size': pool.size(),
+                    'checkedIn': pool.checkedin(),
+                    'checkedOut': pool.checkedout(),
+                    'overflow': pool.overflow(),
+                    'maxOverflow': entry['options']['max_overflow'],
+                    'checkouts': wait.checkouts,
+                    'avgWaitMs': round(wait.total_wait / wait.checkouts * 1000, 2) if wait.checkouts else 0.0,
+                    'maxWaitMs': round(wait.max_wait * 1000, 2)
+                })
+            result.append(item)
+        return result
+
+    def dispose_all(self):
+        """Dispose every engine and clear the registry"""
+        with self._lock:
+            entries = list(self._engines.values())
+            self._engines.clear()
+        for entry in entries:
+            entry['engine'].dispose()
+
+# Global instance
+engine_registry = EngineRegistry()
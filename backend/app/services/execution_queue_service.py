@@ -0,0 +1,254 @@
+"""
+Execution Queue
+Executions waiting in the metadata database to be claimed and run by worker processes
+"""
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import text
+from app.utils.db import Database
+
+QUEUED = 'queued'
+RUNNING = 'running'
+
+def _now(offset_seconds: float = 0) -> str:
+    # Fixed-width UTC timestamps, so stored values compare correctly as text
+    return (datetime.utcnow() + timedelta(seconds=offset_seconds)).isoformat(timespec='microseconds')
+
+class ExecutionQueueService:
+    """
+    Service for the queue of pending executions.
+
+    Each queued entry has an execution record with status 'queued' from the moment it is
+    enqueued, so it is visible in execution lists before a worker picks it up. Workers claim
+    entries atomically (FOR UPDATE SKIP LOCKED on PostgreSQL, a conditional update
+    elsewhere), heartbeat while they run them and delete them once finished. Entries whose
+    worker stopped heartbeating are requeued, so delivery is at-least-once.
+    """
+
+    def __init__(self, db_path):
+        self.db = Database(db_path)
+
+    def enqueue(self, job_id: str, execution_id: str, trigger_type: str = 'MANUAL', replay_of: Optional[str] = None,
+                parent_execution_id: Optional[str] = None, job_stack: Tuple[str, ...] = ()) -> Dict[str, Any]:
+        """
+        Queue a job run
+
+        parent_execution_id and job_stack are kept for sub-jobs started by a Run Job
+        component, so the worker links the execution and refuses recursive calls.
+
+        Returns:
+            The queued execution (id, jobId, status 'queued', ...)
+        """
+        now = _now()
+        with self.db.get_connection() as conn:
+            conn.execute(text('''
+                INSERT INTO executions (id, job_id, status, trigger_type, message, logs, start_time, end_time, parent_execution_id)
+                VALUES (:id, :job_id, :status, :trigger_type, :message, :logs, :now, NULL, :parent_execution_id)
+            '''), {
+                'id': execution_id,
+                'job_id': job_id,
+                'status': QUEUED,
+                'trigger_type': trigger_type,
+                'message': 'Waiting for a worker',
+                'logs': json.dumps([]),
+                'now': now,
+                'parent_execution_id': parent_execution_id
+            })
+            conn.execute(text('''
+                INSERT INTO execution_queue (id, job_id, trigger_type, replay_of, status, attempts, enqueued_at, parent_execution_id, job_stack)
+                VALUES (:id, :job_id, :trigger_type, :replay_of, :status, 0, :now, :parent_execution_id, :job_stack)
+            '''), {
+                'id': execution_id,
+                'job_id': job_id,
+                'trigger_type': trigger_type,
+                'replay_of': replay_of,
+                'status': QUEUED,
+                'now': now,
+                'parent_execution_id': parent_execution_id,
+                'job_stack': json.dumps(list(job_stack))
+            })
+            conn.commit()
+
+        return {
+            'id': execution_id,
+            'jobId': job_id,
+            'status': QUEUED,
+            'message': 'Waiting for a worker',
+            'logs': [],
+            'startTime': now,
+            'endTime': None,
+            'triggerType': trigger_type,
+            'parentExecutionId': parent_execution_id
+        }
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Claim the oldest queued entry for a worker
+
+        Returns:
+            The claimed entry (id, job_id, trigger_type, replay_of, attempts, parent_execution_id and
+            job_stack as a tuple), or None if the queue is empty
+        """
+        now = _now()
+        params = {'worker_id': worker_id, 'now': now, 'queued': QUEUED, 'running': RUNNING}
+
+        if self.db.engine.dialect.name == 'postgresql':
+            # Concurrent workers skip rows another transaction has locked instead of waiting
+            with self.db.get_connection() as conn:
+                row = conn.execute(text('''
+                    UPDATE execution_queue
+                    SET status = :running, worker_id = :worker_id, claimed_at = :now, heartbeat_at = :now, attempts = attempts + 1
+                    WHERE id = (
+                        SELECT id FROM execution_queue
+                        WHERE status = :queued
+                        ORDER BY enqueued_at
+                        LIMIT 1
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING id, job_id, trigger_type, replay_of, attempts, parent_execution_id, job_stack
+                '''), params).fetchone()
+                if row:
+                    self._mark_running(conn, row.id, now)
+                conn.commit()
+            return self._parse_entry(dict(row._mapping)) if row else None
+
+        # Other databases (SQLite): claim with a conditional update, which only one worker can win
+        candidates = self.db.fetch_all(
+            'SELECT id FROM execution_queue WHERE status = :queued ORDER BY enqueued_at LIMIT 10',
+            {'queued': QUEUED}
+        )
+        for candidate in candidates:
+            with self.db.get_connection() as conn:
+                result = conn.execute(text('''
+                    UPDATE execution_queue
+                    SET status = :running, worker_id = :worker_id, claimed_at = :now, heartbeat_at = :now, attempts = attempts + 1
+                    WHERE id = :id AND status = :queued
+                '''), {**params, 'id': candidate['id']})
+                if result.rowcount == 1:
+                    self._mark_running(conn, candidate['id'], now)
+                    conn.commit()
+                    return self._parse_entry(self.db.fetch_one('''
+                        SELECT id, job_id, trigger_type, replay_of, attempts, parent_execution_id, job_stack
+                        FROM execution_queue WHERE id = :id
+                    ''', {'id': candidate['id']}))
+                conn.commit()
+        return None
+
+    def _parse_entry(self, entry):
+        entry['job_stack'] = tuple(json.loads(entry['job_stack'] or '[]'))
+        return entry
+
+    def _mark_running(self, conn, execution_id, now):
+        conn.execute(text('''
+            UPDATE executions SET status = :status, message = :message, start_time = :now WHERE id = :id
+        '''), {'id': execution_id, 'status': RUNNING, 'message': 'Running', 'now': now})
+
+    def heartbeat(self, worker_id: str) -> int:
+        """Refresh the heartbeat of every entry a worker is running; returns how many it still owns"""
+        result = self.db.execute('''
+            UPDATE execution_queue SET heartbeat_at = :now
+            WHERE worker_id = :worker_id AND status = :running
+        ''', {'worker_id': worker_id, 'now': _now(), 'running': RUNNING})
+        return result.rowcount
+
+    def complete(self, execution_id: str, worker_id: str):
+        """Remove a finished entry (only if the worker still owns it)"""
+        self.db.execute(
+            'DELETE FROM execution_queue WHERE id = :id AND worker_id = :worker_id',
+            {'id': execution_id, 'worker_id': worker_id}
+        )
+
+    def requeue_stale(self, timeout: float, max_attempts: int) -> Dict[str, int]:
+        """
+        Requeue entries whose worker has not heartbeaten for timeout seconds
+
+        Entries that have already been attempted max_attempts times are dropped and their
+        execution is marked as failed instead.
+
+        Returns:
+            Number of entries requeued and failed
+        """
+        stale = self.db.fetch_all('''
+            SELECT id, worker_id, attempts, heartbeat_at FROM execution_queue
+            WHERE status = :running AND heartbeat_at < :cutoff
+        ''', {'running': RUNNING, 'cutoff': _now(-timeout)})
+
+        counts = {'requeued': 0, 'failed': 0}
+        for entry in stale:
+            # Conditional on the heartbeat we saw, in case the worker recovered or another sweep got here first
+            params = {'id': entry['id'], 'running': RUNNING, 'heartbeat_at': entry['heartbeat_at']}
+            condition = 'id = :id AND status = :running AND heartbeat_at = :heartbeat_at'
+            with self.db.get_connection() as conn:
+                if entry['attempts'] < max_attempts:
+                    result = conn.execute(text(f'''
+                        UPDATE execution_queue SET status = :queued, worker_id = NULL WHERE {condition}
+                    '''), {**params, 'queued': QUEUED})
+                    outcome, status, message = 'requeued', QUEUED, f"Requeued: worker {entry['worker_id']} stopped responding"
+                else:
+                    result = conn.execute(text(f'DELETE FROM execution_queue WHERE {condition}'), params)
+                    outcome, status, message = 'failed', 'error', f"Worker {entry['worker_id']} stopped responding after {entry['attempts']} attempts"
+
+                if result.rowcount == 1:
+                    conn.execute(text('''
+                        UPDATE executions SET status = :status, message = :message, end_time = :end_time WHERE id = :id
+                    '''), {
+                        'id': entry['id'],
+                        'status': status,
+                        'message': message,
+                        'end_time': _now() if status == 'error' else None
+                    })
+                    counts[outcome] += 1
+                conn.commit()
+        return counts
+
+    def count_active(self, job_id: str) -> int:
+        """Number of a job's entries that are queued or running"""
+        row = self.db.fetch_one(
+            'SELECT COUNT(*) AS count FROM execution_queue WHERE job_id = :job_id',
+            {'job_id': job_id}
+        )
+        return row['count'] if row else 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth by status and the entries each active worker is running"""
+        counts = self.db.fetch_all('SELECT status, COUNT(*) AS count FROM execution_queue GROUP BY status')
+        workers = self.db.fetch_all('''
+            SELECT worker_id, COUNT(*) AS running, MAX(heartbeat_at) AS last_heartbeat
+            FROM execution_queue
+            WHERE status = :running
+            GROUP BY worker_id
+        ''', {'running': RUNNING})
+        oldest = self.db.fetch_one(
+            'SELECT MIN(enqueued_at) AS oldest FROM execution_queue WHERE status = :queued',
+            {'queued': QUEUED}
+        )
+        by_status = {row['status']: row['count'] for row in counts}
+        return {
+            'queued': by_status.get(QUEUED, 0),
+            'running': by_status.get(RUNNING, 0),
+            'oldestQueuedAt': oldest['oldest'] if oldest else None,
+            'workers': [
+                {'workerId': row['worker_id'], 'running': row['running'], 'lastHeartbeat': row['last_heartbeat']}
+                for row in workers
+            ]
+        }
+
+    def get_pending(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Queued and running entries, oldest first"""
+        rows = self.db.fetch_all('''
+            SELECT * FROM execution_queue ORDER BY enqueued_at LIMIT :limit
+        ''', {'limit': limit})
+        return [
+            {
+                'id': row['id'],
+                'jobId': row['job_id'],
+                'triggerType': row['trigger_type'],
+                'status': row['status'],
+                'workerId': row['worker_id'],
+                'attempts': row['attempts'],
+                'enqueuedAt': row['enqueued_at'],
+                'heartbeatAt': row['heartbeat_at']
+            }
+            for row in rows
+        ]
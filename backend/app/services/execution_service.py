@@ -1,16 +1,26 @@
 import uuid
 import json
+import functools
+import threading
 from datetime import datetime
 from app.utils.db import Database
 from app.services.job_service import JobService
 from app.services.workspace_service import WorkspaceService
-from app.services.connection_service import ConnectionService
+from app.services.connection_service import connection_service
 from app.services.file_system_service import FileSystemService
+from app.services.watermark_service import WatermarkService
+from app.services.kafka_offset_service import KafkaOffsetService
+from app.services.execution_queue_service import ExecutionQueueService
+from app.services.orchestration_service import OrchestrationService
+from config.settings import config as app_config
 import pandas as pd
 import numpy as np
 
 # Import Executors
-from app.executors.io import FileReaderExecutor, FileWriterExecutor, DatabaseReaderExecutor, DatabaseWriterExecutor
+from app.executors.io import (
+    FileReaderExecutor, FileWriterExecutor, DatabaseReaderExecutor, DatabaseWriterExecutor, JDBCReaderExecutor,
+    MongoDBReaderExecutor, MongoDBWriterExecutor
+)
 from app.executors.messaging import KafkaInputExecutor, KafkaOutputExecutor
 from app.executors.transform import (
     SortRowExecutor, AggregateRowExecutor, UniqRowExecutor, 
@@ -19,7 +29,56 @@ from app.executors.transform import (
 )
 from app.executors.script import JavaRowExecutor, RunJobExecutor
 from app.executors.network import RestClientExecutor
-from app.executors.base import BaseExecutor
+from app.executors.base import BaseExecutor, BatchStream, materialize
+
+# Context object passed to executors
+class JobContext:
+    def __init__(self, service, current_workspace_id, logs_list, component_id=None, job_id=None, success_callbacks=None,
+                 execution_id=None, replay_execution_id=None, job_stack=()):
+        self.service = service
+        self.connection_service = service.connection_service
+        self.file_system_service = service.file_system_service
+        self.watermark_service = service.watermark_service
+        self.kafka_offset_service = service.kafka_offset_service
+        self.db_path = service.db_path
+        self.current_workspace_id = current_workspace_id
+        self.logs_list = logs_list
+        self.component_id = component_id
+        self.job_id = job_id
+        self.success_callbacks = success_callbacks if success_callbacks is not None else []
+        self.execution_id = execution_id
+        # Set when re-running an earlier execution against the same source data
+        self.replay_execution_id = replay_execution_id
+        # Jobs running this one as a sub-job, outermost first, to refuse recursive calls
+        self.job_stack = tuple(job_stack)
+            
+    def log_message(self, message, level='info'):
+        self.logs_list.append({
+            'timestamp': datetime.utcnow().isoformat(),
+            'level': level,
+            'message': message,
+            'componentId': self.component_id
+        })
+                
+    def on_success(self, callback):
+        # Deferred until every component has finished, e.g. saving incremental state
+        self.success_callbacks.append(callback)
+                
+    def execute_job(self, sub_job_id, trigger_type='SUBJOB'):
+        # Recursive call, linked to this execution
+        return self.service.execute_job(
+            sub_job_id, trigger_type, parent_execution_id=self.execution_id, job_stack=self.job_stack
+        )
+        
+    def start_job(self, sub_job_id, trigger_type='SUBJOB'):
+        # Start a sub-job without waiting for it (queued for a worker in queue mode)
+        if sub_job_id in self.job_stack:
+            raise Exception(f"Recursive sub-job call: {' -> '.join(self.job_stack + (sub_job_id,))}")
+        if app_config.EXECUTION_MODE == 'queue':
+            return self.service.submit_job(
+                sub_job_id, trigger_type, parent_execution_id=self.execution_id, job_stack=self.job_stack
+            )
+        threading.Thread(target=self.execute_job, args=(sub_job_id, trigger_type), daemon=True).start()
 
 class ExecutionService:
     def __init__(self, db_path):
@@ -27,8 +86,12 @@ class ExecutionService:
         self.db = Database(db_path)
         self.job_service = JobService(db_path)
         self.workspace_service = WorkspaceService(db_path)
-        self.connection_service = ConnectionService(db_path)
+        self.connection_service = connection_service
         self.file_system_service = FileSystemService()
+        self.watermark_service = WatermarkService(db_path)
+        self.kafka_offset_service = KafkaOffsetService(db_path)
+        self.execution_queue_service = ExecutionQueueService(db_path)
+        self.orchestration_service = OrchestrationService(self)
         
         # Executor Registry
         self.executors = {
@@ -37,6 +100,9 @@ class ExecutionService:
             'file-writer': FileWriterExecutor(),
             'database-reader': DatabaseReaderExecutor(),
             'database-writer': DatabaseWriterExecutor(),
+            'jdbc-reader': JDBCReaderExecutor(),
+            'mongodb-reader': MongoDBReaderExecutor(),
+            'mongodb-writer': MongoDBWriterExecutor(),
             
             # Messaging
             'kafka-input': KafkaInputExecutor(),
@@ -190,36 +256,76 @@ class ExecutionService:
         else:
             return config
 
-    def execute_job(self, job_id, trigger_type='MANUAL'):
-        """Execute a job pipeline."""
-        execution_id = str(uuid.uuid4())
+    def submit_job(self, job_id, trigger_type='MANUAL', replay_of=None, max_concurrent_runs=None,
+                   parent_execution_id=None, job_stack=()):
+        """
+        Run a job now, or with EXECUTION_MODE=queue only enqueue it for a worker process.
+
+        max_concurrent_runs refuses to queue another run while the job already has that many
+        queued or running (inline runs are limited by the scheduler itself).
+        parent_execution_id and job_stack are passed on as for execute_job.
+
+        Returns:
+            The finished execution, or the queued one (status 'queued')
+        """
+        if app_config.EXECUTION_MODE != 'queue':
+            return self.execute_job(
+                job_id, trigger_type, replay_of=replay_of, parent_execution_id=parent_execution_id, job_stack=job_stack
+            )
+        if not self.job_service.get_by_id(job_id):
+            raise Exception(f"Job not found: {job_id}")
+        if max_concurrent_runs:
+            active = self.execution_queue_service.count_active(job_id)
+            if active >= max_concurrent_runs:
+                raise Exception(f"Job already has {active} runs queued or running (maxConcurrentRuns {max_concurrent_runs})")
+        return self.execution_queue_service.enqueue(
+            job_id, str(uuid.uuid4()), trigger_type, replay_of=replay_of,
+            parent_execution_id=parent_execution_id, job_stack=job_stack
+        )
+
+    def execute_dag(self, job_id, max_parallel=None, execution_id=None):
+        """Run a job after the jobs it depends on, independent jobs in parallel (see OrchestrationService)"""
+        return self.orchestration_service.run(job_id, max_parallel=max_parallel, execution_id=execution_id)
+
+    def submit_dag(self, job_id, max_parallel=None):
+        """
+        Run a job with its dependencies now, or with EXECUTION_MODE=queue enqueue the run
+        for a worker process (which runs the jobs of the graph on its own threads).
+        """
+        if app_config.EXECUTION_MODE != 'queue':
+            return self.execute_dag(job_id, max_parallel=max_parallel)
+        if not self.job_service.get_by_id(job_id):
+            raise Exception(f"Job not found: {job_id}")
+        return self.execution_queue_service.enqueue(job_id, str(uuid.uuid4()), 'ORCHESTRATION')
+
+    def execute_job(self, job_id, trigger_type='MANUAL', replay_of=None, execution_id=None, parent_execution_id=None,
+                    job_stack=()):
+        """
+        Execute a job pipeline.
+
+        replay_of is an earlier execution ID whose recorded source ranges (Kafka offsets)
+        are read again instead of new data. execution_id is given by workers running a
+        queued execution, whose record already exists and is updated with the result.
+        parent_execution_id links the execution to the one that started it (a Run Job
+        component or an orchestration run), and job_stack lists the jobs already running
+        this one as a sub-job.
+        """
+        queued = execution_id is not None
+        execution_id = execution_id or str(uuid.uuid4())
         start_time = datetime.utcnow().isoformat()
         logs = []
+        finish = functools.partial(
+            self._create_execution_result, execution_id, job_id, start_time=start_time, trigger_type=trigger_type,
+            queued=queued, parent_execution_id=parent_execution_id
+        )
         
-        # Context object passed to executors
-        class JobContext:
-            def __init__(self, service, current_workspace_id, logs_list, component_id=None):
-                self.service = service
-                self.connection_service = service.connection_service
-                self.file_system_service = service.file_system_service
-                self.db_path = service.db_path
-                self.current_workspace_id = current_workspace_id
-                self.logs_list = logs_list
-                self.component_id = component_id
-            
-            def log_message(self, message, level='info'):
-                self.logs_list.append({
-                    'timestamp': datetime.utcnow().isoformat(),
-                    'level': level,
-                    'message': message,
-                    'componentId': self.component_id
-                })
-                
-            def execute_job(self, sub_job_id, trigger_type='SUBJOB'):
-                # Recursive call
-                return self.service.execute_job(sub_job_id, trigger_type)
-
         try:
+            if job_id in job_stack:
+                raise Exception(f"Recursive sub-job call: {' -> '.join(tuple(job_stack) + (job_id,))}")
+            job_stack = tuple(job_stack) + (job_id,)
+            if len(job_stack) > app_config.SUBJOB_MAX_DEPTH:
+                raise Exception(f"Sub-jobs nested more than {app_config.SUBJOB_MAX_DEPTH} levels deep")
+            
             job = self.job_service.get_by_id(job_id)
             if not job:
                 raise Exception(f"Job not found: {job_id}")
@@ -247,128 +353,180 @@ class ExecutionService:
             # -----------------------------
             
             if not nodes:
-                return self._create_execution_result(
-                    execution_id, job_id, 'success', 'Pipeline is empty', logs, start_time, trigger_type
-                )
-            
-            # Topological sort
-            sorted_nodes = self._topological_sort(nodes, edges)
+                return finish('success', 'Pipeline is empty', logs)
             
+            success_callbacks = [] # Run only once the whole pipeline has succeeded
+            self._execute_nodes(
+                job_id, job['workspaceId'], nodes, edges, logs, success_callbacks,
+                execution_id=execution_id, replay_of=replay_of, job_stack=job_stack
+            )
+
+            for callback in success_callbacks:
+                callback()
+
+            return finish('success', 'Job completed successfully', logs)
+
+        except Exception as e:
+            return finish('error', str(e), logs)
+
+    def _execute_nodes(self, job_id, workspace_id, nodes, edges, logs, success_callbacks, execution_results=None,
+                       execution_id=None, replay_of=None, job_stack=()):
+        """
+        Run the components of a pipeline in topological order.
+
+        Nodes already present in execution_results are treated as done and their output is fed
+        downstream, which is how a streaming execution runs the pipeline for each micro-batch.
+
+        Returns:
+            dict: Output of each node, by node ID
+        """
+        # Topological sort
+        sorted_nodes = self._topological_sort(nodes, edges)
+        
+        if execution_results is None:
             execution_results = {} # Store output data for each node
+        
+        # Number of downstream consumers per node, used to decide whether a
+        # BatchStream output can be piped lazily or must be materialised
+        node_ids = {node['id'] for node in nodes}
+        out_degree = {}
+        for edge in edges:
+            if edge['source'] in node_ids and edge['target'] in node_ids:
+                out_degree[edge['source']] = out_degree.get(edge['source'], 0) + 1
+        
+        # Execute each component
+        for node in sorted_nodes:
+            if node['id'] in execution_results:
+                continue
             
-            # Execute each component
-            for node in sorted_nodes:
-                component_type = node['data']['type']
-                config = node['data']['config']
+            component_type = node['data']['type']
+            config = node['data']['config']
                 
-                # Context for this node
-                node_context = JobContext(self, job['workspaceId'], logs, node['id'])
+            # Context for this node
+            node_context = JobContext(
+                self, workspace_id, logs, node['id'], job_id, success_callbacks,
+                execution_id=execution_id, replay_execution_id=replay_of, job_stack=job_stack
+            )
                 
-                # Resolve inputs
-                inputs = self._resolve_inputs(node['id'], execution_results, edges)
+            # Resolve inputs
+            inputs = self._resolve_inputs(node['id'], execution_results, edges)
+
+            # Multi-input components need the full datasets of every input
+            if len(inputs) > 1 or component_type == 'map':
+                for inp in inputs:
+                    inp['data'] = materialize(inp['data'])
                 
-                # Default data behavior for single-input components
-                # Most executors now handle input_data list manually, but for compatibility 
-                # let's assume most take a raw list of records.
-                # If multiple inputs (Map/Union), we pass ALL inputs.
+            # Default data behavior for single-input components
+            # Most executors now handle input_data list manually, but for compatibility 
+            # let's assume most take a raw list of records.
+            # If multiple inputs (Map/Union), we pass ALL inputs.
                 
-                input_data = []
-                if component_type == 'union':
-                     # Special case: Union needs all inputs logic is inside Union logic potentially?
-                     # Actually UnionExecutor logic I wrote expects `input_data` to be a list of records?
-                     # No, I passed `input_data` which implies a single list.
-                     # `input_data` argument name is ambiguous.
-                     # List of dicts? Or List of Inputs?
+            input_data = []
+            if component_type == 'union':
+                 # Special case: Union needs all inputs logic is inside Union logic potentially?
+                 # Actually UnionExecutor logic I wrote expects `input_data` to be a list of records?
+                 # No, I passed `input_data` which implies a single list.
+                 # `input_data` argument name is ambiguous.
+                 # List of dicts? Or List of Inputs?
                      
-                     # My BaseExecutor docstring says: "input_data (list, optional): The input data from upstream (list of dicts)."
-                     # This implies ONLY a single stream.
+                 # My BaseExecutor docstring says: "input_data (list, optional): The input data from upstream (list of dicts)."
+                 # This implies ONLY a single stream.
                      
-                     # Map and Join need access to MULTIPLE separate streams.
-                     # So passing a single merged list is BAD for Map/Join.
-                     pass
+                 # Map and Join need access to MULTIPLE separate streams.
+                 # So passing a single merged list is BAD for Map/Join.
+                 pass
 
-                # Pre-processing inputs for Executor
-                # Strategy:
-                # 1. If single input, pass `inputs[0]['data']`.
-                # 2. If multiple inputs, pass `[inp['data'] for inp in inputs]`? 
-                #    But generic executors expact a list of dicts (rows).
-                #    If I pass `[ [row1, row2], [row3, row4] ]`, Pandas DataFrame(input_data) handles it weirdly.
+            # Pre-processing inputs for Executor
+            # Strategy:
+            # 1. If single input, pass `inputs[0]['data']`.
+            # 2. If multiple inputs, pass `[inp['data'] for inp in inputs]`? 
+            #    But generic executors expact a list of dicts (rows).
+            #    If I pass `[ [row1, row2], [row3, row4] ]`, Pandas DataFrame(input_data) handles it weirdly.
                 
-                # We need a Standard:
-                # `input_data` passed to `execute` should be:
-                # - For Single Stream components (Filter, Sort, etc): `List[Dict]` (rows).
-                # - For Multi Stream components (Map, Join): `List[List[Dict]]`? Or `Dict[SourceID, List[Dict]]`?
+            # We need a Standard:
+            # `input_data` passed to `execute` should be:
+            # - For Single Stream components (Filter, Sort, etc): `List[Dict]` (rows).
+            # - For Multi Stream components (Map, Join): `List[List[Dict]]`? Or `Dict[SourceID, List[Dict]]`?
                 
-                current_input = None
-                if inputs:
-                    if len(inputs) == 1:
-                        current_input = inputs[0]['data']
-                    else:
-                         # Merge? Or Pass Raw?
-                         # Only Map/Union handle multiple.
-                         if component_type == 'union':
-                             # Flatten
-                             current_input = []
-                             for inp in inputs:
-                                 if isinstance(inp['data'], list): current_input.extend(inp['data'])
-                                 elif inp['data']: current_input.append(inp['data'])
-                         elif component_type == 'map':
-                             # Map needs structured inputs
-                             # We can pass `inputs` directly if we change Executor signature?
-                             # Or we just assume `current_input` is `inputs` list for Map?
-                             # Let's handle Map specially.
-                             # Actually, Map needs to join. My `transform.py` doesn't have Map logic yet!
-                             # I MISSED MAP EXECUTOR!
-                             pass
+            current_input = None
+            if inputs:
+                if len(inputs) == 1:
+                    current_input = inputs[0]['data']
+                else:
+                     # Merge? Or Pass Raw?
+                     # Only Map/Union handle multiple.
+                     if component_type == 'union':
+                         # Flatten
+                         current_input = []
+                         for inp in inputs:
+                             if isinstance(inp['data'], list): current_input.extend(inp['data'])
+                             elif inp['data']: current_input.append(inp['data'])
+                     elif component_type == 'map':
+                         # Map needs structured inputs
+                         # We can pass `inputs` directly if we change Executor signature?
+                         # Or we just assume `current_input` is `inputs` list for Map?
+                         # Let's handle Map specially.
+                         # Actually, Map needs to join. My `transform.py` doesn't have Map logic yet!
+                         # I MISSED MAP EXECUTOR!
+                         pass
                 
-                # Handle Map Logic separately or implement MapExecutor
-                # The generic `execute` call:
+            # Handle Map Logic separately or implement MapExecutor
+            # The generic `execute` call:
                 
-                executor = self.executors.get(component_type)
+            executor = self.executors.get(component_type)
                 
-                if component_type == 'map':
-                     # I haven't implemented MapExecutor yet.
-                     # Let's keep Map logic INLINE for now or create MapExecutor.
-                     # Map Logic is complex (Joins).
-                     # I'll create `MapExecutor` in `transform.py` now (dynamically).
-                     pass
+            if component_type == 'map':
+                 # I haven't implemented MapExecutor yet.
+                 # Let's keep Map logic INLINE for now or create MapExecutor.
+                 # Map Logic is complex (Joins).
+                 # I'll create `MapExecutor` in `transform.py` now (dynamically).
+                 pass
                 
-                if executor:
-                    try:
-                        # For Map/Join, we probably want to pass the raw `inputs` list so it can distinguish sources.
-                        # But `BaseExecutor.execute` expects `input_data`.
-                        # Let's overload `input_data`.
+            if executor:
+                try:
+                    # For Map/Join, we probably want to pass the raw `inputs` list so it can distinguish sources.
+                    # But `BaseExecutor.execute` expects `input_data`.
+                    # Let's overload `input_data`.
                         
-                        # Special handling for Map and Union in the service loop?
-                        if component_type == 'map':
-                            # Pass RAW inputs array to executor
-                            output_data = executor.execute(config, inputs, context=node_context)
-                        else:
-                            # Standard behavior (single input preferred)
-                            output_data = executor.execute(config, current_input, context=node_context)
-                            
-                        execution_results[node['id']] = output_data
-                        
-                    except Exception as exec_err:
-                        node_context.log_message(f"Execution failed: {str(exec_err)}", level='error')
-                        # Rethrow or continue?
-                        raise exec_err
-                else:
+                    # Special handling for Map and Union in the service loop?
                     if component_type == 'map':
-                         # If I failed to add MapExecutor, fall back to inline?
-                         # I will add MapExecutor to `transform.py` in next step.
-                         pass
+                        # Pass RAW inputs array to executor
+                        output_data = executor.execute(config, inputs, context=node_context)
+                    elif isinstance(current_input, BatchStream) and executor.streaming:
+                        # Row-wise components are applied lazily, batch by batch
+                        output_data = current_input.map(functools.partial(executor.execute, config, context=node_context))
                     else:
-                        node_context.log_message(f"Unknown component type: {component_type}", level='warning')
+                        # Standard behavior (single input preferred)
+                        # Streams are only handed over to terminal components that can consume them
+                        if isinstance(current_input, BatchStream) and (not executor.accepts_stream or out_degree.get(node['id'])):
+                            current_input = current_input.to_list()
+                        output_data = executor.execute(config, current_input, context=node_context)
 
-            return self._create_execution_result(
-                execution_id, job_id, 'success', 'Job completed successfully', logs, start_time, trigger_type
-            )
+                    if isinstance(output_data, BatchStream):
+                        consumers = out_degree.get(node['id'], 0)
+                        if consumers == 0:
+                            row_count = output_data.drain()
+                            node_context.log_message(f"Processed {row_count} rows in {output_data.batch_count} batches")
+                            output_data = []
+                        elif consumers > 1:
+                            # A stream can only be iterated once, so fan-out needs a list
+                            output_data = output_data.to_list()
+                            
+                    execution_results[node['id']] = output_data
+                        
+                except Exception as exec_err:
+                    node_context.log_message(f"Execution failed: {str(exec_err)}", level='error')
+                    # Rethrow or continue?
+                    raise exec_err
+            else:
+                if component_type == 'map':
+                     # If I failed to add MapExecutor, fall back to inline?
+                     # I will add MapExecutor to `transform.py` in next step.
+                     pass
+                else:
+                    node_context.log_message(f"Unknown component type: {component_type}", level='warning')
 
-        except Exception as e:
-            return self._create_execution_result(
-                execution_id, job_id, 'error', str(e), logs, start_time, trigger_type
-            )
+        return execution_results
 
     def _topological_sort(self, nodes, edges):
          # ... reuse existing logic ...
@@ -400,7 +558,8 @@ class ExecutionService:
          return sorted_nodes
 
 
-    def _create_execution_result(self, execution_id, job_id, status, message, logs, start_time, trigger_type):
+    def _create_execution_result(self, execution_id, job_id, status, message, logs, start_time, trigger_type, queued=False,
+                                 parent_execution_id=None):
         end_time = datetime.utcnow().isoformat()
         duration = (datetime.fromisoformat(end_time) - datetime.fromisoformat(start_time)).total_seconds()
         
@@ -413,11 +572,15 @@ class ExecutionService:
             'startTime': start_time,
             'endTime': end_time,
             'duration': duration,
-            'triggerType': trigger_type
+            'triggerType': trigger_type,
+            'parentExecutionId': parent_execution_id
         }
         
-        # Save to DB
-        self.job_service.save_execution(result)
+        # Save to DB (a queued execution already has its record)
+        if queued:
+            self.job_service.update_execution(result)
+        else:
+            self.job_service.save_execution(result)
         return result
 
     def get_by_workspace(self, workspace_id, limit=50):
@@ -0,0 +1,130 @@
+"""
+Execution Worker
+Stateless process that claims queued executions from the metadata database and runs them
+"""
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+from app.services.execution_service import ExecutionService
+from app.services.execution_queue_service import ExecutionQueueService
+from config.settings import config as app_config
+
+class ExecutionWorker:
+    """
+    Runs queued executions on a pool of `concurrency` threads.
+
+    Any number of workers, on any number of machines, can share one metadata database.
+    A heartbeat thread keeps the worker's claims alive; each worker also requeues entries
+    of workers that stopped heartbeating. stop() finishes the running executions before
+    returning, so a worker can be drained on SIGTERM.
+    """
+
+    def __init__(self, db_path, concurrency: Optional[int] = None, worker_id: Optional[str] = None):
+        self.queue = ExecutionQueueService(db_path)
+        self.execution_service = ExecutionService(db_path)
+        self.concurrency = max(int(concurrency or app_config.WORKER_CONCURRENCY), 1)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.stop_event = threading.Event()
+        self._wake = threading.Event()
+        self._active = 0
+        self._lock = threading.Lock()
+        self.stats = {'completed': 0, 'failed': 0, 'requeued': 0}
+
+    def run(self):
+        """Claim and run executions until stop() is called"""
+        print(f"Worker {self.worker_id} started with {self.concurrency} slots")
+        heartbeat_stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(heartbeat_stop,), name='worker-heartbeat', daemon=True)
+        heartbeat.start()
+
+        last_sweep = 0.0
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='worker') as pool:
+                while not self.stop_event.is_set():
+                    if time.monotonic() - last_sweep >= app_config.WORKER_HEARTBEAT_INTERVAL:
+                        last_sweep = time.monotonic()
+                        self._requeue_stale()
+
+                    entry = self._claim() if self._free_slots() else None
+                    if entry:
+                        with self._lock:
+                            self._active += 1
+                        pool.submit(self._execute, entry)
+                        continue # Claim more while slots are free
+
+                    # Woken early when a slot frees up or stop() is called
+                    self._wake.wait(app_config.WORKER_POLL_INTERVAL)
+                    self._wake.clear()
+                # Leaving the block waits for running executions
+        finally:
+            heartbeat_stop.set()
+            heartbeat.join()
+            print(f"Worker {self.worker_id} stopped: {self.stats}")
+
+    def stop(self):
+        """Stop claiming; run() returns once the running executions have finished"""
+        self.stop_event.set()
+        self._wake.set()
+
+    def _free_slots(self) -> int:
+        with self._lock:
+            return self.concurrency - self._active
+
+    def _claim(self) -> Optional[Dict[str, Any]]:
+        try:
+            return self.queue.claim(self.worker_id)
+        except Exception as e:
+            print(f"Worker {self.worker_id} failed to claim from the queue: {e}")
+            return None
+
+    def _execute(self, entry):
+        execution_id = entry['id']
+        print(f"Worker {self.worker_id} running execution {execution_id} (job {entry['job_id']}, attempt {entry['attempts']})")
+        outcome = 'failed'
+        try:
+            if entry['trigger_type'] == 'ORCHESTRATION':
+                result = self.execution_service.execute_dag(entry['job_id'], execution_id=execution_id)
+            else:
+                result = self.execution_service.execute_job(
+                    entry['job_id'], entry['trigger_type'] or 'MANUAL',
+                    replay_of=entry['replay_of'], execution_id=execution_id,
+                    parent_execution_id=entry['parent_execution_id'], job_stack=entry['job_stack']
+                )
+            if result['status'] == 'success':
+                outcome = 'completed'
+        except Exception as e:
+            print(f"Worker {self.worker_id} failed execution {execution_id}: {e}")
+        finally:
+            try:
+                self.queue.complete(execution_id, self.worker_id)
+            except Exception as e:
+                print(f"Worker {self.worker_id} failed to release execution {execution_id}: {e}")
+            with self._lock:
+                self._active -= 1
+                self.stats[outcome] += 1
+            self._wake.set()
+
+    def _heartbeat(self, stop_event):
+        while not stop_event.wait(app_config.WORKER_HEARTBEAT_INTERVAL):
+            try:
+                owned = self.queue.heartbeat(self.worker_id)
+                with self._lock:
+                    active = self._active
+                if owned < active:
+                    print(f"Worker {self.worker_id} lost {active - owned} claims (requeued after a missed heartbeat)")
+            except Exception as e:
+                print(f"Worker {self.worker_id} heartbeat failed: {e}")
+
+    def _requeue_stale(self):
+        try:
+            counts = self.queue.requeue_stale(app_config.WORKER_HEARTBEAT_TIMEOUT, app_config.QUEUE_MAX_ATTEMPTS)
+        except Exception as e:
+            print(f"Worker {self.worker_id} failed to requeue stale executions: {e}")
+            return
+        if counts['requeued'] or counts['failed']:
+            self.stats['requeued'] += counts['requeued']
+            print(f"Worker {self.worker_id} requeued {counts['requeued']} and failed {counts['failed']} executions of unresponsive workers")
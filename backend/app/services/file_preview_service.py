@@ -4,53 +4,43 @@ from app.connectors.files.excel_connector import ExcelConnector
 from app.connectors.files.csv_connector import CSVConnector
 from app.connectors.files.excel_connector import ExcelConnector
 from app.connectors.files.parquet_connector import ParquetConnector
-from app.services.connection_service import ConnectionService
+from app.connectors.files.arrow_connector import ArrowConnector
+from app.services.connection_service import connection_service
 from app.services.file_system_service import FileSystemService
 from app.utils.db import get_db_path
+from app.utils.cache import TTLCache, make_cache_key
+from config.settings import config as app_config
+
+# Rows returned to the UI and rows sampled for type inference
+PREVIEW_ROWS = 5
+INFERENCE_SAMPLE_SIZE = 100
 
 class FilePreviewService:
     """Service for previewing files and inferring schema."""
 
     def __init__(self):
         db_path = get_db_path()
-        self.connection_service = ConnectionService(db_path)
+        self.connection_service = connection_service
         self.file_system_service = FileSystemService()
         self.db_path = db_path
+        self.preview_cache = TTLCache(app_config.PREVIEW_CACHE_SIZE, app_config.PREVIEW_CACHE_TTL)
     
-    def preview_file(self, file_path, file_type, config):
+    def preview_file(self, file_path, file_type, config, refresh=False):
         """
         Preview a file and return sample data with inferred schema.
         
         Args:
             file_path: Path to the file
-            file_type: Type of file (delimited, excel, parquet)
+            file_type: Type of file (delimited, excel, parquet, arrow)
             config: Configuration for reading the file
+            refresh: Bypass the preview cache and read the file again
             
         Returns:
-            dict with 'data' (list of rows) and 'schema' (list of column definitions)
+            dict with 'data' (list of rows), 'schema' (list of column definitions),
+            'totalRows' and 'totalRowsExact' (False when the count is estimated)
         """
-        connection_id = config.get('connectionId')
-        fs = None
-
-        if connection_id and connection_id != 'local':
-            from app.utils.password_resolver import PasswordResolver
-            resolver = PasswordResolver(self.db_path)
-            
-            # TODO: Need workspaceId to resolve secrets correctly. 
-            # For now, preview typically happens in context of editing a workspace job, 
-            # but config might not have workspaceId. 
-            # Ideally config should come with workspaceId. 
-            # Assuming basic resolution for now or that config has enough info?
-            # Actually, the API route probably knows the workspace.
-            # But let's try to get connection first.
-            conn_config = self.connection_service.get_connection(connection_id)
-            if conn_config:
-                 # Try to find workspace ID from connection if possible, or pass it in config
-                 # Resolver needs workspace_id for context vars.
-                 # If we don't have it, some vars might fail.
-                 workspace_id = config.get('workspaceId') or conn_config.get('workspace_id')
-                 conn_config = resolver.resolve_connection_config(conn_config, workspace_id)
-                 fs = self.file_system_service.get_filesystem(conn_config)
+        # Saved connections are looked up in the workspace the preview was requested from
+        fs, _ = self.file_system_service.get_connection_filesystem(config.get('workspaceId'), config.get('connectionId'))
 
         # Check if file exists
         if fs:
@@ -60,32 +50,105 @@ class FilePreviewService:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"File not found: {file_path}")
         
-        # Read data based on file type
+        # The fingerprint changes whenever the file does, so stale entries are never served
+        cache_key = make_cache_key(file_path, file_type, config, self.file_system_service.fingerprint(file_path, fs))
+        if not refresh:
+            cached = self.preview_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        result = self._read_preview(fs, file_path, file_type, config)
+        self.preview_cache.set(cache_key, result)
+        return result
+    
+    def _read_preview(self, fs, file_path, file_type, config):
+        """Read the head of a file and build the preview result."""
+        limit = int(config.get('previewRows') or PREVIEW_ROWS)
+        # Read enough rows for both the preview and a type-inference sample
+        head_size = max(limit, INFERENCE_SAMPLE_SIZE)
+        read_config = {**config, 'filePath': file_path}
+        
+        # Read only the head of the file; the row count comes from metadata where possible
         data = []
+        arrow_schema = None
+        total_rows = None
+        exact = False
         if file_type == 'delimited':
             connector = CSVConnector()
-            data = connector.read(config, fs=fs)
+            data = connector.read_head(read_config, head_size, fs=fs)
+            if len(data) < head_size:
+                total_rows, exact = len(data), True
+            elif fs is None:
+                total_rows, exact = connector.count_rows(read_config), True
+            else:
+                total_rows = self._estimate_rows(fs, file_path, data, config.get('delimiter', ','))
         elif file_type == 'excel':
             connector = ExcelConnector()
-            data = connector.read(config, fs=fs)
+            data = connector.read_head(read_config, head_size, fs=fs)
+            if len(data) < head_size:
+                total_rows, exact = len(data), True
+            else:
+                total_rows = connector.estimate_rows(read_config, fs=fs)
         elif file_type == 'parquet':
             connector = ParquetConnector()
-            data = connector.read(config, fs=fs)
+            data, metadata = connector.read_head(read_config, head_size, fs=fs)
+            total_rows, exact = metadata['numRows'], True
+            arrow_schema = metadata['schema']
+        elif file_type == 'arrow':
+            connector = ArrowConnector()
+            data = connector.read_head(read_config, head_size, fs=fs)
+            metadata = connector.read_metadata(read_config, fs=fs)
+            arrow_schema = metadata['schema']
+            if metadata['numRows'] is not None:
+                total_rows, exact = metadata['numRows'], True
+            elif len(data) < head_size:
+                total_rows, exact = len(data), True
         else:
             raise ValueError(f"Unsupported file type: {file_type}")
         
-        # Get sample data (first 5 rows)
-        sample_data = data[:5] if len(data) > 5 else data
-        
-        # Infer schema from data
-        schema = self._infer_schema(data)
+        # Typed formats carry their own schema; text formats are inferred from the sample
+        if arrow_schema is not None:
+            schema = self._schema_from_arrow(arrow_schema, config.get('columns'))
+        else:
+            schema = self._infer_schema(data)
         
         return {
-            'data': sample_data,
+            'data': data[:limit],
             'schema': schema,
-            'totalRows': len(data)
+            'totalRows': total_rows,
+            'totalRowsExact': exact
         }
     
+    def _estimate_rows(self, fs, file_path, sample, delimiter):
+        """Estimate the row count of a remote text file from its size and the sample's average row width."""
+        try:
+            size = fs.size(file_path)
+        except Exception:
+            return None
+        if not size or not sample:
+            return None
+        sample_bytes = sum(len(delimiter.join(str(v) for v in row.values()).encode('utf-8')) + 1 for row in sample)
+        return int(size * len(sample) / max(sample_bytes, 1))
+    
+    def _schema_from_arrow(self, arrow_schema, columns=None):
+        """Map an Arrow schema to preview column definitions."""
+        import pyarrow.types as pat
+        
+        schema = []
+        for field in arrow_schema:
+            if columns and field.name not in columns:
+                continue
+            if pat.is_boolean(field.type):
+                column_type = 'boolean'
+            elif pat.is_integer(field.type):
+                column_type = 'integer'
+            elif pat.is_floating(field.type) or pat.is_decimal(field.type):
+                column_type = 'number'
+            else:
+                column_type = 'string'
+            schema.append({'name': field.name, 'type': column_type})
+        return schema
+    
     def _infer_schema(self, data):
         """
         Infer schema from data.
@@ -124,7 +187,7 @@ class FilePreviewService:
             Inferred type as string
         """
         # Sample multiple values for better inference
-        sample_values = [row.get(column_name) for row in data[:100] if row.get(column_name) is not None]
+        sample_values = [row.get(column_name) for row in data[:INFERENCE_SAMPLE_SIZE] if row.get(column_name) is not None]
         
         if not sample_values:
             return 'string'
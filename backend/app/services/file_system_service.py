@@ -1,19 +1,236 @@
 import fsspec
+import glob
+import hashlib
+import json
 import os
+import threading
+import time
+from config.settings import config
+
+REMOTE_METHODS = ('ssh', 'sftp', 's3', 'hdfs')
+CACHE_MODES = ('blockcache', 'filecache')
+
+# Connection fields that identify a distinct filesystem instance
+POOL_KEY_FIELDS = (
+    'connectionMethod', 'host', 'port', 'username', 'password',
+    'accessKey', 'secretKey', 'region', 'endpoint', 'cacheMode', 'cacheExpiry'
+)
+
+# How often idle pool entries and the cache directory size are checked
+SWEEP_INTERVAL = 60
+
+
+class FileSystemPool:
+    """
+    Process-wide pool of remote filesystem instances.
+
+    Entries are keyed by a hash of the resolved connection config, so every node and run
+    using the same connection shares one SFTP session / S3 client. Entries are health
+    checked before reuse and closed once idle for longer than FS_POOL_IDLE_TIMEOUT.
+    """
+
+    def __init__(self, idle_timeout=None, cache_dir=None, cache_max_bytes=None):
+        self.idle_timeout = idle_timeout if idle_timeout is not None else config.FS_POOL_IDLE_TIMEOUT
+        self.cache_dir = cache_dir or config.FS_CACHE_DIR
+        self.cache_max_bytes = cache_max_bytes if cache_max_bytes is not None else config.FS_CACHE_MAX_BYTES
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._last_sweep = 0
+
+    def _make_key(self, connection_config):
+        fields = {k: connection_config.get(k) for k in POOL_KEY_FIELDS if connection_config.get(k) is not None}
+        # Hash the config so credentials are never kept as dictionary keys
+        return hashlib.sha256(json.dumps(fields, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, connection_config, factory):
+        """
+        Return a pooled filesystem for the connection, creating it with factory() if needed.
+        """
+        key = self._make_key(connection_config)
+        self._sweep()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and not self._is_healthy(connection_config, entry['fs']):
+                self._entries.pop(key)
+                self._close(entry['fs'])
+                entry = None
+            if entry is not None:
+                entry['last_used'] = time.time()
+                return entry['fs']
+
+        # Connect outside the lock so a slow host doesn't block other connections
+        fs = self._wrap_cache(connection_config, factory(), key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                # Another thread connected first; keep its instance
+                self._close(fs)
+            else:
+                entry = {'fs': fs, 'created': time.time()}
+                self._entries[key] = entry
+            entry['last_used'] = time.time()
+            return entry['fs']
+
+    def _wrap_cache(self, connection_config, fs, key):
+        """Wrap the filesystem in an fsspec read-through cache if the connection asks for one."""
+        cache_mode = connection_config.get('cacheMode', 'none')
+        if cache_mode not in CACHE_MODES:
+            return fs
+
+        storage = os.path.join(self.cache_dir, key[:16])
+        os.makedirs(storage, exist_ok=True)
+        return fsspec.filesystem(
+            cache_mode,
+            fs=fs,
+            cache_storage=storage,
+            # Compare remote checksums/mtimes so updated objects are fetched again
+            check_files=True,
+            expiry_time=int(connection_config.get('cacheExpiry') or 24 * 3600),
+            skip_instance_cache=True
+        )
+
+    def _is_healthy(self, connection_config, fs):
+        """Cheap liveness check; only stateful (SFTP) sessions can go stale."""
+        method = connection_config.get('connectionMethod')
+        if method not in ('ssh', 'sftp'):
+            return True
+        target = getattr(fs, 'fs', fs)
+        try:
+            transport = target.client.get_transport()
+            return transport is not None and transport.is_active()
+        except Exception:
+            return False
+
+    def _close(self, fs):
+        target = getattr(fs, 'fs', fs)
+        client = getattr(target, 'client', None)
+        try:
+            if client is not None and hasattr(client, 'close'):
+                client.close()
+        except Exception as e:
+            print(f"Failed to close pooled filesystem: {e}")
+
+    def _sweep(self):
+        """Evict idle entries and prune the cache directory, at most once per SWEEP_INTERVAL."""
+        now = time.time()
+        if now - self._last_sweep < SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+
+        with self._lock:
+            expired = [k for k, e in self._entries.items() if now - e['last_used'] > self.idle_timeout]
+            for key in expired:
+                self._close(self._entries.pop(key)['fs'])
+
+        self._prune_cache()
+
+    def _prune_cache(self):
+        """Delete least recently used cache files until the directory fits in FS_CACHE_MAX_BYTES."""
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        files = []
+        total = 0
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                # fsspec keeps its block/file index in 'cache'; it tolerates missing data files
+                if name == 'cache':
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_atime, stat.st_size, path))
+                total += stat.st_size
+
+        if total <= self.cache_max_bytes:
+            return
+
+        for _, size, path in sorted(files):
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+            if total <= self.cache_max_bytes:
+                break
+
+    def stats(self):
+        """Return pool statistics for monitoring."""
+        now = time.time()
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'entries': [
+                    {
+                        'protocol': getattr(e['fs'], 'protocol', None),
+                        'ageSeconds': round(now - e['created'], 1),
+                        'idleSeconds': round(now - e['last_used'], 1)
+                    }
+                    for e in self._entries.values()
+                ]
+            }
+
+    def clear(self):
+        """Close and drop all pooled filesystems."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            self._close(entry['fs'])
+
 
 class FileSystemService:
     """Service to handle filesystem abstraction using fsspec."""
     
-    def get_filesystem(self, connection_config):
+    def get_filesystem(self, connection_config, pooled=True):
         """
         Get an initialized fsspec filesystem object based on connection config.
         
+        Remote filesystems are shared through the process-wide pool unless pooled is False.
+        
         Args:
             connection_config: Dictionary containing connection details
+            pooled: Reuse a pooled instance for the same connection
             
         Returns:
             fsspec.AbstractFileSystem: Initialized filesystem object
         """
+        method = (connection_config or {}).get('connectionMethod', 'native')
+        if pooled and method in REMOTE_METHODS:
+            return filesystem_pool.get(connection_config, lambda: self._create_filesystem(connection_config))
+        return self._create_filesystem(connection_config)
+
+    def get_connection_filesystem(self, workspace_id, connection_id):
+        """
+        Resolve a saved connection and return its (pooled) filesystem.
+        
+        Args:
+            workspace_id: Workspace the connection belongs to
+            connection_id: Saved connection ID ('local' or empty for the local filesystem)
+            
+        Returns:
+            Tuple of (filesystem or None for local, resolved connection config or None)
+        """
+        if not connection_id or connection_id == 'local':
+            return None, None
+        
+        from app.services.connection_service import connection_service
+        from app.utils.context_variables import load_context_variables
+        from app.utils.password_resolver import PasswordResolver
+        
+        conn_config = connection_service.get_connection(workspace_id, connection_id) if workspace_id else None
+        if not conn_config:
+            raise Exception(f'Connection not found: {connection_id}')
+        
+        resolver = PasswordResolver(load_context_variables(workspace_id))
+        conn_config = resolver.resolve_connection_config(conn_config)
+        return self.get_filesystem(conn_config), conn_config
+
+    def _create_filesystem(self, connection_config):
+        """Create a new fsspec filesystem, bypassing fsspec's own instance cache."""
         if not connection_config:
             # Default to local filesystem
             return fsspec.filesystem('file')
@@ -41,8 +258,9 @@ class FileSystemService:
                 host=connection_config.get('host'),
                 port=int(connection_config.get('port', 22)),
                 username=connection_config.get('username'),
-                password=connection_config.get('password')
+                password=connection_config.get('password'),
                 # TODO: Support SSH keys via 'key_filename' or 'pkey'
+                skip_instance_cache=True
             )
             
         elif method == 's3':
@@ -62,7 +280,7 @@ class FileSystemService:
             if endpoint:
                 s3_kwargs['endpoint_url'] = endpoint
             
-            return fsspec.filesystem('s3', **s3_kwargs)
+            return fsspec.filesystem('s3', skip_instance_cache=True, **s3_kwargs)
             
         elif method == 'hdfs':
             # HDFS Connection
@@ -71,7 +289,8 @@ class FileSystemService:
                 'hdfs',
                 host=connection_config.get('host'),
                 port=int(connection_config.get('port', 8020)),
-                user=connection_config.get('username')
+                user=connection_config.get('username'),
+                skip_instance_cache=True
             )
             
         else:
@@ -93,12 +312,52 @@ class FileSystemService:
         fs = self.get_filesystem(connection_config)
         return fs.open(file_path, mode)
 
+    def fingerprint(self, file_path, fs=None):
+        """
+        Return values identifying the current version of a file.
+        
+        Local files use mtime/size; remote files use whatever the backend reports
+        (ETag and LastModified for object stores, mtime and size otherwise).
+        """
+        if fs is None:
+            stat = os.stat(file_path)
+            return [stat.st_mtime_ns, stat.st_size]
+        info = fs.info(file_path)
+        return [info.get(k) for k in ('ETag', 'etag', 'LastModified', 'mtime', 'size')]
+
+    def list_files(self, path, fs=None, pattern='*'):
+        """
+        Expand a directory or glob path into a sorted list of file paths.
+        
+        Args:
+            path: Directory, glob pattern (containing *, ? or [) or single file path
+            fs: Filesystem for remote paths, None for local
+            pattern: Glob applied to the entries of a directory
+            
+        Returns:
+            List of file paths, or None if path is a single file
+        """
+        is_glob = any(c in path for c in '*?[')
+        if fs is None:
+            if not is_glob:
+                if not os.path.isdir(path):
+                    return None
+                path = os.path.join(path, pattern)
+            return sorted(p for p in glob.glob(path) if os.path.isfile(p))
+        
+        if not is_glob:
+            if not fs.isdir(path):
+                return None
+            path = path.rstrip('/') + '/' + pattern
+        return sorted(p for p in fs.glob(path) if fs.isfile(p))
+
     def test_connection(self, connection_config):
         """
         Test validity of a filesystem connection.
         """
         try:
-            fs = self.get_filesystem(connection_config)
+            # Always open a fresh connection so the test reflects the current settings
+            fs = self.get_filesystem(connection_config, pooled=False)
             
             # Perform a lightweight operation to verify connectivity
             method = connection_config.get('connectionMethod')
@@ -120,3 +379,6 @@ class FileSystemService:
             return {'success': True, 'message': 'Connection successful'}
         except Exception as e:
             return {'success': False, 'message': f'Connection failed: {str(e)}'}
+
+# Global instance
+filesystem_pool = FileSystemPool()
@@ -2,8 +2,15 @@
 JDBC Manager
 Handles JDBC connections via JayDeBeApi with support for custom JARs and Kerberos
 """
+import glob
 import os
-from typing import Dict, Any, List, Optional
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Iterator
+from app.utils.cache import make_cache_key
+from config.settings import config as app_config
 
 # Try to import JayDeBeApi
 try:
@@ -14,6 +21,131 @@ except ImportError:
     print("Warning: JayDeBeApi not installed. JDBC connections will not work.")
     print("Install with: pip install JayDeBeApi JPype1")
 
+# Optional: bulk ResultSet -> Arrow conversion (also needs the arrow-jdbc JARs, see JDBCManager)
+try:
+    from pyarrow import jvm as pa_jvm
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+DEFAULT_FETCH_SIZE = 10000
+
+# Idle connections are validated with Connection.isValid() before reuse once idle this long
+VALIDATION_INTERVAL = 30
+
+# How often idle connections are checked for eviction
+SWEEP_INTERVAL = 60
+
+class JDBCConnectionPool:
+    """
+    Pool of open JayDeBeApi connections for one driver, URL and user.
+
+    Connections are reused most-recently-used first, validated before reuse after sitting
+    idle, and closed once idle for longer than the idle timeout. At most max_size
+    connections are open (in use or idle) at a time.
+    """
+
+    def __init__(self, connect_fn, max_size: int, timeout: int, idle_timeout: int, validation_timeout: int,
+                 driver: Optional[str] = None, url: Optional[str] = None):
+        self._connect = connect_fn
+        self.driver = driver
+        self.url = url
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.validation_timeout = validation_timeout
+        self._idle = []  # (connection, last_used), most recently used last
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.created = 0
+        self.discarded = 0
+        self.last_used = time.time()
+
+    def acquire(self):
+        """Check out a validated connection, opening a new one if none is idle"""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise Exception(f"Timed out after {self.timeout}s waiting for a JDBC connection")
+        try:
+            conn = None
+            while conn is None:
+                with self._lock:
+                    entry = self._idle.pop() if self._idle else None
+                if entry is None:
+                    break
+                candidate, idle_since = entry
+                if time.time() - idle_since < VALIDATION_INTERVAL or self._is_valid(candidate):
+                    conn = candidate
+                else:
+                    self._close(candidate)
+            
+            if conn is None:
+                conn = self._connect()
+                self.created += 1
+            
+            with self._lock:
+                self.in_use += 1
+                self.last_used = time.time()
+            return conn
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn, discard: bool = False):
+        """Return a connection to the pool, or close it if it may be broken"""
+        try:
+            if discard:
+                self._close(conn)
+            else:
+                with self._lock:
+                    self._idle.append((conn, time.time()))
+        finally:
+            with self._lock:
+                self.in_use -= 1
+                self.last_used = time.time()
+            self._slots.release()
+
+    def _is_valid(self, conn) -> bool:
+        try:
+            return bool(conn.jconn.isValid(self.validation_timeout))
+        except Exception:
+            return False
+
+    def _close(self, conn):
+        self.discarded += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def prune(self) -> int:
+        """Close connections idle for longer than the idle timeout, returning how many were closed"""
+        now = time.time()
+        with self._lock:
+            expired = [entry for entry in self._idle if now - entry[1] > self.idle_timeout]
+            self._idle = [entry for entry in self._idle if now - entry[1] <= self.idle_timeout]
+        for conn, _ in expired:
+            self._close(conn)
+        return len(expired)
+
+    def close(self):
+        """Close all idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'maxSize': self.max_size,
+                'idle': len(self._idle),
+                'inUse': self.in_use,
+                'created': self.created,
+                'discarded': self.discarded,
+                'idleSeconds': round(time.time() - self.last_used, 1)
+            }
+
 class JDBCManager:
     """Manages JDBC connections using JayDeBeApi"""
     
@@ -36,7 +168,12 @@ class JDBCManager:
         # Create directory if it doesn't exist
         os.makedirs(self.jdbc_drivers_dir, exist_ok=True)
         
-        self.connections = {}
+        # Connection pools keyed by driver, URL, user and JAR
+        self.pools = {}
+        self._lock = threading.Lock()
+        self._last_sweep = 0
+        self._kerberos_env = None
+        self._arrow_available = None
     
     def get_jar_path(self, jar_filename: str) -> str:
         """
@@ -57,9 +194,15 @@ class JDBCManager:
         Args:
             config: Configuration with Kerberos settings
         """
-        if not config.get('useKerberos'):
+        if not (config.get('useKerberos') or config.get('authType') == 'kerberos'):
             return
         
+        # The JVM reads these once at startup, so only set them when they change
+        kerberos_env = (config.get('jaasConfig'), config.get('kerberosPrincipal'), config.get('kerberosKeytab'))
+        if kerberos_env == self._kerberos_env:
+            return
+        self._kerberos_env = kerberos_env
+        
         # Set JAAS config if provided
         if config.get('jaasConfig'):
             os.environ['JAVA_TOOL_OPTIONS'] = f"-Djava.security.auth.login.config={config['jaasConfig']}"
@@ -71,6 +214,22 @@ class JDBCManager:
         if config.get('kerberosKeytab'):
             os.environ['KRB5_KTNAME'] = config['kerberosKeytab']
     
+    def _resolve_jar_path(self, config: Dict[str, Any]) -> str:
+        jar_path = config.get('jdbcJarPath', '')
+        if not os.path.isabs(jar_path):
+            # Relative path - look in jdbc_drivers directory
+            jar_path = self.get_jar_path(jar_path)
+        return jar_path
+    
+    def _classpath(self, jar_path: str) -> List[str]:
+        """
+        Driver JAR plus any JARs in jdbc_drivers/arrow/.
+        
+        The JVM classpath is fixed when the first connection starts the JVM, so the
+        arrow-jdbc adapter and its dependencies are always added when present.
+        """
+        return [jar_path] + sorted(glob.glob(os.path.join(self.jdbc_drivers_dir, 'arrow', '*.jar')))
+    
     def connect(self, config: Dict[str, Any]):
         """
         Create JDBC connection
@@ -94,10 +253,7 @@ class JDBCManager:
         self.setup_kerberos(config)
         
         # Get JAR path
-        jar_path = config.get('jdbcJarPath', '')
-        if not os.path.isabs(jar_path):
-            # Relative path - look in jdbc_drivers directory
-            jar_path = self.get_jar_path(jar_path)
+        jar_path = self._resolve_jar_path(config)
         
         if not os.path.exists(jar_path):
             raise FileNotFoundError(f"JDBC driver JAR not found: {jar_path}")
@@ -114,18 +270,81 @@ class JDBCManager:
                 driver_class,
                 jdbc_url,
                 [username, password],
-                jar_path
+                self._classpath(jar_path)
             )
         else:
             # No credentials (e.g., Kerberos auth)
             conn = jaydebeapi.connect(
                 driver_class,
                 jdbc_url,
-                jars=jar_path
+                jars=self._classpath(jar_path)
             )
         
         return conn
     
+    def get_pool(self, config: Dict[str, Any]) -> JDBCConnectionPool:
+        """
+        Get the connection pool for a configuration, creating it on first use
+        
+        Args:
+            config: Connection configuration (optional poolSize/poolTimeout overrides)
+            
+        Returns:
+            JDBCConnectionPool
+        """
+        # Credentials are part of the (hashed) key so a changed password gets fresh connections
+        key = make_cache_key(
+            config.get('jdbcDriver'), config.get('jdbcUrl'), config.get('username'),
+            config.get('password'), self._resolve_jar_path(config)
+        )
+        self._sweep()
+        
+        with self._lock:
+            pool = self.pools.get(key)
+            if pool is None:
+                pool = JDBCConnectionPool(
+                    lambda: self.connect(config),
+                    max_size=int(config.get('poolSize') or app_config.JDBC_POOL_SIZE),
+                    timeout=int(config.get('poolTimeout') or app_config.JDBC_POOL_TIMEOUT),
+                    idle_timeout=app_config.JDBC_POOL_IDLE_TIMEOUT,
+                    validation_timeout=app_config.JDBC_VALIDATION_TIMEOUT,
+                    driver=config.get('jdbcDriver'),
+                    # URLs may embed credentials as properties
+                    url=re.sub(r'(?i)(password=)[^;&]*', r'\1***', config.get('jdbcUrl') or '')
+                )
+                self.pools[key] = pool
+            return pool
+    
+    @contextmanager
+    def connection(self, config: Dict[str, Any]):
+        """
+        Borrow a pooled connection
+        
+        The connection is returned to the pool afterwards, or closed if an error was raised
+        while it was in use.
+        """
+        pool = self.get_pool(config)
+        conn = pool.acquire()
+        discard = False
+        try:
+            yield conn
+        except Exception:
+            discard = True
+            raise
+        finally:
+            pool.release(conn, discard)
+    
+    def _sweep(self):
+        """Close idle connections past the idle timeout, at most once per SWEEP_INTERVAL"""
+        now = time.time()
+        if now - self._last_sweep < SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        with self._lock:
+            pools = list(self.pools.values())
+        for pool in pools:
+            pool.prune()
+    
     def execute_query(self, config: Dict[str, Any], query: str) -> tuple:
         """
         Execute query and return results
@@ -137,26 +356,122 @@ class JDBCManager:
         Returns:
             Tuple of (columns, rows)
         """
-        conn = self.connect(config)
+        with self.connection(config) as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(query)
         
-        try:
+                # Get column names
+                columns = [desc[0] for desc in cursor.description]
+                
+                # Fetch all rows
+                rows = cursor.fetchall()
+                
+                return columns, rows
+            finally:
+                cursor.close()
+    
+    def iter_query_batches(self, config: Dict[str, Any], query: str, fetch_size: int = DEFAULT_FETCH_SIZE,
+                           params: Optional[list] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Run a query on a pooled connection, yielding lists of records of up to fetch_size rows
+        
+        Rows are read with fetchmany() so only one batch is held in Python at a time. With
+        config 'arrowFetch', each batch is converted from the ResultSet to Arrow inside the
+        JVM (arrow-jdbc) instead of value by value through JPype.
+        
+        Args:
+            config: Connection configuration
+            query: SQL query (qmark '?' placeholders for params)
+            fetch_size: Rows per batch, also passed to the driver as the fetch size hint
+            params: Optional positional query parameters
+        """
+        with self.connection(config) as conn:
             cursor = conn.cursor()
-            cursor.execute(query)
-            
-            # Get column names
-            columns = [desc[0] for desc in cursor.description]
-            
-            # Fetch all rows
-            rows = cursor.fetchall()
+            try:
+                cursor.execute(query, params)
+                columns = [desc[0] for desc in cursor.description]
+                try:
+                    # Rows per network round trip; drivers default to as few as 10-1000
+                    cursor._rs.setFetchSize(fetch_size)
+                except Exception:
+                    pass
+                
+                if config.get('arrowFetch') and self.arrow_available():
+                    yield from self._iter_arrow_batches(cursor, fetch_size)
+                    return
+                
+                while True:
+                    rows = cursor.fetchmany(fetch_size)
+                    if not rows:
+                        break
+                    yield [dict(zip(columns, row)) for row in rows]
+            finally:
+                cursor.close()
+    
+    def arrow_available(self) -> bool:
+        """Whether the arrow-jdbc adapter is on the JVM classpath and pyarrow is installed"""
+        if self._arrow_available is None:
+            if not HAS_PYARROW:
+                self._arrow_available = False
+            else:
+                try:
+                    import jpype
+                    jpype.JClass('org.apache.arrow.adapter.jdbc.JdbcToArrow')
+                    self._arrow_available = True
+                except Exception:
+                    print("Warning: arrow-jdbc not found in jdbc_drivers/arrow/, falling back to fetchmany()")
+                    self._arrow_available = False
+        return self._arrow_available
+    
+    def _iter_arrow_batches(self, cursor, fetch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Convert the cursor's ResultSet to Arrow record batches of fetch_size rows inside the JVM"""
+        import jpype
+        JdbcToArrow = jpype.JClass('org.apache.arrow.adapter.jdbc.JdbcToArrow')
+        JdbcToArrowConfigBuilder = jpype.JClass('org.apache.arrow.adapter.jdbc.JdbcToArrowConfigBuilder')
+        JdbcToArrowUtils = jpype.JClass('org.apache.arrow.adapter.jdbc.JdbcToArrowUtils')
+        RootAllocator = jpype.JClass('org.apache.arrow.memory.RootAllocator')
+        
+        allocator = RootAllocator()
+        arrow_config = (
+            JdbcToArrowConfigBuilder(allocator, JdbcToArrowUtils.getUtcCalendar())
+            .setTargetBatchSize(fetch_size)
+            .build()
+        )
+        iterator = JdbcToArrow.sqlToArrowVectorIterator(cursor._rs, arrow_config)
+        try:
+            while iterator.hasNext():
+                root = iterator.next()
+                try:
+                    # Buffers are read in place from JVM memory; only to_pylist() copies
+                    yield pa_jvm.record_batch(root).to_pylist()
+                finally:
+                    root.close()
+        finally:
+            iterator.close()
+            allocator.close()
             
-            cursor.close()
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Pool statistics for monitoring
             
-            return columns, rows
+        Returns:
+            List of per-pool dictionaries (driver, URL, idle/in-use/created/discarded counts)
+        """
+        with self._lock:
+            pools = list(self.pools.values())
+        return [{'driver': pool.driver, 'url': pool.url, **pool.stats()} for pool in pools]
             
-        finally:
-            conn.close()
+    def close_all(self):
+        """Close every idle pooled connection and forget the pools"""
+        with self._lock:
+            pools = list(self.pools.values())
+            self.pools.clear()
+        for pool in pools:
+            pool.close()
     
-    def preview_query(self, config: Dict[str, Any], query: str, limit: int = 5) -> Dict[str, Any]:
+    def preview_query(self, config: Dict[str, Any], query: str, limit: int = 5, register_cancel=None,
+                      is_cancelled=None) -> Dict[str, Any]:
         """
         Execute query and return preview data with schema
         
@@ -164,18 +479,42 @@ class JDBCManager:
             config: Connection configuration
             query: SQL query
             limit: Number of rows to return
+            register_cancel: Optional callback given a function that cancels the running statement
+            is_cancelled: Optional function telling whether the preview was cancelled (not retried then)
             
         Returns:
             Dictionary with data, schema, and totalRows
         """
         from app.services.query_dialect import QueryDialect
         
-        # Apply limit to query
+        # Row-limited query, then the query as written if the database refuses the wrapper
         db_type = config.get('dbType', 'jdbc')
-        limited_query = QueryDialect.apply_limit(query, db_type, limit)
+        candidates = QueryDialect.preview_queries(query, db_type, limit)
         
         # Execute query
-        columns, rows = self.execute_query(config, limited_query)
+        with self.connection(config) as conn:
+            cursor = conn.cursor()
+            if register_cancel:
+                # The PreparedStatement exists once execute() starts, so Statement.cancel()
+                # can be called from another thread while the query is still running
+                register_cancel(lambda: cursor._prep is not None and cursor._prep.cancel())
+            try:
+                for attempt, candidate in enumerate(candidates):
+                    try:
+                        cursor.execute(candidate)
+                        break
+                    except Exception:
+                        if (is_cancelled and is_cancelled()) or attempt == len(candidates) - 1:
+                            raise
+                        try:
+                            conn.rollback()
+                        except Exception:
+                            pass # Autocommit connections have no transaction to roll back
+                columns = [desc[0] for desc in cursor.description]
+                # fetchmany so a query the limit could not be applied to stops after limit rows
+                rows = cursor.fetchmany(limit)
+            finally:
+                cursor.close()
         
         # Convert to list of dicts
         data = []
@@ -28,6 +28,7 @@ class JobService:
         # Don't delete dependencies key, just reassign
         
         job['workspaceId'] = job.pop('workspace_id')
+        job['maxConcurrentRuns'] = job.pop('max_concurrent_runs', None) or 1
         job['createdAt'] = job.pop('created_at')
         job['updatedAt'] = job.pop('updated_at')
         return job
@@ -46,7 +47,7 @@ class JobService:
         """Get job summaries by workspace (excludes canvas_state for performance)."""
         # Select explicit columns, excluding canvas_state
         query = '''
-            SELECT id, workspace_id, name, description, created_at, updated_at, schedule, dependencies
+            SELECT id, workspace_id, name, description, created_at, updated_at, schedule, dependencies, max_concurrent_runs
             FROM jobs 
             WHERE workspace_id = :workspace_id 
             ORDER BY updated_at DESC
@@ -58,6 +59,7 @@ class JobService:
             job = dict(row)
             # Reconstruct minimal object structure expected by frontend list view
             job['workspaceId'] = job.pop('workspace_id')
+            job['maxConcurrentRuns'] = job.pop('max_concurrent_runs') or 1
             job['createdAt'] = job.pop('created_at')
             job['updatedAt'] = job.pop('updated_at')
             
@@ -142,6 +144,11 @@ class JobService:
         else:
              updated_schedule = current['schedule']
         
+        if 'max_concurrent_runs' in kwargs:
+             updated_max_runs = max(int(kwargs['max_concurrent_runs'] or 1), 1)
+        else:
+             updated_max_runs = current.get('max_concurrent_runs') or 1
+        
         # Handle dependencies update
         if 'dependencies' in kwargs:
              updated_dependencies = json.dumps(kwargs['dependencies'])
@@ -152,9 +159,11 @@ class JobService:
         
         self.db.execute('''
             UPDATE jobs
-            SET name = :name, description = :description, canvas_state = :canvas_state, schedule = :schedule, dependencies = :dependencies, updated_at = :updated_at
+            SET name = :name, description = :description, canvas_state = :canvas_state, schedule = :schedule, dependencies = :dependencies,
+                max_concurrent_runs = :max_concurrent_runs, updated_at = :updated_at
             WHERE id = :id
         ''', {
+            'max_concurrent_runs': updated_max_runs,
             'name': updated_name, 
             'description': updated_desc, 
             'canvas_state': updated_canvas, 
@@ -172,11 +181,23 @@ class JobService:
             'description': updated_desc,
             'canvasState': json.loads(updated_canvas) if updated_canvas else {'nodes': [], 'edges': [], 'viewport': {'x': 0, 'y': 0, 'zoom': 1}},
             'schedule': updated_schedule,
+            'maxConcurrentRuns': updated_max_runs,
             'dependencies': json.loads(updated_dependencies) if updated_dependencies else [],
             'createdAt': current['created_at'],
             'updatedAt': now
         }
     
+    def get_scheduled(self):
+        """Get ID, cron expression and concurrency limit of every job with a schedule."""
+        rows = self.db.fetch_all('''
+            SELECT id, schedule, max_concurrent_runs FROM jobs
+            WHERE schedule IS NOT NULL AND schedule != ''
+        ''')
+        return [
+            {'id': row['id'], 'schedule': row['schedule'], 'maxConcurrentRuns': row['max_concurrent_runs'] or 1}
+            for row in rows
+        ]
+    
     def delete(self, job_id):
         """Delete job."""
         cursor = self.db.execute('DELETE FROM jobs WHERE id = :id', {'id': job_id})
@@ -337,6 +358,7 @@ class JobService:
         description = job_data.get('description', '')
         canvas_state = json.dumps(job_data.get('canvasState', {'nodes': [], 'edges': [], 'viewport': {'x': 0, 'y': 0, 'zoom': 1}}))
         schedule = job_data.get('schedule', None)
+        max_concurrent_runs = max(int(job_data.get('maxConcurrentRuns') or 1), 1)
         
         # Handle Dependencies
         dep_names = job_data.get('dependencyNames', [])
@@ -369,7 +391,7 @@ class JobService:
                 UPDATE jobs
                 SET workspace_id = :workspace_id, name = :name, description = :description, 
                     canvas_state = :canvas_state, schedule = :schedule, dependencies = :dependencies, 
-                    updated_at = :updated_at
+                    max_concurrent_runs = :max_concurrent_runs, updated_at = :updated_at
                 WHERE id = :id
             ''', {
                 'workspace_id': workspace_id,
@@ -378,13 +400,14 @@ class JobService:
                 'canvas_state': canvas_state,
                 'schedule': schedule,
                 'dependencies': dependencies_json,
+                'max_concurrent_runs': max_concurrent_runs,
                 'updated_at': now,
                 'id': job_id
             })
         else:
             self.db.execute('''
-                INSERT INTO jobs (id, workspace_id, name, description, canvas_state, created_at, updated_at, schedule, dependencies)
-                VALUES (:id, :workspace_id, :name, :description, :canvas_state, :created_at, :updated_at, :schedule, :dependencies)
+                INSERT INTO jobs (id, workspace_id, name, description, canvas_state, created_at, updated_at, schedule, dependencies, max_concurrent_runs)
+                VALUES (:id, :workspace_id, :name, :description, :canvas_state, :created_at, :updated_at, :schedule, :dependencies, :max_concurrent_runs)
             ''', {
                 'id': job_id, 
                 'workspace_id': workspace_id, 
@@ -394,7 +417,8 @@ class JobService:
                 'created_at': now, 
                 'updated_at': now, 
                 'schedule': schedule, 
-                'dependencies': dependencies_json
+                'dependencies': dependencies_json,
+                'max_concurrent_runs': max_concurrent_runs
             })
         
         return {
@@ -404,6 +428,7 @@ class JobService:
             'description': description,
             'canvasState': json.loads(canvas_state),
             'schedule': schedule,
+            'maxConcurrentRuns': max_concurrent_runs,
             'dependencies': json.loads(dependencies_json),
             'dependencyNames': dep_names,
             'missingDependencies': missing_names, 
@@ -416,8 +441,8 @@ class JobService:
         logs_json = json.dumps(result.get('logs', []))
         
         self.db.execute('''
-            INSERT INTO executions (id, job_id, status, trigger_type, message, logs, start_time, end_time)
-            VALUES (:id, :jobId, :status, :triggerType, :message, :logs, :startTime, :endTime)
+            INSERT INTO executions (id, job_id, status, trigger_type, message, logs, start_time, end_time, parent_execution_id)
+            VALUES (:id, :jobId, :status, :triggerType, :message, :logs, :startTime, :endTime, :parentExecutionId)
         ''', {
             'id': result['id'],
             'jobId': result['jobId'],
@@ -426,6 +451,21 @@ class JobService:
             'message': result.get('message', ''),
             'logs': logs_json,
             'startTime': result['startTime'],
+            'endTime': result.get('endTime'),
+            'parentExecutionId': result.get('parentExecutionId')
+        })
+        
+    def update_execution(self, result):
+        """Update a saved execution (status, message, logs, end time), e.g. a running stream."""
+        self.db.execute('''
+            UPDATE executions
+            SET status = :status, message = :message, logs = :logs, end_time = :endTime
+            WHERE id = :id
+        ''', {
+            'id': result['id'],
+            'status': result['status'],
+            'message': result.get('message', ''),
+            'logs': json.dumps(result.get('logs', [])),
             'endTime': result.get('endTime')
         })
         
@@ -450,6 +490,7 @@ class JobService:
             ex['startTime'] = ex.pop('start_time')
             ex['endTime'] = ex.pop('end_time')
             ex['triggerType'] = ex.pop('trigger_type', 'MANUAL')
+            ex['parentExecutionId'] = ex.pop('parent_execution_id', None)
             executions.append(ex)
             
         return executions
@@ -475,8 +516,32 @@ class JobService:
         ex['startTime'] = ex.pop('start_time')
         ex['endTime'] = ex.pop('end_time')
         ex['triggerType'] = ex.pop('trigger_type', 'MANUAL')
+        ex['parentExecutionId'] = ex.pop('parent_execution_id', None)
         return ex
 
+    def get_child_executions(self, parent_execution_id):
+        """Get executions started by another execution (sub-jobs and orchestrated jobs), without logs."""
+        rows = self.db.fetch_all('''
+            SELECT e.id, e.job_id, e.status, e.trigger_type, e.message, e.start_time, e.end_time, j.name as job_name
+            FROM executions e
+            JOIN jobs j ON e.job_id = j.id
+            WHERE e.parent_execution_id = :parent_id
+            ORDER BY e.start_time
+        ''', {'parent_id': parent_execution_id})
+        return [
+            {
+                'id': row['id'],
+                'jobId': row['job_id'],
+                'jobName': row['job_name'],
+                'status': row['status'],
+                'triggerType': row['trigger_type'],
+                'message': row['message'],
+                'startTime': row['start_time'],
+                'endTime': row['end_time']
+            }
+            for row in rows
+        ]
+
     def get_executions_by_workspace(self, workspace_id, limit=50):
         """Get all executions for a workspace (via jobs)."""
         rows = self.db.fetch_all('''
@@ -501,6 +566,7 @@ class JobService:
             ex['startTime'] = ex.pop('start_time')
             ex['endTime'] = ex.pop('end_time')
             ex['triggerType'] = ex.pop('trigger_type', 'MANUAL')
+            ex['parentExecutionId'] = ex.pop('parent_execution_id', None)
             executions.append(ex)
             
         return executions
@@ -0,0 +1,176 @@
+"""
+Orchestration Service
+Runs a job together with the jobs it depends on, in parallel wherever the dependency graph allows
+"""
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from config.settings import config as app_config
+
+SKIPPED = 'skipped'
+
+class OrchestrationService:
+    """
+    Service for dependency-aware runs of job graphs.
+
+    A job's `dependencies` are the jobs that must succeed before it runs. An orchestration
+    run of a root job expands these transitively, refuses graphs with cycles, and then
+    starts every job as soon as all of its upstream jobs have succeeded, running up to
+    max_parallel jobs at once. Jobs downstream of a failure are skipped.
+
+    The run has one parent execution (trigger type 'ORCHESTRATION', recorded against the
+    root job); the execution of each job in the graph links to it.
+    """
+
+    def __init__(self, execution_service):
+        self.execution_service = execution_service
+        self.job_service = execution_service.job_service
+
+    def resolve(self, job_id: str) -> Tuple[Dict[str, List[str]], Dict[str, str]]:
+        """
+        Expand a job's dependencies transitively
+
+        Returns:
+            The upstream job IDs of every job in the graph, and the job names
+        """
+        graph = {}
+        names = {}
+        pending = [(job_id, None)]
+        while pending:
+            current, required_by = pending.pop()
+            if current in graph:
+                continue
+            job = self.job_service.get_by_id(current)
+            if not job:
+                if required_by:
+                    raise Exception(f"Job {names[required_by]} depends on a job that does not exist: {current}")
+                raise Exception(f"Job not found: {current}")
+            # Duplicates removed, order kept
+            graph[current] = list(dict.fromkeys(job.get('dependencies') or []))
+            names[current] = job['name']
+            pending.extend((upstream, current) for upstream in graph[current])
+        return graph, names
+
+    @staticmethod
+    def find_cycle(graph: Dict[str, List[str]]) -> Optional[List[str]]:
+        """A dependency cycle in the graph as a list of job IDs (first == last), or None"""
+        visiting, done = set(), set()
+        for start in graph:
+            if start in done:
+                continue
+            # Iterative depth-first search; path holds the jobs currently being visited
+            path = [start]
+            stack = [iter(graph[start])]
+            visiting.add(start)
+            while stack:
+                upstream = next(stack[-1], None)
+                if upstream is None:
+                    stack.pop()
+                    finished = path.pop()
+                    visiting.discard(finished)
+                    done.add(finished)
+                elif upstream in visiting:
+                    return path[path.index(upstream):] + [upstream]
+                elif upstream not in done:
+                    visiting.add(upstream)
+                    path.append(upstream)
+                    stack.append(iter(graph.get(upstream, [])))
+        return None
+
+    def run(self, job_id: str, max_parallel: Optional[int] = None, execution_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run a job after the jobs it depends on
+
+        execution_id is given by workers running a queued orchestration, whose record
+        already exists and is updated with the result.
+
+        Returns:
+            The parent execution, with the outcome of every job in its logs
+        """
+        queued = execution_id is not None
+        execution_id = execution_id or str(uuid.uuid4())
+        start_time = datetime.utcnow().isoformat()
+        max_parallel = max(int(max_parallel or app_config.ORCHESTRATION_MAX_PARALLEL), 1)
+        logs = []
+
+        def log(message, level='info', **extra):
+            logs.append({'timestamp': datetime.utcnow().isoformat(), 'level': level, 'message': message, **extra})
+
+        def finish(status, message):
+            return self.execution_service._create_execution_result(
+                execution_id, job_id, status, message, logs, start_time, 'ORCHESTRATION', queued=True
+            )
+
+        if not queued:
+            # Saved up front so child executions can be listed while the run is in progress
+            self.job_service.save_execution({
+                'id': execution_id,
+                'jobId': job_id,
+                'status': 'running',
+                'triggerType': 'ORCHESTRATION',
+                'message': 'Resolving dependencies',
+                'logs': [],
+                'startTime': start_time
+            })
+
+        try:
+            graph, names = self.resolve(job_id)
+            cycle = self.find_cycle(graph)
+            if cycle:
+                raise Exception(f"Dependency cycle: {' -> '.join(names[j] for j in cycle)}")
+        except Exception as e:
+            log(str(e), level='error')
+            return finish('error', str(e))
+
+        log(f"Running {len(graph)} jobs, up to {max_parallel} at a time")
+        status = {}
+        waiting = set(graph)
+
+        with ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix='orchestration') as pool:
+            running = {}
+
+            def schedule():
+                # Start or skip every waiting job whose upstream jobs have all finished
+                changed = True
+                while changed:
+                    changed = False
+                    for jid in sorted(waiting, key=names.get):
+                        upstream = graph[jid]
+                        blocked = [u for u in upstream if status.get(u) in ('error', SKIPPED)]
+                        if blocked:
+                            waiting.discard(jid)
+                            status[jid] = SKIPPED
+                            log(f"Skipped {names[jid]}: upstream job {names[blocked[0]]} did not succeed",
+                                level='warning', jobId=jid)
+                            changed = True
+                        elif all(status.get(u) == 'success' for u in upstream):
+                            waiting.discard(jid)
+                            status[jid] = 'running'
+                            log(f"Started {names[jid]}", jobId=jid)
+                            running[pool.submit(
+                                self.execution_service.execute_job, jid, trigger_type='DEPENDENCY',
+                                parent_execution_id=execution_id
+                            )] = jid
+
+            schedule()
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    jid = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {'id': None, 'status': 'error', 'message': str(e), 'duration': 0}
+                    status[jid] = 'success' if result['status'] == 'success' else 'error'
+                    log(
+                        f"{names[jid]} {'succeeded' if status[jid] == 'success' else 'failed: ' + str(result.get('message'))}"
+                        f" in {result.get('duration', 0):.2f}s",
+                        level='info' if status[jid] == 'success' else 'error',
+                        jobId=jid, executionId=result.get('id')
+                    )
+                schedule()
+
+        counts = {outcome: list(status.values()).count(outcome) for outcome in ('success', 'error', SKIPPED)}
+        message = f"{counts['success']} succeeded, {counts['error']} failed, {counts[SKIPPED]} skipped"
+        return finish('success' if counts['success'] == len(graph) else 'error', message)
@@ -2,14 +2,42 @@
 Query Dialect Handler
 Handles database-specific SQL syntax differences
 """
+import re
+from typing import List
+
+# First keyword after any leading whitespace, comments and opening parentheses
+LEADING_KEYWORD = re.compile(r'^(?:\s+|--[^\n]*(?:\n|$)|/\*.*?\*/|\()*([A-Za-z]+)', re.DOTALL)
 
 class QueryDialect:
     """Handles query transformations for different database dialects"""
     
+    @staticmethod
+    def first_keyword(query: str) -> str:
+        """
+        First SQL keyword of a statement, skipping leading comments and parentheses
+        
+        Args:
+            query: SQL query string
+            
+        Returns:
+            Lower-cased keyword (e.g. 'select', 'with', 'show'), or '' if none
+        """
+        match = LEADING_KEYWORD.match(query)
+        return match.group(1).lower() if match else ''
+    
     @staticmethod
     def apply_limit(query: str, db_type: str, limit: int = 5) -> str:
         """
-        Apply LIMIT clause to query based on database type
+        Limit a query's rows by wrapping it as a derived table
+        
+        Wrapping (rather than appending a clause) works whether or not the query already
+        has its own LIMIT/TOP/FETCH FIRST or ORDER BY, and doesn't depend on keywords that
+        may also appear in identifiers or string literals. Statements that are not queries
+        (SHOW, DESCRIBE, EXPLAIN, ...) are returned unchanged.
+        
+        Some valid queries cannot be wrapped (duplicate or unnamed columns, ORDER BY
+        inside a SQL Server derived table), so callers should use preview_queries and
+        fall back to the query as written.
         
         Args:
             query: SQL query string
@@ -17,36 +45,52 @@ class QueryDialect:
             limit: Number of rows to limit
             
         Returns:
-            Modified query with LIMIT clause
+            Query returning at most `limit` rows
         """
-        query = query.strip().rstrip(';')
-        query_lower = query.lower()
-        
-        # Check if query already has a limit clause
-        if any(keyword in query_lower for keyword in ['limit', 'fetch first', 'top ']):
+        query = query.strip().rstrip(';').strip()
+        keyword = QueryDialect.first_keyword(query)
+        if keyword not in ('select', 'with'):
             return query
         
-        db_type = db_type.lower()
+        limit = int(limit)
+        db_type = (db_type or '').lower()
+        # Newlines keep a trailing -- comment in the query from swallowing the wrapper
+        inner = f"(\n{query}\n)"
         
-        # MySQL, PostgreSQL, SQLite - use LIMIT
-        if db_type in ['mysql', 'postgresql', 'sqlite', 'impala']:
-            return f"{query} LIMIT {limit}"
-        
-        # Oracle - use FETCH FIRST (12c+) or ROWNUM (older)
-        elif db_type == 'oracle':
-            # Try modern syntax first (Oracle 12c+)
-            return f"{query} FETCH FIRST {limit} ROWS ONLY"
+        # Oracle - ROWNUM works on every version and needs no alias
+        if db_type == 'oracle':
+            return f"SELECT * FROM {inner} WHERE ROWNUM <= {limit}"
         
         # SQL Server - use TOP
         elif db_type in ['sqlserver', 'mssql']:
-            # Inject TOP after SELECT
-            if 'select' in query_lower:
-                return query.replace('SELECT', f'SELECT TOP {limit}', 1).replace('select', f'SELECT TOP {limit}', 1)
-            return query
+            # CTEs cannot be nested inside a derived table
+            if keyword == 'with':
+                return query
+            return f"SELECT TOP {limit} * FROM {inner} AS osmosis_preview"
         
-        # Default - try LIMIT (works for most databases)
+        # MySQL, PostgreSQL, SQLite, Impala and most others - use LIMIT
         else:
-            return f"{query} LIMIT {limit}"
+            return f"SELECT * FROM {inner} AS osmosis_preview LIMIT {limit}"
+    
+    @staticmethod
+    def preview_queries(query: str, db_type: str, limit: int = 5) -> List[str]:
+        """
+        Statements to try, in order, for a preview of at most `limit` rows
+        
+        The row-limited form first, then the query as written (for queries the database
+        refuses to wrap); callers cap its rows with fetchmany(limit).
+        
+        Args:
+            query: SQL query string
+            db_type: Database type
+            limit: Number of rows to limit
+            
+        Returns:
+            One or two statements
+        """
+        original = query.strip().rstrip(';').strip()
+        limited = QueryDialect.apply_limit(query, db_type, limit)
+        return [limited] if limited == original else [limited, original]
     
     @staticmethod
     def get_schema_query(db_type: str, table_name: str) -> str:
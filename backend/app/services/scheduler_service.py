@@ -1,56 +1,267 @@
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.triggers.cron import CronTrigger
+from collections import Counter
+from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
+from app.services.job_service import JobService
+from app.utils.db import Database
+from config.settings import config as app_config
+import atexit
 import logging
+import os
+import socket
+import threading
+import time
+import uuid
+
+LEADER_LEASE = 'scheduler'
+
+def _lease_time(offset_seconds=0):
+    # Fixed-width UTC timestamps, so stored values compare correctly as text
+    return (datetime.utcnow() + timedelta(seconds=offset_seconds)).isoformat(timespec='microseconds')
+
+class LeaderLease:
+    """
+    Row in scheduler_leases held by at most one process at a time.
+
+    The holder renews the lease well before it expires; when the holder dies, another
+    process takes it over once it has expired. Process clocks must agree to within the TTL.
+    """
+
+    def __init__(self, db_path, name, ttl):
+        self.db = Database(db_path)
+        self.name = name
+        self.ttl = ttl
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+    def acquire(self):
+        """Take or renew the lease; returns True if this process holds it"""
+        params = {'name': self.name, 'holder': self.holder, 'now': _lease_time(), 'expires_at': _lease_time(self.ttl)}
+        result = self.db.execute('''
+            UPDATE scheduler_leases SET holder = :holder, expires_at = :expires_at
+            WHERE name = :name AND (holder = :holder OR expires_at < :now)
+        ''', params)
+        if result.rowcount == 1:
+            return True
+        try:
+            self.db.execute('''
+                INSERT INTO scheduler_leases (name, holder, expires_at) VALUES (:name, :holder, :expires_at)
+            ''', params)
+            return True
+        except IntegrityError:
+            return False # Held by another process
+
+    def release(self):
+        """Give the lease up so another process can take over without waiting for it to expire"""
+        self.db.execute(
+            "UPDATE scheduler_leases SET expires_at = '' WHERE name = :name AND holder = :holder",
+            {'name': self.name, 'holder': self.holder}
+        )
+
+    def current_holder(self):
+        row = self.db.fetch_one(
+            'SELECT holder, expires_at FROM scheduler_leases WHERE name = :name AND expires_at >= :now',
+            {'name': self.name, 'now': _lease_time()}
+        )
+        return row['holder'] if row else None
 
 class SchedulerService:
+    """
+    Fires scheduled jobs from the cron expressions stored on jobs.
+
+    Every process that calls init_app competes for a leader lease in the database, and only
+    the leader loads the schedules and fires jobs, so running the API with several Gunicorn
+    workers still fires each job once. The leader reloads schedules every
+    SCHEDULER_SYNC_INTERVAL seconds, which picks up changes saved through other processes.
+
+    Jobs fire on a pool of SCHEDULER_POOL_SIZE threads. Missed fires of a job are coalesced
+    into one run, which is skipped if it is more than SCHEDULER_MISFIRE_GRACE_TIME seconds
+    late, and each job runs at most maxConcurrentRuns times at once.
+    """
+
     def __init__(self, app=None):
-        self.scheduler = BackgroundScheduler()
+        self.scheduler = BackgroundScheduler(
+            executors={'default': ThreadPoolExecutor(app_config.SCHEDULER_POOL_SIZE)},
+            job_defaults={
+                'coalesce': True,
+                'misfire_grace_time': app_config.SCHEDULER_MISFIRE_GRACE_TIME,
+                'max_instances': 1
+            }
+        )
         self.app = None
+        self.run_job = None
+        self.lease = None
+        self.job_service = None
+        self.is_leader = False
+        self._signatures = {} # job ID -> (cron, max concurrent runs, jitter) currently scheduled
+        self._last_sync = 0
+        self._sync_lock = threading.Lock()
+        self._stop = threading.Event()
         if app:
             self.init_app(app)
 
-    def init_app(self, app):
-        self.app = app
-        if not self.scheduler.running:
-            self.scheduler.start()
-            logging.info("Scheduler started")
-
-    def add_job(self, job_id, schedule_expression, func, **kwargs):
+    def init_app(self, app, run_job=None):
         """
-        Add a job to the scheduler.
-        :param job_id: Unique ID for the job
-        :param schedule_expression: Cron expression (e.g. "0 9 * * *")
-        :param func: Function to execute
-        :param kwargs: Arguments to pass to the function
+        Start the scheduler and begin competing for the leader lease.
+
+        :param run_job: Function called as run_job(job_id, max_concurrent_runs) when a job fires
         """
-        try:
-            # Remove existing job if it exists to update it
-            if self.scheduler.get_job(job_id):
-                self.scheduler.remove_job(job_id)
+        self.app = app
+        if run_job:
+            self.run_job = run_job
+        if not app_config.SCHEDULER_ENABLED or self.scheduler.running:
+            return
+
+        self.job_service = JobService(app_config.DATABASE_PATH)
+        self.lease = LeaderLease(app_config.DATABASE_PATH, LEADER_LEASE, app_config.SCHEDULER_LEASE_TTL)
+        self.scheduler.start()
+        threading.Thread(target=self._lead, name='scheduler-leader', daemon=True).start()
+        atexit.register(self.shutdown)
+        logging.info("Scheduler started")
+
+    def _lead(self):
+        # Renew well within the TTL so a live leader never loses the lease
+        interval = max(app_config.SCHEDULER_LEASE_TTL / 3, 1)
+        while True:
+            try:
+                leader = self.lease.acquire()
+            except Exception as e:
+                logging.error(f"Scheduler lease check failed: {e}")
+                leader = False # Stop firing rather than risk a second leader
+
+            if leader != self.is_leader:
+                self.is_leader = leader
+                logging.info(f"Scheduler {self.lease.holder} {'is now' if leader else 'is no longer'} the leader")
+                if leader:
+                    self.sync()
+                else:
+                    self._clear()
+            elif leader and time.monotonic() - self._last_sync >= app_config.SCHEDULER_SYNC_INTERVAL:
+                self.sync()
+
+            if self._stop.wait(interval):
+                return
 
-            if not schedule_expression:
+    def sync(self):
+        """Reconcile scheduled jobs with the schedules stored in the database (leader only)."""
+        with self._sync_lock:
+            if not self.is_leader:
                 return
+            try:
+                jobs = self.job_service.get_scheduled()
+            except Exception as e:
+                logging.error(f"Failed to load job schedules: {e}")
+                return
+
+            # Jitter fire times when many jobs share a cron expression, so they do not all start together
+            expressions = {job['id']: ' '.join(job['schedule'].split()) for job in jobs}
+            shared = Counter(expressions.values())
+            wanted = {}
+            for job in jobs:
+                expression = expressions[job['id']]
+                jitter = app_config.SCHEDULER_JITTER if shared[expression] >= app_config.SCHEDULER_JITTER_THRESHOLD else 0
+                wanted[job['id']] = (expression, job['maxConcurrentRuns'], jitter)
+
+            for job_id in list(self._signatures):
+                if job_id not in wanted:
+                    self._unschedule(job_id)
+            for job_id, signature in wanted.items():
+                if self._signatures.get(job_id) != signature:
+                    self._schedule(job_id, *signature)
+            self._last_sync = time.monotonic()
 
+    def _schedule(self, job_id, schedule_expression, max_concurrent_runs, jitter):
+        # Remembered even if invalid, so a bad expression is not retried and logged on every sync
+        self._signatures[job_id] = (schedule_expression, max_concurrent_runs, jitter)
+        try:
+            trigger = CronTrigger.from_crontab(schedule_expression)
+            trigger.jitter = jitter or None
             self.scheduler.add_job(
                 id=job_id,
-                func=func,
-                trigger=CronTrigger.from_crontab(schedule_expression),
-                replace_existing=True,
-                **kwargs
+                func=self._fire,
+                trigger=trigger,
+                args=[job_id, max_concurrent_runs],
+                max_instances=max_concurrent_runs,
+                replace_existing=True
             )
             logging.info(f"Scheduled job {job_id} with cron {schedule_expression}")
         except Exception as e:
             logging.error(f"Failed to schedule job {job_id}: {str(e)}")
 
+    def _unschedule(self, job_id):
+        self._signatures.pop(job_id, None)
+        if self.scheduler.get_job(job_id):
+            self.scheduler.remove_job(job_id)
+            logging.info(f"Removed job {job_id} from scheduler")
+
+    def _fire(self, job_id, max_concurrent_runs):
+        if self.run_job:
+            self.run_job(job_id, max_concurrent_runs)
+
+    def _clear(self):
+        with self._sync_lock:
+            for job_id in list(self._signatures):
+                self._unschedule(job_id)
+
+    def shutdown(self):
+        """Stop firing jobs and hand the leader lease over."""
+        self._stop.set()
+        if self.is_leader:
+            try:
+                self.lease.release()
+            except Exception as e:
+                logging.error(f"Failed to release scheduler lease: {e}")
+            self.is_leader = False
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+
+    def add_job(self, job_id, schedule_expression, func, **kwargs):
+        """
+        Apply a job's saved schedule.
+
+        Schedules are read from the jobs table, so this reloads them in the leader; other
+        processes leave it to the leader's next sync.
+        :param job_id: Unique ID for the job
+        :param schedule_expression: Cron expression (e.g. "0 9 * * *")
+        :param func: Function to execute
+        """
+        if func and not self.run_job:
+            self.run_job = func
+        try:
+            self.sync()
+        except Exception as e:
+            logging.error(f"Failed to schedule job {job_id}: {str(e)}")
+
     def remove_job(self, job_id):
         """Remove a job from the scheduler."""
         try:
-            if self.scheduler.get_job(job_id):
-                self.scheduler.remove_job(job_id)
-                logging.info(f"Removed job {job_id} from scheduler")
+            with self._sync_lock:
+                self._unschedule(job_id)
         except Exception as e:
             logging.error(f"Failed to remove job {job_id}: {str(e)}")
 
+    def status(self):
+        """Leader state and the jobs this process has scheduled (only the leader has any)."""
+        return {
+            'enabled': app_config.SCHEDULER_ENABLED,
+            'instance': self.lease.holder if self.lease else None,
+            'leader': self.is_leader,
+            'currentLeader': self.lease.current_holder() if self.lease else None,
+            'poolSize': app_config.SCHEDULER_POOL_SIZE,
+            'misfireGraceTime': app_config.SCHEDULER_MISFIRE_GRACE_TIME,
+            'jobs': [
+                {
+                    'jobId': job.id,
+                    'cron': self._signatures.get(job.id, (None,))[0],
+                    'maxConcurrentRuns': job.max_instances,
+                    'jitter': job.trigger.jitter or 0,
+                    'nextRunTime': job.next_run_time.isoformat() if job.next_run_time else None
+                }
+                for job in self.scheduler.get_jobs()
+            ]
+        }
+
     def get_future_runs(self, schedule_expression, limit=5):
         """
         Calculate future run times for a cron expression.
@@ -0,0 +1,241 @@
+"""
+Streaming Executions
+Long-running jobs that keep a Kafka source connected and run the pipeline once per micro-batch
+"""
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from app.connectors.messaging.kafka_connector import KafkaConnector
+from config.settings import config as app_config
+
+STREAMING_TRIGGER = 'STREAMING'
+
+def find_streaming_source(nodes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The Kafka input node with streaming enabled; a streaming job must have exactly one."""
+    sources = [
+        node for node in nodes
+        if node['data']['type'] == 'kafka-input' and node['data'].get('config', {}).get('streaming')
+    ]
+    if len(sources) != 1:
+        raise Exception(f"A streaming job needs exactly one Kafka Input with streaming enabled (found {len(sources)})")
+    return sources[0]
+
+class StreamingRun:
+    """
+    One running streaming execution.
+
+    Each micro-batch from the source is fed to the rest of the pipeline as the source node's
+    output. Offsets are committed only after every component and success callback has
+    completed, so a failed batch stops the stream and is consumed again on the next start.
+    """
+
+    def __init__(self, execution_service, job_id: str):
+        self.service = execution_service
+        self.job_id = job_id
+        self.execution_id = str(uuid.uuid4())
+        self.start_time = datetime.utcnow().isoformat()
+        self.status = 'running'
+        self.message = 'Streaming'
+        self.logs = deque(maxlen=app_config.STREAMING_LOG_LIMIT)
+        self.stop_event = threading.Event()
+        self.metrics = {
+            'batches': 0,
+            'records': 0,
+            'lastBatchRecords': 0,
+            'lastBatchMs': None,
+            'avgBatchMs': None,
+            'lastLatencyMs': None,
+            'lag': None,
+            'lastCommitAt': None
+        }
+        self._total_batch_ms = 0.0
+        self._last_checkpoint = 0.0
+        self.thread = threading.Thread(target=self._run, name=f'stream-{job_id}', daemon=True)
+
+    def log(self, message: str, level: str = 'info', component_id: Optional[str] = None):
+        self.logs.append({
+            'timestamp': datetime.utcnow().isoformat(),
+            'level': level,
+            'message': message,
+            'componentId': component_id
+        })
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.execution_id,
+            'jobId': self.job_id,
+            'status': self.status,
+            'message': self.message,
+            'startTime': self.start_time,
+            'triggerType': STREAMING_TRIGGER,
+            'metrics': dict(self.metrics)
+        }
+
+    def _checkpoint(self, force: bool = False):
+        # Persist progress to the execution record, at most every STREAMING_CHECKPOINT_INTERVAL seconds
+        now = time.monotonic()
+        if not force and now - self._last_checkpoint < app_config.STREAMING_CHECKPOINT_INTERVAL:
+            return
+        self._last_checkpoint = now
+        self.service.job_service.update_execution({
+            'id': self.execution_id,
+            'status': self.status,
+            'message': self.message,
+            'logs': list(self.logs),
+            'endTime': None if self.status == 'running' else datetime.utcnow().isoformat()
+        })
+
+    def _load_pipeline(self):
+        job = self.service.job_service.get_by_id(self.job_id)
+        if not job:
+            raise Exception(f"Job not found: {self.job_id}")
+        nodes = job.get('canvasState', {}).get('nodes', [])
+        edges = job.get('canvasState', {}).get('edges', [])
+
+        variables = self.service.workspace_service.get_variables(job['workspaceId'])
+        if variables:
+            nodes = self.service._substitute_variables(nodes, {v['key']: v['value'] for v in variables})
+        return job, nodes, edges
+
+    def _run(self):
+        reader = None
+        try:
+            job, nodes, edges = self._load_pipeline()
+            source = find_streaming_source(nodes)
+            reader = KafkaConnector().open_stream(source['data']['config'])
+            self.log(f"Streaming from topic {source['data']['config'].get('topic')}", component_id=source['id'])
+
+            while not self.stop_event.is_set():
+                batch = reader.next_batch(self.stop_event)
+                if batch['messages']:
+                    self._process_batch(job, nodes, edges, source, reader, batch)
+                self._checkpoint()
+
+            self.status = 'success'
+            self.message = f"Stream stopped after {self.metrics['batches']} batches ({self.metrics['records']} records)"
+        except Exception as e:
+            self.status = 'error'
+            self.message = str(e)
+            self.log(f"Streaming failed: {str(e)}", level='error')
+        finally:
+            if reader:
+                try:
+                    reader.close()
+                except Exception as e:
+                    print(f"Error closing stream consumer: {e}")
+            try:
+                self._checkpoint(force=True)
+            except Exception as e:
+                print(f"Failed to save streaming execution {self.execution_id}: {e}")
+
+    def _process_batch(self, job, nodes, edges, source, reader, batch):
+        start = time.perf_counter()
+        batch_logs = []
+        success_callbacks = []
+        try:
+            if batch['records']:
+                self.service._execute_nodes(
+                    self.job_id, job['workspaceId'], nodes, edges, batch_logs, success_callbacks,
+                    execution_results={source['id']: batch['records']}, execution_id=self.execution_id
+                )
+                for callback in success_callbacks:
+                    callback()
+        finally:
+            self.logs.extend(batch_logs)
+
+        # Only now are the batch's records safely written by every sink
+        reader.commit(batch['offsets'])
+
+        batch_ms = (time.perf_counter() - start) * 1000
+        self._total_batch_ms += batch_ms
+        metrics = self.metrics
+        metrics['batches'] += 1
+        metrics['records'] += len(batch['records'])
+        metrics['lastBatchRecords'] = len(batch['records'])
+        metrics['lastBatchMs'] = round(batch_ms, 1)
+        metrics['avgBatchMs'] = round(self._total_batch_ms / metrics['batches'], 1)
+        if batch['oldestTimestamp'] is not None:
+            # End-to-end: from the oldest message's timestamp until its batch was committed
+            metrics['lastLatencyMs'] = max(int(time.time() * 1000) - batch['oldestTimestamp'], 0)
+        metrics['lag'] = reader.lag()
+        metrics['lastCommitAt'] = datetime.utcnow().isoformat()
+
+        self.log(
+            f"Batch {metrics['batches']}: {len(batch['records'])} records in {metrics['lastBatchMs']} ms, "
+            f"latency {metrics['lastLatencyMs']} ms, lag {metrics['lag']}",
+            component_id=source['id']
+        )
+
+class StreamingService:
+    """
+    Registry of streaming executions running in this process, by job ID.
+
+    Streams are threads of the API process, so start/stop requests must reach the same
+    process (run the API with a single worker process when streaming jobs are used).
+    """
+
+    def __init__(self):
+        self.streams: Dict[str, StreamingRun] = {}
+        self._lock = threading.Lock()
+
+    def start(self, execution_service, job_id: str) -> Dict[str, Any]:
+        """
+        Start a streaming execution for a job
+
+        Args:
+            execution_service: ExecutionService used to run the pipeline per batch
+            job_id: Job ID
+
+        Returns:
+            The running execution (id, status, metrics, ...)
+        """
+        with self._lock:
+            current = self.streams.get(job_id)
+            if current and current.thread.is_alive():
+                raise Exception('Job is already streaming')
+            if not execution_service.job_service.get_by_id(job_id):
+                raise Exception(f"Job not found: {job_id}")
+
+            run = StreamingRun(execution_service, job_id)
+            execution_service.job_service.save_execution({
+                'id': run.execution_id,
+                'jobId': job_id,
+                'status': run.status,
+                'triggerType': STREAMING_TRIGGER,
+                'message': run.message,
+                'logs': [],
+                'startTime': run.start_time,
+                'endTime': None
+            })
+            self.streams[job_id] = run
+            run.thread.start()
+        return run.to_dict()
+
+    def stop(self, job_id: str, timeout: float = 30) -> Optional[Dict[str, Any]]:
+        """
+        Stop a job's stream after its current batch, waiting up to timeout seconds
+
+        Returns:
+            The final execution state, or None if the job is not streaming
+        """
+        run = self.streams.get(job_id)
+        if not run:
+            return None
+        run.stop_event.set()
+        run.thread.join(timeout)
+        return run.to_dict()
+
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Current state and metrics of a job's most recent stream in this process"""
+        run = self.streams.get(job_id)
+        return run.to_dict() if run else None
+
+    def list_streams(self) -> List[Dict[str, Any]]:
+        """State of every stream started in this process"""
+        return [run.to_dict() for run in list(self.streams.values())]
+
+# Global instance
+streaming_service = StreamingService()
@@ -0,0 +1,158 @@
+"""
+Incremental Extraction State
+Stores high-watermarks for database readers and the ledger of processed files for directory sources
+"""
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import text
+from app.utils.db import Database
+
+def encode_watermark(value: Any) -> Tuple[str, str]:
+    """Serialise a watermark value as (text, type name) so it can be restored with its type."""
+    if isinstance(value, bool):
+        return str(int(value)), 'int'
+    if isinstance(value, int):
+        return str(value), 'int'
+    if isinstance(value, float):
+        return repr(value), 'float'
+    if isinstance(value, Decimal):
+        return str(value), 'decimal'
+    if isinstance(value, datetime):
+        return value.isoformat(), 'datetime'
+    if isinstance(value, date):
+        return value.isoformat(), 'date'
+    return str(value), 'str'
+
+def decode_watermark(value: Optional[str], value_type: Optional[str]) -> Any:
+    """Restore a watermark value stored by encode_watermark, ready to bind as a query parameter."""
+    if value is None:
+        return None
+    if value_type == 'int':
+        return int(value)
+    if value_type == 'float':
+        return float(value)
+    if value_type == 'decimal':
+        return Decimal(value)
+    if value_type == 'datetime':
+        return datetime.fromisoformat(value)
+    if value_type == 'date':
+        return date.fromisoformat(value)
+    return value
+
+class WatermarkService:
+    """
+    Service for incremental extraction state, keyed by job and component (node) ID.
+
+    State is only written after a job run succeeds, so a failed run is retried from the
+    previous watermark / ledger on the next execution.
+    """
+
+    def __init__(self, db_path):
+        self.db = Database(db_path)
+
+    def get_watermark(self, job_id: str, node_id: str) -> Optional[Dict[str, Any]]:
+        """Get the stored watermark for a node, with its value decoded to the original type"""
+        row = self.db.fetch_one(
+            'SELECT * FROM watermarks WHERE job_id = :job_id AND node_id = :node_id',
+            {'job_id': job_id, 'node_id': node_id}
+        )
+        return self._parse_watermark(row) if row else None
+
+    def get_watermarks(self, job_id: str) -> List[Dict[str, Any]]:
+        """Get all watermarks for a job, with values as stored (ISO text for dates) for display"""
+        rows = self.db.fetch_all(
+            'SELECT * FROM watermarks WHERE job_id = :job_id ORDER BY node_id',
+            {'job_id': job_id}
+        )
+        return [self._parse_watermark(row, decode=False) for row in rows]
+
+    def _parse_watermark(self, row, decode=True):
+        return {
+            'jobId': row['job_id'],
+            'nodeId': row['node_id'],
+            'column': row['column_name'],
+            'value': decode_watermark(row['value'], row['value_type']) if decode else row['value'],
+            'valueType': row['value_type'],
+            'updatedAt': row['updated_at']
+        }
+
+    def set_watermark(self, job_id: str, node_id: str, column: str, value: Any):
+        """Store (or advance) the watermark for a node"""
+        text_value, value_type = encode_watermark(value)
+        self.db.execute('''
+            INSERT INTO watermarks (job_id, node_id, column_name, value, value_type, updated_at)
+            VALUES (:job_id, :node_id, :column_name, :value, :value_type, :updated_at)
+            ON CONFLICT (job_id, node_id) DO UPDATE SET
+                column_name = excluded.column_name,
+                value = excluded.value,
+                value_type = excluded.value_type,
+                updated_at = excluded.updated_at
+        ''', {
+            'job_id': job_id,
+            'node_id': node_id,
+            'column_name': column,
+            'value': text_value,
+            'value_type': value_type,
+            'updated_at': datetime.utcnow().isoformat()
+        })
+
+    def get_processed_files(self, job_id: str, node_id: str) -> Dict[str, str]:
+        """Get the ledger of processed files for a node as {path: fingerprint}"""
+        rows = self.db.fetch_all(
+            'SELECT file_path, fingerprint FROM processed_files WHERE job_id = :job_id AND node_id = :node_id',
+            {'job_id': job_id, 'node_id': node_id}
+        )
+        return {row['file_path']: row['fingerprint'] for row in rows}
+
+    def mark_files_processed(self, job_id: str, node_id: str, files: Dict[str, str]):
+        """Record files (path -> fingerprint) as processed by a node"""
+        now = datetime.utcnow().isoformat()
+        with self.db.get_connection() as conn:
+            conn.execute(text('''
+                INSERT INTO processed_files (job_id, node_id, file_path, fingerprint, processed_at)
+                VALUES (:job_id, :node_id, :file_path, :fingerprint, :processed_at)
+                ON CONFLICT (job_id, node_id, file_path) DO UPDATE SET
+                    fingerprint = excluded.fingerprint,
+                    processed_at = excluded.processed_at
+            '''), [
+                {'job_id': job_id, 'node_id': node_id, 'file_path': path, 'fingerprint': fingerprint, 'processed_at': now}
+                for path, fingerprint in files.items()
+            ])
+            conn.commit()
+
+    def get_summary(self, job_id: str) -> Dict[str, Any]:
+        """Get watermarks and processed file counts for a job"""
+        rows = self.db.fetch_all('''
+            SELECT node_id, COUNT(*) AS file_count, MAX(processed_at) AS last_processed
+            FROM processed_files
+            WHERE job_id = :job_id
+            GROUP BY node_id
+        ''', {'job_id': job_id})
+        return {
+            'watermarks': self.get_watermarks(job_id),
+            'processedFiles': [
+                {'nodeId': row['node_id'], 'count': row['file_count'], 'lastProcessedAt': row['last_processed']}
+                for row in rows
+            ]
+        }
+
+    def reset(self, job_id: str, node_id: Optional[str] = None) -> Dict[str, int]:
+        """
+        Clear incremental state so the next run extracts everything again
+
+        Args:
+            job_id: Job ID
+            node_id: Optional component ID; all components of the job are reset if omitted
+
+        Returns:
+            Number of watermarks and ledger entries removed
+        """
+        params = {'job_id': job_id}
+        condition = 'job_id = :job_id'
+        if node_id:
+            condition += ' AND node_id = :node_id'
+            params['node_id'] = node_id
+        watermarks = self.db.execute(f'DELETE FROM watermarks WHERE {condition}', params)
+        files = self.db.execute(f'DELETE FROM processed_files WHERE {condition}', params)
+        return {'watermarks': watermarks.rowcount, 'processedFiles': files.rowcount}
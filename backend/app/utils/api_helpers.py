@@ -20,3 +20,18 @@ def api_response(f):
             # In a real app we'd log this error
             return jsonify({'error': str(e)}), 500
     return decorated_function
+
+def parse_bool(value, default=False):
+    """
+    Interpret a boolean from a JSON body or query string.
+
+    Accepts booleans and the strings 'true'/'false', '1'/'0', 'yes'/'no' (any case);
+    None and empty strings give the default.
+    """
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return value != 0
+    return str(value).strip().lower() in ('true', '1', 'yes', 'on')
@@ -121,7 +121,7 @@ class PasswordResolver:
         resolved_config = config.copy()
         
         # Fields that might contain passwords or sensitive data
-        sensitive_fields = ['password', 'kerberosKeytab', 'jaasConfig']
+        sensitive_fields = ['password', 'secretKey', 'kerberosKeytab', 'jaasConfig']
         
         for field in sensitive_fields:
             if field in resolved_config and resolved_config[field]:
@@ -75,6 +75,77 @@ def init_db(db_path):
                 )
             '''))
             
+            # Create watermarks table (incremental database extraction)
+            conn.execute(text('''
+                CREATE TABLE IF NOT EXISTS watermarks (
+                    job_id VARCHAR(255) NOT NULL,
+                    node_id VARCHAR(255) NOT NULL,
+                    column_name VARCHAR(255),
+                    value TEXT,
+                    value_type VARCHAR(50),
+                    updated_at VARCHAR(255) NOT NULL,
+                    PRIMARY KEY (job_id, node_id),
+                    FOREIGN KEY (job_id) REFERENCES jobs (id) ON DELETE CASCADE
+                )
+            '''))
+
+            # Create processed_files table (ledger for incremental directory sources)
+            conn.execute(text('''
+                CREATE TABLE IF NOT EXISTS processed_files (
+                    job_id VARCHAR(255) NOT NULL,
+                    node_id VARCHAR(255) NOT NULL,
+                    file_path VARCHAR(1024) NOT NULL,
+                    fingerprint VARCHAR(255),
+                    processed_at VARCHAR(255) NOT NULL,
+                    PRIMARY KEY (job_id, node_id, file_path),
+                    FOREIGN KEY (job_id) REFERENCES jobs (id) ON DELETE CASCADE
+                )
+            '''))
+
+            # Create kafka_offsets table (partition/offset ranges consumed per execution, for commits and replay)
+            conn.execute(text('''
+                CREATE TABLE IF NOT EXISTS kafka_offsets (
+                    execution_id VARCHAR(255) NOT NULL,
+                    job_id VARCHAR(255) NOT NULL,
+                    node_id VARCHAR(255) NOT NULL,
+                    topic VARCHAR(255) NOT NULL,
+                    partition_id INTEGER NOT NULL,
+                    start_offset BIGINT NOT NULL,
+                    end_offset BIGINT NOT NULL,
+                    committed INTEGER DEFAULT 0,
+                    recorded_at VARCHAR(255) NOT NULL,
+                    PRIMARY KEY (execution_id, node_id, topic, partition_id),
+                    FOREIGN KEY (job_id) REFERENCES jobs (id) ON DELETE CASCADE
+                )
+            '''))
+
+            # Create execution_queue table (executions waiting for / claimed by worker processes)
+            conn.execute(text('''
+                CREATE TABLE IF NOT EXISTS execution_queue (
+                    id VARCHAR(255) PRIMARY KEY,
+                    job_id VARCHAR(255) NOT NULL,
+                    trigger_type VARCHAR(50) DEFAULT 'MANUAL',
+                    replay_of VARCHAR(255),
+                    status VARCHAR(50) NOT NULL,
+                    worker_id VARCHAR(255),
+                    attempts INTEGER DEFAULT 0,
+                    enqueued_at VARCHAR(255) NOT NULL,
+                    claimed_at VARCHAR(255),
+                    heartbeat_at VARCHAR(255),
+                    finished_at VARCHAR(255),
+                    FOREIGN KEY (job_id) REFERENCES jobs (id) ON DELETE CASCADE
+                )
+            '''))
+
+            # Create scheduler_leases table (leader lock so one process fires scheduled jobs)
+            conn.execute(text('''
+                CREATE TABLE IF NOT EXISTS scheduler_leases (
+                    name VARCHAR(255) PRIMARY KEY,
+                    holder VARCHAR(255),
+                    expires_at VARCHAR(255) NOT NULL
+                )
+            '''))
+
             # Migrations
             try:
                 conn.execute(text("SELECT trigger_type FROM executions LIMIT 1"))
@@ -94,12 +165,42 @@ def init_db(db_path):
                 except Exception as e:
                     print(f"Migration error: {e}")
 
+            try:
+                conn.execute(text("SELECT max_concurrent_runs FROM jobs LIMIT 1"))
+            except Exception:
+                print("Migrating jobs table: adding max_concurrent_runs column")
+                try:
+                    conn.execute(text("ALTER TABLE jobs ADD COLUMN max_concurrent_runs INTEGER DEFAULT 1"))
+                except Exception as e:
+                    print(f"Migration error: {e}")
+
+            try:
+                conn.execute(text("SELECT parent_execution_id FROM executions LIMIT 1"))
+            except Exception:
+                print("Migrating executions table: adding parent_execution_id column")
+                try:
+                    conn.execute(text("ALTER TABLE executions ADD COLUMN parent_execution_id VARCHAR(255)"))
+                except Exception as e:
+                    print(f"Migration error: {e}")
+
+            for column, column_type in (('parent_execution_id', 'VARCHAR(255)'), ('job_stack', 'TEXT')):
+                try:
+                    conn.execute(text(f"SELECT {column} FROM execution_queue LIMIT 1"))
+                except Exception:
+                    print(f"Migrating execution_queue table: adding {column} column")
+                    try:
+                        conn.execute(text(f"ALTER TABLE execution_queue ADD COLUMN {column} {column_type}"))
+                    except Exception as e:
+                        print(f"Migration error: {e}")
+
             # Create indexes for better performance
             try:
                 conn.execute(text('CREATE INDEX IF NOT EXISTS idx_jobs_workspace ON jobs(workspace_id)'))
                 conn.execute(text('CREATE INDEX IF NOT EXISTS idx_executions_job ON executions(job_id)'))
                 conn.execute(text('CREATE INDEX IF NOT EXISTS idx_executions_start ON executions(start_time DESC)'))
                 conn.execute(text('CREATE INDEX IF NOT EXISTS idx_variables_workspace ON workspace_variables(workspace_id)'))
+                conn.execute(text('CREATE INDEX IF NOT EXISTS idx_queue_status ON execution_queue(status, enqueued_at)'))
+                conn.execute(text('CREATE INDEX IF NOT EXISTS idx_executions_parent ON executions(parent_execution_id)'))
             except Exception as e:
                 print(f"Error creating indexes: {e}")
 
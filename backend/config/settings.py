@@ -26,6 +26,75 @@ class Config:
     else:
         raise ValueError("CRITICAL: DATABASE_URL or POSTGRES_URL_NON_POOLING is missing from Environment Variables.")
     
+    # Remote filesystem pool and local read-through cache
+    FS_POOL_IDLE_TIMEOUT = int(os.getenv('FS_POOL_IDLE_TIMEOUT', 600))
+    FS_CACHE_DIR = os.getenv('FS_CACHE_DIR', '/tmp/fs_cache' if IS_VERCEL else 'fs_cache')
+    FS_CACHE_MAX_BYTES = int(os.getenv('FS_CACHE_MAX_BYTES', 1024 * 1024 * 1024))
+    
+    # File and database preview result cache (a TTL of 0 disables it)
+    PREVIEW_CACHE_SIZE = int(os.getenv('PREVIEW_CACHE_SIZE', 256))
+    PREVIEW_CACHE_TTL = int(os.getenv('PREVIEW_CACHE_TTL', 300))
+    # Seconds before a running database preview is cancelled
+    PREVIEW_TIMEOUT = int(os.getenv('PREVIEW_TIMEOUT', 30))
+    
+    # Shared SQLAlchemy engine pools for database components and previews
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_POOL_MAX_OVERFLOW = int(os.getenv('DB_POOL_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 3600))
+    DB_POOL_IDLE_TIMEOUT = int(os.getenv('DB_POOL_IDLE_TIMEOUT', 900))
+    
+    # Pooled JDBC (JayDeBeApi) connections, per driver and URL
+    JDBC_POOL_SIZE = int(os.getenv('JDBC_POOL_SIZE', 4))
+    JDBC_POOL_TIMEOUT = int(os.getenv('JDBC_POOL_TIMEOUT', 60))
+    JDBC_POOL_IDLE_TIMEOUT = int(os.getenv('JDBC_POOL_IDLE_TIMEOUT', 600))
+    JDBC_VALIDATION_TIMEOUT = int(os.getenv('JDBC_VALIDATION_TIMEOUT', 5))
+    
+    # Streaming (micro-batch) executions
+    STREAMING_LOG_LIMIT = int(os.getenv('STREAMING_LOG_LIMIT', 500))
+    STREAMING_CHECKPOINT_INTERVAL = int(os.getenv('STREAMING_CHECKPOINT_INTERVAL', 10))
+    
+    # Kafka Schema Registry client cache (seconds; 0 disables caching / remembering missing schemas)
+    SCHEMA_REGISTRY_CACHE_TTL = int(os.getenv('SCHEMA_REGISTRY_CACHE_TTL', 300))
+    SCHEMA_REGISTRY_NEGATIVE_TTL = int(os.getenv('SCHEMA_REGISTRY_NEGATIVE_TTL', 30))
+    
+    # Shared HTTP connection pool for REST components (connections kept per host)
+    REST_POOL_SIZE = int(os.getenv('REST_POOL_SIZE', 32))
+    # REST response cache: entries kept in memory, default freshness (seconds) for responses
+    # without Cache-Control/Expires, and an optional on-disk store shared by processes
+    REST_CACHE_SIZE = int(os.getenv('REST_CACHE_SIZE', 10000))
+    REST_CACHE_TTL = int(os.getenv('REST_CACHE_TTL', 300))
+    REST_CACHE_DIR = os.getenv('REST_CACHE_DIR', '')
+    REST_CACHE_MAX_BYTES = int(os.getenv('REST_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+    
+    # Scheduler: threads firing jobs, seconds a late fire may still run (missed fires of a
+    # job are coalesced into one run), and the leader lease held by one process at a time
+    SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'true').lower() == 'true'
+    SCHEDULER_POOL_SIZE = int(os.getenv('SCHEDULER_POOL_SIZE', 10))
+    SCHEDULER_MISFIRE_GRACE_TIME = int(os.getenv('SCHEDULER_MISFIRE_GRACE_TIME', 300))
+    SCHEDULER_LEASE_TTL = int(os.getenv('SCHEDULER_LEASE_TTL', 30))
+    # Seconds between reloads of job schedules from the database by the leader
+    SCHEDULER_SYNC_INTERVAL = int(os.getenv('SCHEDULER_SYNC_INTERVAL', 30))
+    # Jobs sharing a cron expression are spread over up to SCHEDULER_JITTER seconds
+    # once at least SCHEDULER_JITTER_THRESHOLD of them fire together
+    SCHEDULER_JITTER = int(os.getenv('SCHEDULER_JITTER', 60))
+    SCHEDULER_JITTER_THRESHOLD = int(os.getenv('SCHEDULER_JITTER_THRESHOLD', 3))
+    
+    # Execution queue: 'inline' runs jobs in the API/scheduler process, 'queue' only
+    # enqueues them for worker processes (python main.py worker)
+    EXECUTION_MODE = os.getenv('EXECUTION_MODE', 'inline')
+    WORKER_CONCURRENCY = int(os.getenv('WORKER_CONCURRENCY', 4))
+    WORKER_POLL_INTERVAL = float(os.getenv('WORKER_POLL_INTERVAL', 2))
+    WORKER_HEARTBEAT_INTERVAL = int(os.getenv('WORKER_HEARTBEAT_INTERVAL', 10))
+    # Seconds without a heartbeat before a running execution is requeued
+    WORKER_HEARTBEAT_TIMEOUT = int(os.getenv('WORKER_HEARTBEAT_TIMEOUT', 60))
+    QUEUE_MAX_ATTEMPTS = int(os.getenv('QUEUE_MAX_ATTEMPTS', 3))
+    
+    # Orchestration: jobs of a dependency graph run in parallel at most, and how deeply
+    # Run Job components may nest sub-jobs
+    ORCHESTRATION_MAX_PARALLEL = int(os.getenv('ORCHESTRATION_MAX_PARALLEL', 4))
+    SUBJOB_MAX_DEPTH = int(os.getenv('SUBJOB_MAX_DEPTH', 10))
+    
     # Security
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*').split(',')
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key')
@@ -7,6 +7,7 @@ from app.routes.execution_routes import execution_bp
 from app.routes.file_routes import file_routes
 from app.routes.database_routes import database_bp
 from app.routes.connection_routes import connection_bp
+import argparse
 import os
 
 from config.settings import config
@@ -31,7 +32,8 @@ def create_app():
     
     # Initialize Scheduler
     from app.services.scheduler_service import scheduler_service
-    scheduler_service.init_app(app)
+    from app.routes.job_routes import execute_job_task
+    scheduler_service.init_app(app, run_job=execute_job_task)
     
     @app.route('/')
     @app.route('/api')
@@ -53,6 +55,27 @@ def create_app():
 
     return app
 
+def run_worker(concurrency=None):
+    """Run queued executions until SIGINT/SIGTERM, then finish the running ones."""
+    import signal
+    from app.services.execution_worker import ExecutionWorker
+    
+    init_db(config.DATABASE_PATH)
+    worker = ExecutionWorker(config.DATABASE_PATH, concurrency=concurrency)
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    signal.signal(signal.SIGINT, lambda *_: worker.stop())
+    worker.run()
+
 if __name__ == '__main__':
-    app = create_app()
-    app.run(host=config.HOST, port=config.PORT, debug=config.DEBUG)
+    parser = argparse.ArgumentParser(prog='osmosis')
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('api', help='Run the API server (default)')
+    worker_parser = commands.add_parser('worker', help='Run executions queued with EXECUTION_MODE=queue')
+    worker_parser.add_argument('--concurrency', type=int, default=None, help='Executions run at once (default WORKER_CONCURRENCY)')
+    args = parser.parse_args()
+    
+    if args.command == 'worker':
+        run_worker(args.concurrency)
+    else:
+        app = create_app()
+        app.run(host=config.HOST, port=config.PORT, debug=config.DEBUG)
@@ -12,6 +12,10 @@ export const CustomNode: React.FC<CustomNodeProps> = memo(({ data, selected }) =
   const def = getComponentDefinition(data.type);
   const iconName = def?.icon || data.config.icon || 'Box';
   const IconComponent = (Icons as any)[iconName];
+  // Excel readers with several sheets have one output per sheet, named after it
+  const sheetOutputs: string[] = data.type === 'file-reader' && data.config.fileType === 'excel'
+    ? (data.config.sheetNames || []).map((name: string) => name.trim()).filter(Boolean)
+    : [];
   
   const getStatusColor = () => {
     switch (data.status) {
@@ -73,11 +77,36 @@ export const CustomNode: React.FC<CustomNodeProps> = memo(({ data, selected }) =
       {getStatusIndicator()}
 
       {/* Outputs Handle */}
-      <Handle 
-        type="source" 
-        position={Position.Right} 
-        className="w-3 h-3 !bg-[var(--bg-secondary)] !border-2 !border-[var(--text-tertiary)] group-hover:!border-[var(--text-primary)] transition-colors z-10 -right-1.5" 
-      />
+      {sheetOutputs.length > 1 ? (
+        sheetOutputs.map((sheet, i) => (
+          <Handle 
+            key={sheet}
+            type="source" 
+            id={sheet}
+            position={Position.Right} 
+            title={`Sheet ${sheet}`}
+            style={{ top: `${((i + 1) * 100) / (sheetOutputs.length + 1)}%` }}
+            className="w-3 h-3 !bg-[var(--bg-secondary)] !border-2 !border-[var(--text-tertiary)] group-hover:!border-[var(--text-primary)] transition-colors z-10 -right-1.5" 
+          />
+        ))
+      ) : (
+        <Handle 
+          type="source" 
+          position={Position.Right} 
+          className="w-3 h-3 !bg-[var(--bg-secondary)] !border-2 !border-[var(--text-tertiary)] group-hover:!border-[var(--text-primary)] transition-colors z-10 -right-1.5" 
+        />
+      )}
+
+      {/* Reject Handle (rows whose request failed) */}
+      {data.type === 'rest-client' && (
+        <Handle 
+          type="source" 
+          id="reject"
+          position={Position.Bottom} 
+          title="Rejected rows"
+          className="w-3 h-3 !bg-[var(--bg-secondary)] !border-2 !border-red-400 group-hover:!border-red-500 transition-colors z-10 -bottom-1.5" 
+        />
+      )}
     </div>
   );
 });
@@ -62,6 +62,9 @@ export const DatabaseReaderConfig: React.FC<DatabaseReaderConfigProps> = ({
         onConfigChange('jdbcDriver', selectedConnection.jdbcDriver);
         onConfigChange('jdbcUrl', selectedConnection.jdbcUrl);
         onConfigChange('jdbcJarPath', selectedConnection.jdbcJarPath);
+        onConfigChange('authType', selectedConnection.authType);
+        onConfigChange('kerberosPrincipal', selectedConnection.kerberosPrincipal);
+        onConfigChange('kerberosKeytab', selectedConnection.kerberosKeytab);
       }
     }
   };
@@ -221,6 +224,150 @@ export const DatabaseReaderConfig: React.FC<DatabaseReaderConfigProps> = ({
           )}
         </div>
       )}
+
+      {config.dbType === 'mongodb' ? (
+        <>
+          {/* Find filter / projection, or an aggregation pipeline instead */}
+          <div>
+            <label className="block text-sm font-medium text-vercel-light-text dark:text-vercel-dark-text mb-1.5">
+              Filter (JSON)
+            </label>
+            <textarea
+              className="w-full px-3 py-2 bg-white dark:bg-vercel-dark-bg border border-vercel-light-border dark:border-vercel-dark-border rounded-lg text-vercel-light-text dark:text-vercel-dark-text focus:outline-none focus:ring-2 focus:ring-vercel-accent-blue font-mono text-sm"
+              rows={2}
+              value={config.filter || ''}
+              onChange={(e) => onConfigChange('filter', e.target.value)}
+              placeholder='{"status": "active"}'
+            />
+          </div>
+          <Input
+            label="Projection"
+            value={config.projection || ''}
+            onChange={(e) => onConfigChange('projection', e.target.value)}
+            placeholder="name, email (or a JSON projection document)"
+          />
+          <div>
+            <label className="block text-sm font-medium text-vercel-light-text dark:text-vercel-dark-text mb-1.5">
+              Aggregation Pipeline (JSON, replaces filter and projection)
+            </label>
+            <textarea
+              className="w-full px-3 py-2 bg-white dark:bg-vercel-dark-bg border border-vercel-light-border dark:border-vercel-dark-border rounded-lg text-vercel-light-text dark:text-vercel-dark-text focus:outline-none focus:ring-2 focus:ring-vercel-accent-blue font-mono text-sm"
+              rows={3}
+              value={config.pipeline || ''}
+              onChange={(e) => onConfigChange('pipeline', e.target.value)}
+              placeholder='[{"$match": {"status": "active"}}, {"$group": {"_id": "$country", "n": {"$sum": 1}}}]'
+            />
+          </div>
+          <Input
+            label="Batch Size"
+            type="number"
+            value={config.batchSize || ''}
+            onChange={(e) => onConfigChange('batchSize', parseInt(e.target.value))}
+            placeholder="1000"
+          />
+        </>
+      ) : (
+        <>
+        {/* Rows fetched per round trip from the server-side cursor */}
+        <Input
+          label="Fetch Size"
+          type="number"
+          value={config.fetchSize || ''}
+          onChange={(e) => onConfigChange('fetchSize', parseInt(e.target.value))}
+          placeholder="10000"
+        />
+
+        {config.connectionMethod === 'jdbc' && (
+          <div className="flex items-center gap-2">
+            <input
+              type="checkbox"
+              id="arrowFetch"
+              checked={config.arrowFetch || false}
+              onChange={(e) => onConfigChange('arrowFetch', e.target.checked)}
+              className="w-4 h-4 text-blue-600 rounded focus:ring-2 focus:ring-blue-500"
+            />
+            <label htmlFor="arrowFetch" className="text-sm font-medium text-vercel-light-text dark:text-vercel-dark-text">
+              Convert result sets to Arrow in bulk (needs arrow-jdbc JARs)
+            </label>
+          </div>
+        )}
+
+        {/* Parallel partitioned read */}
+        <div className="grid grid-cols-2 gap-4">
+          <Input
+            label="Partition Column"
+            value={config.partitionColumn || ''}
+            onChange={(e) => onConfigChange('partitionColumn', e.target.value)}
+            placeholder="id (optional)"
+          />
+          <Input
+            label="Partitions"
+            type="number"
+            value={config.numPartitions || ''}
+            onChange={(e) => onConfigChange('numPartitions', parseInt(e.target.value))}
+            placeholder="4"
+          />
+          {config.partitionColumn && (
+            <>
+              <div className="col-span-2">
+                <label className="block text-sm font-medium text-vercel-light-text dark:text-vercel-dark-text mb-1.5">
+                  Partition Strategy
+                </label>
+                <select
+                  value={config.partitionStrategy || 'range'}
+                  onChange={(e) => onConfigChange('partitionStrategy', e.target.value)}
+                  className="w-full px-3 py-2 bg-white dark:bg-vercel-dark-bg border border-vercel-light-border dark:border-vercel-dark-border rounded-lg text-vercel-light-text dark:text-vercel-dark-text focus:outline-none focus:ring-2 focus:ring-vercel-accent-blue"
+                >
+                  <option value="range">Range</option>
+                  <option value="modulo">Modulo</option>
+                </select>
+              </div>
+              {(config.partitionStrategy || 'range') === 'range' && (
+                <>
+                  <Input
+                    label="Lower Bound"
+                    type="number"
+                    value={config.lowerBound ?? ''}
+                    onChange={(e) => onConfigChange('lowerBound', e.target.value === '' ? undefined : Number(e.target.value))}
+                    placeholder="MIN (auto)"
+                  />
+                  <Input
+                    label="Upper Bound"
+                    type="number"
+                    value={config.upperBound ?? ''}
+                    onChange={(e) => onConfigChange('upperBound', e.target.value === '' ? undefined : Number(e.target.value))}
+                    placeholder="MAX (auto)"
+                  />
+                </>
+              )}
+            </>
+          )}
+        </div>
+
+        {/* Incremental extraction: only rows beyond the stored high-watermark are read */}
+        <div className="grid grid-cols-2 gap-4">
+          <Input
+            label="Incremental Column"
+            value={config.incrementalColumn || ''}
+            onChange={(e) => onConfigChange('incrementalColumn', e.target.value)}
+            placeholder="updated_at (optional)"
+          />
+          {config.incrementalColumn && (
+            <Input
+              label="Initial Watermark"
+              value={config.initialWatermark ?? ''}
+              onChange={(e) => onConfigChange('initialWatermark', e.target.value)}
+              placeholder="First run reads all rows"
+            />
+          )}
+        </div>
+        {config.incrementalColumn && (
+          <p className="text-xs text-vercel-light-text-secondary dark:text-vercel-dark-text-secondary">
+            Use :watermark in the query to place the filter yourself, e.g. WHERE updated_at &gt; :watermark
+          </p>
+        )}
+        </>
+      )}
     </div>
   );
 };
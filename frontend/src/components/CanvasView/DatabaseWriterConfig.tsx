@@ -190,12 +190,65 @@ export const DatabaseWriterConfig: React.FC<DatabaseWriterConfigProps> = ({
       {/* Table Field (always shown for writers) */}
       <div className="pt-2">
         <Input
-          label="Table Name"
+          label={config.dbType === 'mongodb' ? 'Collection Name' : 'Table Name'}
           value={config.table || ''}
           onChange={(e) => onConfigChange('table', e.target.value)}
-          placeholder="output_table"
+          placeholder={config.dbType === 'mongodb' ? 'output_collection' : 'output_table'}
         />
       </div>
+
+      {/* Write mode */}
+      <div>
+        <label className="block text-sm font-medium text-vercel-light-text dark:text-vercel-dark-text mb-1.5">
+          Write Mode
+        </label>
+        <select
+          value={config.writeMode || 'append'}
+          onChange={(e) => onConfigChange('writeMode', e.target.value)}
+          className="w-full px-3 py-2 bg-white dark:bg-vercel-dark-bg border border-vercel-light-border dark:border-vercel-dark-border rounded-lg text-vercel-light-text dark:text-vercel-dark-text focus:outline-none focus:ring-2 focus:ring-vercel-accent-blue"
+        >
+          <option value="append">Append</option>
+          <option value="upsert">Upsert (insert or update by key)</option>
+        </select>
+      </div>
+      {config.writeMode === 'upsert' && (
+        <Input
+          label="Key Columns"
+          value={config.keyColumns || ''}
+          onChange={(e) => onConfigChange('keyColumns', e.target.value)}
+          placeholder="id, region"
+        />
+      )}
+
+      {/* Bulk load options */}
+      <div className="grid grid-cols-2 gap-4">
+        <Input
+          label="Batch Size"
+          type="number"
+          value={config.batchSize || ''}
+          onChange={(e) => onConfigChange('batchSize', parseInt(e.target.value))}
+          placeholder="10000"
+        />
+        <Input
+          label="Commit Interval (rows)"
+          type="number"
+          value={config.commitInterval || ''}
+          onChange={(e) => onConfigChange('commitInterval', parseInt(e.target.value))}
+          placeholder="100000"
+        />
+      </div>
+      <div className="flex items-center gap-2">
+        <input
+          type="checkbox"
+          id="truncateTable"
+          checked={config.truncate || false}
+          onChange={(e) => onConfigChange('truncate', e.target.checked)}
+          className="w-4 h-4 text-blue-600 rounded focus:ring-2 focus:ring-blue-500"
+        />
+        <label htmlFor="truncateTable" className="text-sm font-medium text-vercel-light-text dark:text-vercel-dark-text">
+          Truncate table before loading
+        </label>
+      </div>
     </div>
   );
 };
@@ -3,6 +3,7 @@ import { Input } from '../common/Input';
 import { Button } from '../common/Button';
 import { getConnections, previewFile } from '../../services/api';
 import { FolderOpen } from 'lucide-react';
+import { useJobStore } from '../../store/jobStore';
 
 interface FileReaderConfigProps {
   config: any;
@@ -12,6 +13,7 @@ interface FileReaderConfigProps {
 }
 
 export const FileReaderConfig: React.FC<FileReaderConfigProps> = ({ config, onConfigChange, onPreview }) => {
+  const { currentJob } = useJobStore();
   const [connections, setConnections] = useState<any[]>([]);
   const [loadingConnections, setLoadingConnections] = useState(false);
   const [previewLoading, setPreviewLoading] = useState(false);
@@ -21,33 +23,20 @@ export const FileReaderConfig: React.FC<FileReaderConfigProps> = ({ config, onCo
   const useExistingConnection = config.useExistingConnection || false;
 
   useEffect(() => {
-    if (useExistingConnection) {
+    if (useExistingConnection && currentJob?.workspaceId) {
       loadConnections();
     }
-  }, [useExistingConnection]);
+  }, [useExistingConnection, currentJob?.workspaceId]);
 
   const loadConnections = async () => {
+    if (!currentJob?.workspaceId) return;
+
     setLoadingConnections(true);
     try {
-      // Assuming workspaceId is available from context or config, but usually we need it from parent
-      // For now, we might need to rely on prop drilling or store if workspaceId is global
-      // Let's assume we can get it from somewhere or pass it
-      // Actually, in NodeConfigModal we don't strictly have workspaceId easily unless we store it in canvasStore
-      // But typically we can just fetch all connections for the current workspace if we had the ID.
-      // HACK: We will use a hardcoded or derived way, or update NodeConfigModal to pass workspaceId
-      // For now, let's try to get it from the URL or similar if possible, or just fail safely?
-      // Better: Update NodeConfigModal to accept workspaceId. 
-      // But wait, the API `getConnections` needs workspaceId.
-      // Let's assume the component usage in NodeConfigModal will change to pass it.
-      // I will update NodeConfigModal next to pass workspaceId.
-      const pathParts = window.location.pathname.split('/');
-      const workspaceId = pathParts[2]; // /workspace/[id]
-      if (workspaceId) {
-          const data = await getConnections(workspaceId);
-          // Filter for 'ssh' or 's3' or 'hdfs' connections
-          const fileConnections = data.filter((c: any) => ['ssh', 's3', 'hdfs'].includes(c.connectionMethod));
-          setConnections(fileConnections);
-      }
+      const data = await getConnections(currentJob.workspaceId);
+      // Filter for 'ssh' or 's3' or 'hdfs' connections
+      const fileConnections = data.filter((c: any) => ['ssh', 's3', 'hdfs'].includes(c.connectionMethod));
+      setConnections(fileConnections);
     } catch (error) {
       console.error('Failed to load connections:', error);
     } finally {
@@ -65,7 +54,8 @@ export const FileReaderConfig: React.FC<FileReaderConfigProps> = ({ config, onCo
     setPreviewError(null);
     
     try {
-      const result = await previewFile(config.filePath, config.fileType || 'delimited', config);
+      // Saved connections are stored per workspace, so the backend needs the id to resolve them
+      const result = await previewFile(config.filePath, config.fileType || 'delimited', { ...config, workspaceId: currentJob?.workspaceId });
       if (onPreview) {
           onPreview(result);
       }
@@ -151,12 +141,34 @@ export const FileReaderConfig: React.FC<FileReaderConfigProps> = ({ config, onCo
         </div>
       </div>
 
+      {/* Directory / glob sources read every matching file */}
+      <div className="space-y-2">
+        <Input
+          label="File Pattern"
+          value={config.filePattern || ''}
+          onChange={(e) => onConfigChange('filePattern', e.target.value)}
+          placeholder="* (when the path is a directory)"
+        />
+        <div className="flex items-center gap-2">
+          <input
+            type="checkbox"
+            id="skipProcessedFiles"
+            checked={config.skipProcessedFiles || false}
+            onChange={(e) => onConfigChange('skipProcessedFiles', e.target.checked)}
+            className="w-4 h-4 text-blue-600 rounded focus:ring-2 focus:ring-blue-500"
+          />
+          <label htmlFor="skipProcessedFiles" className="text-sm font-medium text-vercel-light-text dark:text-vercel-dark-text">
+            Skip files already processed by this job
+          </label>
+        </div>
+      </div>
+
       <div className="space-y-2">
         <label className="block text-sm font-medium text-vercel-light-text dark:text-vercel-dark-text">
           File Type
         </label>
         <div className="flex gap-4">
-          {['delimited', 'excel', 'parquet', 'json'].map((ft) => (
+          {['delimited', 'excel', 'parquet', 'json', 'arrow'].map((ft) => (
             <label key={ft} className="flex items-center gap-2 cursor-pointer">
               <input
                 type="radio"
@@ -236,6 +248,15 @@ export const FileReaderConfig: React.FC<FileReaderConfigProps> = ({ config, onCo
                 onChange={(e) => onConfigChange('sheetName', e.target.value)}
                 placeholder="Sheet1"
                 />
+                <div className="mt-3">
+                    <Input
+                    label="Sheet Names (one output per sheet)"
+                    value={(config.sheetNames || []).join(', ')}
+                    onChange={(e) => onConfigChange('sheetNames', e.target.value ? e.target.value.split(',').map((name: string) => name.trimStart()) : [])}
+                    placeholder="Orders, Customers"
+                    />
+                    <p className="text-xs text-vercel-light-text-secondary mt-1">Overrides Sheet Name. With several sheets, they are read concurrently and each gets its own output on the node.</p>
+                </div>
             </div>
         )}
 
@@ -3,6 +3,7 @@ import { Input } from '../common/Input';
 import { Button } from '../common/Button';
 import { getConnections } from '../../services/api';
 import { FolderOpen } from 'lucide-react';
+import { useJobStore } from '../../store/jobStore';
 
 interface FileWriterConfigProps {
   config: any;
@@ -11,26 +12,25 @@ interface FileWriterConfigProps {
 }
 
 export const FileWriterConfig: React.FC<FileWriterConfigProps> = ({ config, onConfigChange, onEditSchema }) => {
+  const { currentJob } = useJobStore();
   const [connections, setConnections] = useState<any[]>([]);
   const [loadingConnections, setLoadingConnections] = useState(false);
   const useExistingConnection = config.useExistingConnection || false;
 
   useEffect(() => {
-    if (useExistingConnection) {
+    if (useExistingConnection && currentJob?.workspaceId) {
       loadConnections();
     }
-  }, [useExistingConnection]);
+  }, [useExistingConnection, currentJob?.workspaceId]);
 
   const loadConnections = async () => {
+    if (!currentJob?.workspaceId) return;
+
     setLoadingConnections(true);
     try {
-      const pathParts = window.location.pathname.split('/');
-      const workspaceId = pathParts[2];
-      if (workspaceId) {
-          const data = await getConnections(workspaceId);
-          const fileConnections = data.filter((c: any) => ['ssh', 's3', 'hdfs'].includes(c.connectionMethod));
-          setConnections(fileConnections);
-      }
+      const data = await getConnections(currentJob.workspaceId);
+      const fileConnections = data.filter((c: any) => ['ssh', 's3', 'hdfs'].includes(c.connectionMethod));
+      setConnections(fileConnections);
     } catch (error) {
       console.error('Failed to load connections:', error);
     } finally {
@@ -115,7 +115,7 @@ export const FileWriterConfig: React.FC<FileWriterConfigProps> = ({ config, onCo
           File Type
         </label>
         <div className="flex gap-4">
-          {['delimited', 'excel', 'parquet', 'json'].map((ft) => (
+          {['delimited', 'excel', 'parquet', 'json', 'arrow'].map((ft) => (
             <label key={ft} className="flex items-center gap-2 cursor-pointer">
               <input
                 type="radio"
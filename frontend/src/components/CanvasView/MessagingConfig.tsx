@@ -78,9 +78,50 @@ export const MessagingConfig: React.FC<MessagingConfigProps> = ({ type, config,
                         <option value="none">None (Throw exception)</option>
                     </select>
                 </div>
+
+                <div className="flex items-center gap-2">
+                    <input
+                        type="checkbox"
+                        checked={config.streaming || false}
+                        onChange={(e) => onConfigChange('streaming', e.target.checked)}
+                        className="w-4 h-4 text-vercel-accent-blue border-vercel-light-border dark:border-vercel-dark-border rounded focus:ring-vercel-accent-blue"
+                    />
+                    <label className="text-sm font-medium text-vercel-light-text dark:text-vercel-dark-text">Streaming mode (micro-batches)</label>
+                </div>
+
+                {config.streaming && (
+                    <>
+                        <div className="grid grid-cols-2 gap-4">
+                            <Input
+                                label="Batch Max Messages"
+                                type="number"
+                                value={config.batchMaxMessages || 1000}
+                                onChange={(e) => onConfigChange('batchMaxMessages', e.target.value)}
+                            />
+                            <Input
+                                label="Batch Interval (ms)"
+                                type="number"
+                                value={config.batchIntervalMs || 5000}
+                                onChange={(e) => onConfigChange('batchIntervalMs', e.target.value)}
+                            />
+                        </div>
+                        <p className="text-xs text-vercel-light-text-secondary dark:text-vercel-dark-text-secondary">
+                            Use Start Stream in the toolbar to run the pipeline for each batch; offsets are committed after the batch is written.
+                        </p>
+                    </>
+                )}
             </>
           )}
 
+          {!isInput && (
+             <Input
+                label="Key Columns"
+                value={config.keyColumns || ''}
+                onChange={(e) => onConfigChange('keyColumns', e.target.value)}
+                placeholder="customer_id (comma-separated, keeps per-key ordering)"
+             />
+          )}
+
           {!isInput && (
              <div>
                 <label className="block text-sm font-medium text-vercel-light-text dark:text-vercel-dark-text mb-1.5">
@@ -264,12 +305,20 @@ export const MessagingConfig: React.FC<MessagingConfigProps> = ({ type, config,
                             onChange={(e) => onConfigChange('sessionTimeoutMs', e.target.value)}
                         />
                     </div>
-                    <Input
-                        label="Max Poll Interval (ms)"
-                        type="number"
-                        value={config.maxPollIntervalMs || 300000}
-                        onChange={(e) => onConfigChange('maxPollIntervalMs', e.target.value)}
-                    />
+                    <div className="grid grid-cols-2 gap-4">
+                        <Input
+                            label="Max Poll Interval (ms)"
+                            type="number"
+                            value={config.maxPollIntervalMs || 300000}
+                            onChange={(e) => onConfigChange('maxPollIntervalMs', e.target.value)}
+                        />
+                        <Input
+                            label="Decode Workers"
+                            type="number"
+                            value={config.decodeWorkers || 1}
+                            onChange={(e) => onConfigChange('decodeWorkers', e.target.value)}
+                        />
+                    </div>
                  </>
              ) : (
                 <>
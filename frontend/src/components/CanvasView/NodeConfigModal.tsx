@@ -108,7 +108,7 @@ export const NodeConfigModal: React.FC<NodeConfigModalProps> = ({ nodeId, isOpen
     const { type } = node.data;
 
     // Database Reader component
-    if (type === 'database-reader') {
+    if (type === 'database-reader' || type === 'mongodb-reader') {
       return (
         <DatabaseReaderConfig
           config={config}
@@ -121,7 +121,7 @@ export const NodeConfigModal: React.FC<NodeConfigModalProps> = ({ nodeId, isOpen
     }
 
     // Database Writer component
-    if (type === 'database-writer') {
+    if (type === 'database-writer' || type === 'mongodb-writer') {
       return (
         <DatabaseWriterConfig
           config={config}
@@ -520,7 +520,7 @@ export const NodeConfigModal: React.FC<NodeConfigModalProps> = ({ nodeId, isOpen
                 Sample Data
               </h3>
                <p className="text-xs text-vercel-light-text-secondary dark:text-vercel-dark-text-secondary">
-                Showing {previewData.data?.length || 0} of {previewData.totalRows} rows
+                Showing {previewData.data?.length || 0} of {previewData.totalRowsExact === false ? '~' : ''}{previewData.totalRows ?? 'unknown'} rows
               </p>
             </div>
             
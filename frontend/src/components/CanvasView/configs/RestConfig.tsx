@@ -39,6 +39,100 @@ export const RestConfig: React.FC<RestConfigProps> = ({ config, onConfigChange }
                 />
              </div>
              
+             <div className="grid grid-cols-3 gap-4">
+                 <Input label="Concurrency" type="number" value={config.concurrency || 1} onChange={(e:any) => onConfigChange('concurrency', e.target.value)} />
+                 <Input label="Rate Limit (req/s per host)" type="number" value={config.rateLimit || ''} onChange={(e:any) => onConfigChange('rateLimit', e.target.value)} placeholder="Unlimited" />
+                 <Input label="Timeout (ms)" type="number" value={config.timeoutMs || 30000} onChange={(e:any) => onConfigChange('timeoutMs', e.target.value)} />
+             </div>
+             <div className="grid grid-cols-3 gap-4">
+                 <Input label="Max Retries" type="number" value={config.maxRetries ?? 3} onChange={(e:any) => onConfigChange('maxRetries', e.target.value)} />
+                 <Input label="Backoff (ms)" type="number" value={config.backoffMs || 500} onChange={(e:any) => onConfigChange('backoffMs', e.target.value)} />
+                 {['POST', 'PATCH'].includes(config.method) && (
+                     <label className="flex items-center gap-2 cursor-pointer self-end pb-2">
+                        <input
+                          type="checkbox"
+                          checked={!!config.retryNonIdempotent}
+                          onChange={(e) => onConfigChange('retryNonIdempotent', e.target.checked)}
+                          className="w-4 h-4 text-vercel-accent-blue border-vercel-light-border dark:border-vercel-dark-border rounded focus:ring-vercel-accent-blue"
+                        />
+                        <span className="text-sm text-vercel-light-text dark:text-vercel-dark-text">Retry {config.method} on timeouts and 5xx</span>
+                     </label>
+                 )}
+             </div>
+             <p className="text-xs text-vercel-light-text-secondary">429 and 5xx responses, timeouts and connection errors are retried with exponential backoff. POST and PATCH are only retried when the request never reached the server or got a 429, since a retry could repeat a request the API already processed. Rows that still fail are sent to the bottom (reject) output.</p>
+
+             <div className="grid grid-cols-3 gap-4 items-end">
+                 <label className="flex items-center gap-2 cursor-pointer pb-2">
+                    <input
+                      type="checkbox"
+                      checked={!!config.cache}
+                      onChange={(e) => onConfigChange('cache', e.target.checked)}
+                      className="w-4 h-4 text-vercel-accent-blue border-vercel-light-border dark:border-vercel-dark-border rounded focus:ring-vercel-accent-blue"
+                    />
+                    <span className="text-sm text-vercel-light-text dark:text-vercel-dark-text">Cache responses</span>
+                 </label>
+                 {config.cache && (
+                     <Input label="Default Cache TTL (s)" type="number" value={config.cacheTtl ?? ''} onChange={(e:any) => onConfigChange('cacheTtl', e.target.value)} placeholder="300" />
+                 )}
+             </div>
+             {config.cache && (
+                 <p className="text-xs text-vercel-light-text-secondary">GET responses are reused across rows and runs. Cache-Control and Expires from the API take precedence over the default TTL; stale responses with an ETag or Last-Modified are revalidated.</p>
+             )}
+
+             <div className="grid grid-cols-3 gap-4">
+                 <div>
+                    <label className="block text-sm font-medium text-vercel-light-text dark:text-vercel-dark-text mb-1.5">Pagination</label>
+                     <select
+                          value={config.paginationType || 'none'}
+                          onChange={(e) => onConfigChange('paginationType', e.target.value)}
+                           className="w-full px-3 py-2 bg-white dark:bg-vercel-dark-bg border border-vercel-light-border dark:border-vercel-dark-border rounded-lg text-vercel-light-text dark:text-vercel-dark-text text-sm"
+                      >
+                          <option value="none">None</option>
+                          <option value="page">Page Number</option>
+                          <option value="offset">Offset / Limit</option>
+                          <option value="cursor">Cursor</option>
+                          <option value="link">Link Header</option>
+                      </select>
+                 </div>
+                 {config.paginationType && config.paginationType !== 'none' && (
+                     <>
+                         <Input label="Records Path" value={config.recordsPath || ''} onChange={(e:any) => onConfigChange('recordsPath', e.target.value)} placeholder="data.items" />
+                         <Input label="Max Pages" type="number" value={config.maxPages || 1000} onChange={(e:any) => onConfigChange('maxPages', e.target.value)} />
+                     </>
+                 )}
+             </div>
+             {config.paginationType === 'page' && (
+                 <div className="grid grid-cols-4 gap-4">
+                     <Input label="Page Param" value={config.pageParam || 'page'} onChange={(e:any) => onConfigChange('pageParam', e.target.value)} />
+                     <Input label="Start Page" type="number" value={config.startPage || 1} onChange={(e:any) => onConfigChange('startPage', e.target.value)} />
+                     <Input label="Page Size Param" value={config.pageSizeParam || ''} onChange={(e:any) => onConfigChange('pageSizeParam', e.target.value)} placeholder="per_page" />
+                     <Input label="Page Size" type="number" value={config.pageSize || ''} onChange={(e:any) => onConfigChange('pageSize', e.target.value)} />
+                 </div>
+             )}
+             {config.paginationType === 'offset' && (
+                 <div className="grid grid-cols-3 gap-4">
+                     <Input label="Offset Param" value={config.offsetParam || 'offset'} onChange={(e:any) => onConfigChange('offsetParam', e.target.value)} />
+                     <Input label="Limit Param" value={config.limitParam || 'limit'} onChange={(e:any) => onConfigChange('limitParam', e.target.value)} />
+                     <Input label="Page Size" type="number" value={config.pageSize || ''} onChange={(e:any) => onConfigChange('pageSize', e.target.value)} />
+                 </div>
+             )}
+             {config.paginationType === 'cursor' && (
+                 <div className="grid grid-cols-3 gap-4">
+                     <Input label="Cursor Path" value={config.cursorPath || ''} onChange={(e:any) => onConfigChange('cursorPath', e.target.value)} placeholder="next_cursor" />
+                     <Input label="Cursor Header" value={config.cursorHeader || ''} onChange={(e:any) => onConfigChange('cursorHeader', e.target.value)} placeholder="Overrides the path" />
+                     <Input label="Cursor Param" value={config.cursorParam || 'cursor'} onChange={(e:any) => onConfigChange('cursorParam', e.target.value)} />
+                 </div>
+             )}
+             {(config.paginationType === 'page' || config.paginationType === 'offset') && (
+                 <div className="grid grid-cols-2 gap-4">
+                     <Input label="Total Path" value={config.totalPath || ''} onChange={(e:any) => onConfigChange('totalPath', e.target.value)} placeholder="meta.total" />
+                     <Input label="Has More Path" value={config.hasMorePath || ''} onChange={(e:any) => onConfigChange('hasMorePath', e.target.value)} placeholder="has_more" />
+                 </div>
+             )}
+             {config.paginationType && config.paginationType !== 'none' && (
+                 <p className="text-xs text-vercel-light-text-secondary">Without an input, pages are fetched as a source and streamed downstream while the next page is prefetched. Paging stops on an empty page, a missing next cursor/link, the total or has-more flag, or Max Pages.</p>
+             )}
+
              {['POST', 'PUT', 'PATCH'].includes(config.method) && (
                  <div>
                     <label className="block text-sm font-medium text-vercel-light-text dark:text-vercel-dark-text mb-1.5">Body</label>
@@ -8,6 +8,7 @@ import {
   XCircle,
   Play,
   AlertCircle,
+  RotateCcw,
 } from "lucide-react";
 import { executionService } from "../../services/executionService";
 import { Button } from "../common/Button";
@@ -44,6 +45,8 @@ export const ExecutionDetailView: React.FC = () => {
 
   const [execution, setExecution] = useState<Execution | null>(null);
   const [loading, setLoading] = useState(true);
+  const [offsets, setOffsets] = useState<any[]>([]);
+  const [replaying, setReplaying] = useState(false);
 
   // Workspace Data for Title
   const { currentWorkspace, workspaces, fetchWorkspaces } = useWorkspaceStore();
@@ -77,6 +80,8 @@ export const ExecutionDetailView: React.FC = () => {
       setLoading(true);
       const data = await executionService.getExecutionById(executionId!);
       setExecution(data);
+      // Only executions that recorded Kafka offset ranges can be replayed
+      setOffsets(await executionService.getExecutionOffsets(executionId!).catch(() => []));
     } catch (error) {
       console.error("Failed to fetch execution:", error);
       addToast("error", "Failed to load execution details");
@@ -85,6 +90,23 @@ export const ExecutionDetailView: React.FC = () => {
     }
   };
 
+  const handleReplay = async () => {
+    try {
+      setReplaying(true);
+      const result: any = await executionService.replayExecution(executionId!);
+      addToast(
+        result.status === "success" ? "success" : "error",
+        result.status === "success" ? "Replay completed" : `Replay failed: ${result.message || result.error || "Unknown error"}`,
+      );
+      if (result.id) navigate(`/workspace/${workspaceId}/execution/${result.id}`);
+    } catch (error: any) {
+      console.error("Failed to replay execution:", error);
+      addToast("error", error.response?.data?.error || "Failed to replay execution");
+    } finally {
+      setReplaying(false);
+    }
+  };
+
   const calculateDuration = (start: string, end?: string) => {
     if (!end) return "Running...";
     try {
@@ -185,6 +207,19 @@ export const ExecutionDetailView: React.FC = () => {
               </p>
             </div>
 
+            {offsets.length > 0 && (
+              <Button
+                variant="secondary"
+                size="sm"
+                onClick={handleReplay}
+                loading={replaying}
+                icon={<RotateCcw size={16} />}
+                title={`Run the job again over the same ${offsets.length} Kafka partition range(s)`}
+              >
+                Replay
+              </Button>
+            )}
+
             <div className="flex items-center gap-8 text-sm">
               <div>
                 <div className="text-vercel-light-text-secondary dark:text-vercel-dark-text-secondary mb-1 flex items-center gap-2">
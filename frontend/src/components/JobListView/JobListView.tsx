@@ -676,10 +676,10 @@ export const JobListView: React.FC<JobListViewProps> = ({ workspaceId: propWorks
         <ScheduleModal 
           isOpen={!!scheduleJobId}
           onClose={() => setScheduleJobId(null)}
-          onSave={async (schedule, dependencies) => {
+          onSave={async (schedule, dependencies, maxConcurrentRuns) => {
              // Wrapper to handle save
              try {
-                await updateJob(scheduleJobId, { schedule, dependencies });
+                await updateJob(scheduleJobId, { schedule, dependencies, maxConcurrentRuns });
                 addToast('success', 'Job scheduled successfully');
              } catch (err) {
                  console.error('Failed to schedule', err);
@@ -688,6 +688,7 @@ export const JobListView: React.FC<JobListViewProps> = ({ workspaceId: propWorks
           }}
           initialSchedule={jobs.find(j => j.id === scheduleJobId)?.schedule || null}
           initialDependencies={jobs.find(j => j.id === scheduleJobId)?.dependencies || []}
+          initialMaxConcurrentRuns={jobs.find(j => j.id === scheduleJobId)?.maxConcurrentRuns}
           jobName={jobs.find(j => j.id === scheduleJobId)?.name || 'Job'}
           jobId={scheduleJobId || ''}
         />
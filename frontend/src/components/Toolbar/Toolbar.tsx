@@ -1,6 +1,6 @@
 import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { ArrowLeft, Undo2, Redo2, Play, Download, Moon, Sun, Calendar, Save } from 'lucide-react';
+import { ArrowLeft, Undo2, Redo2, Play, Download, GitBranch, Radio, Square, Moon, Sun, Calendar, Save } from 'lucide-react';
 import { useCanvasStore } from '../../store/canvasStore';
 import { useToast } from '../../contexts/ToastContext';
 import { useThemeStore } from '../../store/themeStore';
@@ -26,7 +26,7 @@ interface ToolbarProps {
 
 export const Toolbar: React.FC<ToolbarProps> = ({ jobId, jobName, onSave }) => {
   const navigate = useNavigate();
-  const { undo, redo, canUndo, canRedo, isSaving, lastSaved } = useCanvasStore();
+  const { undo, redo, canUndo, canRedo, isSaving, lastSaved, nodes } = useCanvasStore();
   const { theme, toggleTheme } = useThemeStore();
   const { exportJob, exportJobRecursive, currentJob, updateJob } = useJobStore(); // Added exportJobRecursive
   const { addToast } = useToast();
@@ -47,15 +47,19 @@ export const Toolbar: React.FC<ToolbarProps> = ({ jobId, jobName, onSave }) => {
   const { setIsExecuting, addLog, clearLogs } = useExecutionStore();
   const [localIsExecuting, setLocalIsExecuting] = useState(false);
 
-  const handleRun = async () => {
+  const handleRun = async (withDependencies: boolean = false) => {
     setLocalIsExecuting(true);
     setIsExecuting(true);
     clearLogs();
-    addLog(`Starting execution for job: ${jobName}...`);
+    addLog(withDependencies
+      ? `Starting execution for job: ${jobName} and its dependencies...`
+      : `Starting execution for job: ${jobName}...`);
     
     try {
       const startTime = Date.now();
-      const result = await executionService.executeJob(jobId);
+      const result = withDependencies
+        ? await executionService.executeJobWithDependencies(jobId)
+        : await executionService.executeJob(jobId);
       if (result.logs && Array.isArray(result.logs)) {
         result.logs.forEach((log: any) => {
           if (typeof log === 'object') {
@@ -88,6 +92,48 @@ export const Toolbar: React.FC<ToolbarProps> = ({ jobId, jobName, onSave }) => {
     }
   };
 
+  // Streaming: jobs whose Kafka Input has streaming mode on run as a long-lived stream
+  const isStreamingJob = nodes.some((n) => n.data.type === 'kafka-input' && n.data.config?.streaming);
+  const [stream, setStream] = useState<any | null>(null);
+  const [streamBusy, setStreamBusy] = useState(false);
+  const isStreamRunning = stream?.status === 'running';
+
+  const refreshStream = async () => {
+    try {
+      setStream(await executionService.getStream(jobId));
+    } catch (error) {
+      setStream(null); // 404: the job is not streaming
+    }
+  };
+
+  React.useEffect(() => {
+    if (isStreamingJob) refreshStream();
+  }, [isStreamingJob, jobId]);
+
+  React.useEffect(() => {
+    if (!isStreamRunning) return;
+    const timer = setInterval(refreshStream, 5000);
+    return () => clearInterval(timer);
+  }, [isStreamRunning, jobId]);
+
+  const handleToggleStream = async () => {
+    setStreamBusy(true);
+    try {
+      if (isStreamRunning) {
+        setStream(await executionService.stopStream(jobId));
+        addToast('success', 'Stream stopped after its current batch');
+      } else {
+        setStream(await executionService.startStream(jobId));
+        addToast('success', 'Stream started');
+      }
+    } catch (error: any) {
+      console.error('Stream request failed:', error);
+      addToast('error', error.response?.data?.error || error.message || 'Stream request failed');
+    } finally {
+      setStreamBusy(false);
+    }
+  };
+
   const handleExportClick = () => {
       const deps = currentJob?.dependencies || [];
       if (deps.length > 0) {
@@ -151,11 +197,12 @@ export const Toolbar: React.FC<ToolbarProps> = ({ jobId, jobName, onSave }) => {
       }
   };
 
-  const handleSaveSchedule = async (schedule: string | null, dependencies?: string[]) => {
+  const handleSaveSchedule = async (schedule: string | null, dependencies?: string[], maxConcurrentRuns?: number) => {
       try {
           await updateJob(jobId, { 
               schedule: schedule, 
-              dependencies 
+              dependencies,
+              maxConcurrentRuns
           });
           addToast('success', 'Schedule updated successfully');
       } catch (error) {
@@ -286,10 +333,43 @@ export const Toolbar: React.FC<ToolbarProps> = ({ jobId, jobName, onSave }) => {
             Save
         </Button>
         
+        {isStreamingJob && (
+            <>
+                {isStreamRunning && (
+                    <span className="text-xs text-[var(--text-secondary)]" title={`Avg batch ${stream.metrics?.avgBatchMs ?? '-'} ms, lag ${stream.metrics?.lag ?? '-'}`}>
+                        {stream.metrics?.batches ?? 0} batches · {stream.metrics?.records ?? 0} records
+                    </span>
+                )}
+                <Button
+                    variant="secondary"
+                    size="sm"
+                    onClick={handleToggleStream}
+                    loading={streamBusy}
+                    icon={isStreamRunning ? <Square size={16} /> : <Radio size={16} />}
+                    title={isStreamRunning ? 'Stop the stream once its current batch is committed' : 'Run the pipeline for each micro-batch from the streaming Kafka Input'}
+                >
+                    {isStreamRunning ? 'Stop Stream' : 'Start Stream'}
+                </Button>
+            </>
+        )}
+        
+        {(currentJob?.dependencies?.length ?? 0) > 0 && (
+            <Button
+                variant="secondary"
+                size="sm"
+                onClick={() => handleRun(true)}
+                disabled={localIsExecuting}
+                icon={<GitBranch size={16} />}
+                title="Run the jobs this job depends on first, independent ones in parallel"
+            >
+                Run with Dependencies
+            </Button>
+        )}
+        
         <Button
             variant="primary"
             size="sm"
-            onClick={handleRun}
+            onClick={() => handleRun()}
             loading={localIsExecuting}
             icon={<Play size={16} />}
         >
@@ -303,6 +383,7 @@ export const Toolbar: React.FC<ToolbarProps> = ({ jobId, jobName, onSave }) => {
         onSave={handleSaveSchedule}
         initialSchedule={currentJob?.schedule || null}
         initialDependencies={currentJob?.dependencies}
+        initialMaxConcurrentRuns={currentJob?.maxConcurrentRuns}
         jobName={currentJob?.name || jobName}
         jobId={jobId} 
       />
@@ -8,9 +8,10 @@ import { useJobStore } from '../../store/jobStore';
 interface ScheduleModalProps {
   isOpen: boolean;
   onClose: () => void;
-  onSave: (schedule: string | null, dependencies?: string[]) => void; 
+  onSave: (schedule: string | null, dependencies?: string[], maxConcurrentRuns?: number) => void; 
   initialSchedule: string | null;
   initialDependencies?: string[];
+  initialMaxConcurrentRuns?: number;
   jobName: string;
   jobId: string;
 }
@@ -25,13 +26,14 @@ const parseTime = (timeStr: string) => {
 };
 
 export const ScheduleModal: React.FC<ScheduleModalProps> = ({ 
-    isOpen, onClose, onSave, initialSchedule, initialDependencies, jobName, jobId 
+    isOpen, onClose, onSave, initialSchedule, initialDependencies, initialMaxConcurrentRuns, jobName, jobId 
 }) => {
   const { jobs } = useJobStore();
   const [activeTab, setActiveTab] = useState<Tab>('schedule');
   const [frequency, setFrequency] = useState<Frequency>('none');
   const [schedule, setSchedule] = useState<string>('');
   const [selectedDependencies, setSelectedDependencies] = useState<string[]>([]);
+  const [maxConcurrentRuns, setMaxConcurrentRuns] = useState<number>(1);
 
   // Visual Builder State
   const [time, setTime] = useState('09:00');
@@ -45,6 +47,7 @@ export const ScheduleModal: React.FC<ScheduleModalProps> = ({
     if (isOpen) {
         // Init Dependencies
         setSelectedDependencies(initialDependencies || []);
+        setMaxConcurrentRuns(initialMaxConcurrentRuns || 1);
 
         // Init Schedule
         if (!initialSchedule) {
@@ -85,7 +88,7 @@ export const ScheduleModal: React.FC<ScheduleModalProps> = ({
             }
         }
     }
-  }, [initialSchedule, initialDependencies, isOpen]);
+  }, [initialSchedule, initialDependencies, initialMaxConcurrentRuns, isOpen]);
 
   // Generate cron string when visual state changes
   useEffect(() => {
@@ -141,7 +144,7 @@ export const ScheduleModal: React.FC<ScheduleModalProps> = ({
   };
 
   const handleSave = () => {
-      onSave(schedule || null, selectedDependencies);
+      onSave(schedule || null, selectedDependencies, maxConcurrentRuns);
       onClose(); // Parent handles logic, local state just passes data
   };
 
@@ -330,6 +333,20 @@ export const ScheduleModal: React.FC<ScheduleModalProps> = ({
                              </div>
                          )}
                     </div>
+
+                    {frequency !== 'none' && (
+                        <div className="w-48">
+                            <label className="text-xs font-semibold text-[var(--text-tertiary)] mb-2 block">Max Concurrent Runs</label>
+                            <Input 
+                                type="number"
+                                min={1}
+                                value={maxConcurrentRuns}
+                                onChange={(e) => setMaxConcurrentRuns(Math.max(parseInt(e.target.value, 10) || 1, 1))}
+                                className="bg-[var(--bg-surface)] border-[var(--border-color)] text-[var(--text-primary)]"
+                            />
+                            <p className="mt-2 text-xs text-[var(--text-tertiary)]">Scheduled runs are skipped while this many are still running.</p>
+                        </div>
+                    )}
                 </>
             ) : (
                 <div className="space-y-4">
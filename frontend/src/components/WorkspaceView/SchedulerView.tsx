@@ -126,10 +126,10 @@ export const SchedulerView: React.FC<SchedulerViewProps> = ({ workspaceId }) =>
     setIsModalOpen(true);
   };
 
-  const handleSaveSchedule = async (schedule: string | null, dependencies?: string[]) => {
+  const handleSaveSchedule = async (schedule: string | null, dependencies?: string[], maxConcurrentRuns?: number) => {
     if (!selectedJob) return;
     try {
-      await updateJob(selectedJob.id, { schedule: schedule, dependencies: dependencies || [] });
+      await updateJob(selectedJob.id, { schedule: schedule, dependencies: dependencies || [], maxConcurrentRuns });
       addToast('success', 'Job configuration updated successfully');
       fetchJobsByWorkspace(workspaceId); 
       fetchMonthlyRuns(); // Refresh calendar
@@ -425,6 +425,7 @@ export const SchedulerView: React.FC<SchedulerViewProps> = ({ workspaceId }) =>
               onSave={handleSaveSchedule}
               initialSchedule={selectedJob.schedule || null}
               initialDependencies={selectedJob.dependencies || []}
+              initialMaxConcurrentRuns={selectedJob.maxConcurrentRuns}
               jobName={selectedJob.name}
               jobId={selectedJob.id}
           />
@@ -51,6 +51,7 @@ export const APP_CONSTANTS = {
     EXECUTIONS_BY_WORKSPACE: (workspaceId: string) => `/workspaces/${workspaceId}/executions`,
     EXECUTION_BY_ID: (id: string) => `/executions/${id}`,
     EXECUTIONS_BY_JOB: (jobId: string) => `/jobs/${jobId}/executions`,
+    JOB_STREAM: (jobId: string) => `/jobs/${jobId}/stream`,
     
     // Scheduler endpoints
     JOB_SCHEDULE_PREVIEW: '/jobs/schedule/preview',
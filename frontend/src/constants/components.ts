@@ -30,6 +30,26 @@ export const COMPONENT_DEFINITIONS: ComponentDefinition[] = [
       query: "SELECT * FROM table_name",
     },
   },
+  {
+    type: "mongodb-reader",
+    label: "MongoDB Reader",
+    category: "input",
+    icon: "Leaf",
+    description: "Stream documents from a MongoDB collection (filter, projection or aggregation pipeline)",
+    defaultConfig: {
+      useExistingConnection: false,
+      connectionId: "",
+      dbType: "mongodb",
+      databaseType: "mongodb",
+      host: "localhost",
+      port: 27017,
+      database: "",
+      username: "",
+      password: "",
+      query: "collection_name",
+      batchSize: 1000,
+    },
+  },
 
   // Output Components
   {
@@ -51,6 +71,26 @@ export const COMPONENT_DEFINITIONS: ComponentDefinition[] = [
       table: "output_table",
     },
   },
+  {
+    type: "mongodb-writer",
+    label: "MongoDB Writer",
+    category: "output",
+    icon: "Leaf",
+    description: "Write documents to a MongoDB collection with unordered bulk writes",
+    defaultConfig: {
+      useExistingConnection: false,
+      connectionId: "",
+      dbType: "mongodb",
+      databaseType: "mongodb",
+      host: "localhost",
+      port: 27017,
+      database: "",
+      username: "",
+      password: "",
+      table: "output_collection",
+      batchSize: 1000,
+    },
+  },
   {
     type: "file-reader",
     label: "File Reader",
@@ -7,12 +7,34 @@ interface ExecutionResult {
 }
 
 export const executionService = {
-  // Execute job
+  // Execute job (waits for a worker when the backend queues executions)
   async executeJob(jobId: string): Promise<ExecutionResult> {
-    const response = await apiClient.post<ExecutionResult>(APP_CONSTANTS.API.EXECUTE_JOB(jobId));
+    const response = await apiClient.post<any>(APP_CONSTANTS.API.EXECUTE_JOB(jobId));
+    return executionService.waitForExecution(response.data);
+  },
+
+  // Execute job after the jobs it depends on (independent jobs run in parallel)
+  async executeJobWithDependencies(jobId: string, maxParallel?: number): Promise<ExecutionResult> {
+    const response = await apiClient.post<any>(`${APP_CONSTANTS.API.EXECUTE_JOB(jobId)}-dag`, { maxParallel });
+    return executionService.waitForExecution(response.data);
+  },
+
+  // Get executions started by an execution (sub-jobs, jobs of a dependency run)
+  async getChildExecutions(executionId: string): Promise<any[]> {
+    const response = await apiClient.get<any[]>(`${APP_CONSTANTS.API.EXECUTION_BY_ID(executionId)}/children`);
     return response.data;
   },
 
+  // Poll a queued or running execution until it has finished
+  async waitForExecution(execution: any, intervalMs: number = 2000): Promise<ExecutionResult> {
+    let current = execution;
+    while (current && (current.status === 'queued' || current.status === 'running')) {
+      await new Promise(resolve => setTimeout(resolve, intervalMs));
+      current = await executionService.getExecutionById(current.id);
+    }
+    return current;
+  },
+
   // Get executions by workspace
   async getExecutionsByWorkspace(workspaceId: string): Promise<any[]> {
     const response = await apiClient.get<any[]>(APP_CONSTANTS.API.EXECUTIONS_BY_WORKSPACE(workspaceId));
@@ -30,4 +52,34 @@ export const executionService = {
     const response = await apiClient.get<any[]>(`${APP_CONSTANTS.API.EXECUTIONS_BY_JOB(jobId)}?limit=${limit}`);
     return response.data;
   },
+
+  // Kafka partition/offset ranges an execution consumed, per component
+  async getExecutionOffsets(executionId: string): Promise<any[]> {
+    const response = await apiClient.get<any[]>(`${APP_CONSTANTS.API.EXECUTION_BY_ID(executionId)}/offsets`);
+    return response.data;
+  },
+
+  // Re-run an execution over the same Kafka offset ranges it consumed
+  async replayExecution(executionId: string): Promise<ExecutionResult> {
+    const response = await apiClient.post<any>(`${APP_CONSTANTS.API.EXECUTION_BY_ID(executionId)}/replay`);
+    return executionService.waitForExecution(response.data);
+  },
+
+  // Start a streaming execution (micro-batches from a streaming Kafka Input)
+  async startStream(jobId: string): Promise<any> {
+    const response = await apiClient.post<any>(`${APP_CONSTANTS.API.JOB_STREAM(jobId)}/start`);
+    return response.data;
+  },
+
+  // Stop a streaming execution after its current batch
+  async stopStream(jobId: string): Promise<any> {
+    const response = await apiClient.post<any>(`${APP_CONSTANTS.API.JOB_STREAM(jobId)}/stop`);
+    return response.data;
+  },
+
+  // Get streaming execution state and metrics
+  async getStream(jobId: string): Promise<any> {
+    const response = await apiClient.get<any>(APP_CONSTANTS.API.JOB_STREAM(jobId));
+    return response.data;
+  },
 };
@@ -8,6 +8,7 @@ export interface Job {
   description: string;
   canvasState?: CanvasState | null;
   schedule?: string | null;
+  maxConcurrentRuns?: number;
   dependencies?: string[];
   createdAt: string;
   updatedAt: string;
@@ -89,7 +90,7 @@ export interface ComponentConfig {
   
   // File config
   filePath?: string;
-  fileType?: 'delimited' | 'excel' | 'parquet' | 'json';
+  fileType?: 'delimited' | 'excel' | 'parquet' | 'json' | 'arrow';
   delimiter?: string;
   hasHeader?: boolean;
   encoding?: string;
@@ -162,6 +163,7 @@ export interface UpdateJobDto {
   description?: string;
   canvasState?: CanvasState;
   schedule?: string | null;
+  maxConcurrentRuns?: number;
   dependencies?: string[];
 }
 